@@ -0,0 +1,75 @@
+"""
+Нагрузочные тесты API на данных manage.py seed_benchmark.
+
+Тесты выполняются на базе из DATABASE_URL как есть (тестовая база не
+создается), каждый тест - в откатываемой транзакции. Кэш ответов
+отключен: измеряется построение ответа, а не попадание в кэш.
+
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python manage.py seed_benchmark --tasks 100000
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 pytest benchmarks --no-cov \\
+        --benchmark-json=benchmarks/results/100k.json
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.db.models import Count
+from rest_framework.test import APIClient
+from tasks.models import Project, Task
+from tasks.seeding import USERNAME_PREFIX
+
+MIN_TASKS = 1000
+
+_dataset = {}
+
+
+@pytest.fixture(scope='session')
+def django_db_setup():
+    """Данные seed_benchmark в базе DATABASE_URL вместо пустой тестовой базы"""
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker):
+    """Размер данных и объекты для запросов: крупнейший проект, самый загруженный исполнитель"""
+    with django_db_blocker.unblock():
+        tasks = Task.objects.count()
+        if tasks < MIN_TASKS:
+            pytest.skip(f'Нет данных: выполните manage.py seed_benchmark (задач: {tasks})')
+        busiest = (
+            Task.objects.filter(assignee__username__startswith=USERNAME_PREFIX)
+            .values('assignee').annotate(total=Count('id')).order_by('-total').first()
+        )
+        project = Project.objects.order_by().values('id').annotate(
+            total=Count('tasks')
+        ).order_by('-total').first()
+        _dataset.update({
+            'tasks': tasks,
+            'projects': Project.objects.count(),
+            'users': User.objects.count(),
+            'user': User.objects.get(pk=busiest['assignee']),
+            'project': project['id'],
+            'project_ids': list(Project.objects.order_by('id').values_list('id', flat=True)[:50]),
+            'task': Task.objects.filter(project_id=project['id']).order_by('id').values_list(
+                'id', flat=True
+            ).first(),
+        })
+    return _dataset
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(settings):
+    settings.TASKS_RESPONSE_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def bench_client(dataset):
+    client = APIClient()
+    client.force_authenticate(user=dataset['user'])
+    return client
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Размер данных в отчете: сравнивать имеет смысл только отчеты одного объема"""
+    if _dataset:
+        output_json['dataset'] = {
+            key: _dataset[key] for key in ('tasks', 'projects', 'users')
+        }
@@ -0,0 +1,116 @@
+"""
+Время ответа и число SQL-запросов горячих эндпоинтов API.
+
+Для каждого случая в отчет pytest-benchmark (extra_info) записываются
+число запросов к БД и размер данных; scripts/compare_benchmarks.py
+сравнивает два отчета по времени и числу запросов.
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+_now = timezone.now()
+
+# Параметры списка задач: каждый фильтр TaskFilter, их сочетания,
+# поиск, сортировки и режимы пагинации
+TASK_LIST_CASES = {
+    'default': lambda d: {},
+    'status': lambda d: {'status': 'todo'},
+    'status_multiple': lambda d: {'status': ['todo', 'in_progress']},
+    'priority': lambda d: {'priority': '4'},
+    'title': lambda d: {'title': 'docker'},
+    'project': lambda d: {'project': d['project']},
+    'project_name': lambda d: {'project_name': 'api'},
+    'assignee': lambda d: {'assignee': d['user'].pk},
+    'creator': lambda d: {'creator': d['user'].pk},
+    'created_range': lambda d: {
+        'created_after': (_now - timedelta(days=30)).isoformat(),
+        'created_before': _now.isoformat(),
+    },
+    'deadline_range': lambda d: {
+        'deadline_after': _now.isoformat(),
+        'deadline_before': (_now + timedelta(days=14)).isoformat(),
+    },
+    'is_overdue': lambda d: {'is_overdue': 'true'},
+    'no_assignee': lambda d: {'no_assignee': 'true'},
+    'status_priority': lambda d: {'status': 'todo', 'priority': '4'},
+    'project_status_overdue': lambda d: {
+        'project': d['project'], 'status': 'in_progress', 'is_overdue': 'true'
+    },
+    'assignee_status_deadline': lambda d: {
+        'assignee': d['user'].pk, 'status': ['todo', 'review'],
+        'deadline_after': _now.isoformat(),
+    },
+    'search': lambda d: {'search': 'docker'},
+    'search_two_words': lambda d: {'search': 'миграция индекс'},
+    'search_filtered': lambda d: {'search': 'docker', 'status': 'todo'},
+    'ordering_deadline': lambda d: {'ordering': 'deadline'},
+    'ordering_updated': lambda d: {'ordering': '-updated_at'},
+    'ordering_status': lambda d: {'ordering': 'status'},
+    'ordering_created': lambda d: {'ordering': 'created_at'},
+    'page_100': lambda d: {'page': 100},
+    'page_size_100': lambda d: {'page_size': 100, 'paginate': 'cursor'},
+    'cursor': lambda d: {'paginate': 'cursor'},
+}
+
+
+def run(benchmark, client, dataset, url, params=None):
+    """Измерить GET url: время - benchmark, число запросов - отдельный прогон"""
+    params = params or {}
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    benchmark.extra_info.update(queries=len(queries), tasks=dataset['tasks'])
+    benchmark(client.get, url, params)
+
+
+@pytest.mark.parametrize('case', TASK_LIST_CASES)
+def test_task_list(benchmark, bench_client, dataset, case):
+    params = TASK_LIST_CASES[case](dataset)
+    run(benchmark, bench_client, dataset, reverse('tasks:task-list'), params)
+
+
+def test_task_detail(benchmark, bench_client, dataset):
+    run(benchmark, bench_client, dataset, reverse('tasks:task-detail', args=[dataset['task']]))
+
+
+def test_my_tasks(benchmark, bench_client, dataset):
+    run(benchmark, bench_client, dataset, reverse('tasks:task-my-tasks'))
+
+
+def test_project_list(benchmark, bench_client, dataset):
+    run(benchmark, bench_client, dataset, reverse('tasks:project-list'))
+
+
+def test_project_list_expand_tasks(benchmark, bench_client, dataset):
+    run(benchmark, bench_client, dataset, reverse('tasks:project-list'), {'expand': 'tasks'})
+
+
+def test_project_detail(benchmark, bench_client, dataset):
+    url = reverse('tasks:project-detail', args=[dataset['project']])
+    run(benchmark, bench_client, dataset, url)
+
+
+def test_project_tasks(benchmark, bench_client, dataset):
+    run(benchmark, bench_client, dataset, reverse('tasks:project-tasks', args=[dataset['project']]))
+
+
+def test_project_statistics(benchmark, bench_client, dataset):
+    run(
+        benchmark, bench_client, dataset,
+        reverse('tasks:project-statistics', args=[dataset['project']])
+    )
+
+
+def test_project_batch_statistics(benchmark, bench_client, dataset):
+    run(
+        benchmark, bench_client, dataset, reverse('tasks:project-batch-statistics'),
+        {'ids': ','.join(map(str, dataset['project_ids']))}
+    )
@@ -1,12 +1,55 @@
 """
 Конфигурация pytest и фикстуры для тестирования.
 """
+import logging.handlers
+import os
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from rest_framework.test import APIClient
+from task_manager import metrics, schema
+from tasks import authentication
 from tasks.models import Project, Task
 
 
+@pytest.fixture(autouse=True, scope='session')
+def metrics_dir(tmp_path_factory):
+    """Файлы метрик тестов - во временном каталоге"""
+    os.environ['METRICS_DIR'] = str(tmp_path_factory.mktemp('metrics'))
+    metrics.reset()
+    yield os.environ['METRICS_DIR']
+    del os.environ['METRICS_DIR']
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Кэш в памяти процесса не откатывается вместе с тестовой БД"""
+    for cache in caches.all():
+        cache.clear()
+    authentication.clear()
+    schema.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """
+    Превышение бюджета SQL-запросов действия (task_manager/query_budget.py) -
+    ошибка теста. Для изменяющих запросов middleware только пишет в лог,
+    поэтому их превышения собираются из лога и проверяются после теста.
+    """
+    settings.QUERY_BUDGET_ENFORCE = True
+    handler = logging.handlers.BufferingHandler(capacity=1000)
+    budget_logger = logging.getLogger('task_manager.query_budget')
+    budget_logger.addHandler(handler)
+    try:
+        yield
+    finally:
+        budget_logger.removeHandler(handler)
+    if settings.QUERY_BUDGET_ENFORCE and handler.buffer:
+        pytest.fail('\n'.join(record.getMessage() for record in handler.buffer))
+
+
 @pytest.fixture
 def api_client():
     """Фикстура для API клиента"""
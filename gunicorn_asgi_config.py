@@ -0,0 +1,18 @@
+"""
+Конфигурация Gunicorn для запуска Task Manager API в режиме ASGI.
+
+Воркеры uvicorn обслуживают много соединений в одном процессе: медленный
+клиент или долгий запрос не занимает процесс целиком. Остальные настройки
+и хуки берутся из gunicorn_config.py.
+
+Запуск:
+    gunicorn -c gunicorn_asgi_config.py task_manager.asgi:application
+"""
+import multiprocessing
+import os
+
+from gunicorn_config import *  # noqa: F401,F403
+
+# Асинхронному воркеру не нужен запас процессов на ожидание ввода-вывода
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
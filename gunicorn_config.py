@@ -1,16 +1,35 @@
 """
 Конфигурация Gunicorn для Task Manager API.
+
+Приложение загружается в мастер-процессе (preload_app) и прогревается
+в when_ready; перед fork объекты кучи замораживаются (gc.freeze), чтобы
+сборщик мусора воркеров не трогал их и страницы памяти оставались общими
+(copy-on-write). Воркеры gthread обслуживают запросы в нескольких потоках.
+
+Прежний профиль (sync, без preload): GUNICORN_WORKER_CLASS=sync GUNICORN_PRELOAD=False
 """
+import gc
 import multiprocessing
+import os
+import time
+
+from task_manager import metrics
 
 # Сервер
 bind = "0.0.0.0:8000"
 backlog = 2048
 
 # Воркеры
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+cpu_count = multiprocessing.cpu_count()
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'sync':
+    workers = int(os.getenv('WEB_CONCURRENCY', cpu_count * 2 + 1))
+else:
+    # Параллелизм ввода-вывода дают потоки, процессы - по числу ядер
+    workers = int(os.getenv('WEB_CONCURRENCY', max(2, cpu_count)))
+threads = int(os.getenv('GUNICORN_THREADS', cpu_count * 2 + 1))
 worker_connections = 1000
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
 max_requests = 1000
 max_requests_jitter = 50
 timeout = 120
@@ -37,6 +56,7 @@ tmp_upload_dir = None
 # Хуки
 def on_starting(server):
     """Вызывается при запуске сервера."""
+    metrics.reset()
     print("Gunicorn server is starting...")
 
 def on_reload(server):
@@ -45,15 +65,28 @@ def on_reload(server):
 
 def when_ready(server):
     """Вызывается когда сервер готов принимать запросы."""
+    if server.cfg.preload_app:
+        from task_manager.warmup import warm_up
+
+        warm_up()
+        # Убрать мусор до заморозки и не создавать новых "дыр" до fork
+        gc.collect()
+        gc.disable()
     print("Gunicorn server is ready!")
 
 def pre_fork(server, worker):
     """Вызывается перед созданием воркера."""
-    pass
+    if server.cfg.preload_app:
+        # Объекты мастера переносятся в постоянное поколение: сборщик мусора
+        # воркера не обходит их и не изменяет заголовки объектов
+        gc.freeze()
+        # Замороженные объекты сборщик не трогает и в мастере; без сборки
+        # мастер копил бы циклический мусор между перезапусками воркеров
+        gc.enable()
 
 def post_fork(server, worker):
     """Вызывается после создания воркера."""
-    pass
+    gc.enable()
 
 def post_worker_init(worker):
     """Вызывается после инициализации воркера."""
@@ -65,7 +98,7 @@ def worker_int(worker):
 
 def worker_abort(worker):
     """Вызывается при падении воркера."""
-    pass
+    metrics.inc('gunicorn_worker_aborts_total')
 
 def pre_exec(server):
     """Вызывается перед новым мастер процессом."""
@@ -73,15 +106,18 @@ def pre_exec(server):
 
 def pre_request(worker, req):
     """Вызывается перед обработкой запроса."""
-    pass
+    req.metrics_started = time.perf_counter()
 
 def post_request(worker, req, environ, resp):
     """Вызывается после обработки запроса."""
-    pass
+    started = getattr(req, 'metrics_started', None)
+    if started is not None:
+        metrics.observe('gunicorn_request_duration_seconds', time.perf_counter() - started)
 
 def child_exit(server, worker):
     """Вызывается при выходе воркера."""
-    pass
+    metrics.merge_worker(worker.pid)
+    metrics.inc('gunicorn_worker_exits_total')
 
 def worker_exit(server, worker):
     """Вызывается при выходе воркера."""
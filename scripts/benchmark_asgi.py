@@ -0,0 +1,184 @@
+"""
+Нагрузочный тест: синхронный профиль (gunicorn_config.py, WSGI) против
+асинхронного (gunicorn_asgi_config.py, uvicorn + async-представления).
+
+Создает базу (по умолчанию временный файл SQLite), заполняет ее данными,
+по очереди запускает оба профиля и нагружает GET-эндпоинты задач
+(список, детали, my_tasks, статистика проекта) заданным числом
+одновременных keep-alive соединений. Выводит req/s и задержки p50/p99.
+Кэш ответов отключен, чтобы измерялись сами представления.
+
+Использование:
+    python scripts/benchmark_asgi.py --concurrency 200 --duration 15
+    python scripts/benchmark_asgi.py --database-url postgres://... --workers 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HOST = '127.0.0.1'
+
+PROFILES = {
+    'sync (wsgi)': ['gunicorn_config.py', 'task_manager.wsgi:application'],
+    'async (asgi)': ['gunicorn_asgi_config.py', 'task_manager.asgi:application'],
+}
+
+
+def prepare_database(args):
+    """Применить миграции и заполнить базу; вернуть (токен, ID задач, ID проектов)"""
+    os.environ['DATABASE_URL'] = args.database_url
+    sys.path.insert(0, str(BASE_DIR / 'scripts'))
+    from benchmark_db import seed  # noqa: E402 - выполняет django.setup()
+    from django.core.management import call_command
+    from tasks.models import Project
+
+    call_command('migrate', verbosity=0)
+    token, task_ids = seed(args.tasks)
+    return token, task_ids, list(Project.objects.values_list('id', flat=True))
+
+
+def start_server(config, app, port, args):
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        DEBUG='False',
+        ALLOWED_HOSTS=HOST,
+        RESPONSE_CACHE_TIMEOUT='0',
+    )
+    command = [
+        sys.executable, '-m', 'gunicorn', '-c', config, app,
+        '--bind', f'{HOST}:{port}', '--log-level', 'warning',
+    ]
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+    return subprocess.Popen(
+        command, cwd=BASE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def request(connection, port, path, token):
+    """Выполнить GET; вернуть (статус, соединение или None, если сервер его закрыл)"""
+    if connection is None:
+        connection = await asyncio.open_connection(HOST, port)
+    reader, writer = connection
+    writer.write((
+        f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\nAccept: application/json\r\n'
+        f'Authorization: Token {token}\r\n\r\n'
+    ).encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('сервер закрыл соединение')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+
+    if headers.get('connection', '').lower() == 'close':
+        writer.close()
+        connection = None
+    return int(status_line.split()[1]), connection
+
+
+async def client(port, token, paths, deadline, latencies, errors):
+    connection = None
+    while time.monotonic() < deadline:
+        path = random.choice(paths)()
+        started = time.perf_counter()
+        try:
+            code, connection = await request(connection, port, path, token)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            errors.append(path)
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if code >= 400:
+            errors.append(path)
+    if connection is not None:
+        connection[1].close()
+
+
+async def wait_ready(port, token, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await request(None, port, '/api/tasks/?page_size=1', token)
+            return
+        except (OSError, asyncio.IncompleteReadError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'сервер на порту {port} не запустился')
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+async def run_profile(name, port, token, paths, args):
+    await wait_ready(port, token)
+    latencies, errors = [], []
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(*(
+        client(port, token, paths, deadline, latencies, errors)
+        for _ in range(args.concurrency)
+    ))
+    latencies.sort()
+    if not latencies:
+        print(f'{name:<14} нет успешных запросов, ошибок: {len(errors)}')
+        return
+    print(
+        f'{name:<14} {len(latencies) / args.duration:>8.1f} req/s'
+        f'   p50 {percentile(latencies, 0.50):>8.1f} ms'
+        f'   p99 {percentile(latencies, 0.99):>8.1f} ms'
+        f'   ошибок: {len(errors)}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='число воркеров (по умолчанию - из конфигурации профиля)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+    if args.database_url is None:
+        path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        args.database_url = f'sqlite:///{path}'
+
+    token, task_ids, project_ids = prepare_database(args)
+    paths = [
+        lambda: f'/api/tasks/?page={random.randint(1, 20)}',
+        lambda: f'/api/tasks/{random.choice(task_ids)}/',
+        lambda: f'/api/tasks/my_tasks/?page={random.randint(1, 10)}',
+        lambda: f'/api/projects/{random.choice(project_ids)}/statistics/',
+    ]
+    print(f'{args.tasks} задач, {args.concurrency} соединений, {args.duration} с, '
+          f'{args.database_url.split(":")[0]}')
+
+    for offset, (name, (config, app)) in enumerate(PROFILES.items()):
+        port = args.port + offset
+        server = start_server(config, app, port, args)
+        try:
+            asyncio.run(run_profile(name, port, token, paths, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Нагрузочный тест API для сравнения настроек подключения к БД.
+
+Поднимает тестовую базу (по DATABASE_URL), заполняет ее данными и
+измеряет запросы в секунду для сценариев:
+- baseline: новое соединение на каждый запрос, без PRAGMA (SQLite);
+- tuned: постоянные соединения и PRAGMA (WAL, synchronous=NORMAL, mmap).
+Для пула соединений PostgreSQL запустите скрипт с DATABASE_POOL=True.
+
+Использование:
+    python scripts/benchmark_db.py --threads 8 --duration 10
+    DATABASE_URL=postgres://... python scripts/benchmark_db.py
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from tasks.models import Project, ProjectTaskCounter, Task  # noqa: E402
+from task_manager.db.backends.sqlite3.base import DEFAULT_PRAGMAS  # noqa: E402
+
+
+def seed(tasks_count):
+    """Заполнить базу пользователями, проектами и задачами"""
+    user = User.objects.create_user('bench', password='bench')
+    token = Token.objects.create(user=user)
+    projects = Project.objects.bulk_create(
+        Project(name=f'Project {i}', owner=user) for i in range(20)
+    )
+    statuses = [value for value, _ in Task.STATUS_CHOICES]
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=f'Task {i}',
+                description='benchmark task',
+                project=random.choice(projects),
+                creator=user,
+                assignee=user if i % 3 else None,
+                status=random.choice(statuses),
+                priority=random.randint(1, 4),
+            )
+            for i in range(tasks_count)
+        ),
+        batch_size=1000
+    )
+    ProjectTaskCounter.rebuild()
+    return token.key, list(Task.objects.values_list('id', flat=True)[:500])
+
+
+def worker(token, task_ids, deadline, write_ratio, results):
+    client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f'Token {token}')
+    statuses = [value for value, _ in Task.STATUS_CHOICES]
+    done = errors = 0
+    while time.monotonic() < deadline:
+        if random.random() < write_ratio:
+            response = client.post(
+                f'/api/tasks/{random.choice(task_ids)}/change_status/?response=minimal',
+                {'status': random.choice(statuses)},
+                content_type='application/json'
+            )
+        else:
+            response = client.get(f'/api/tasks/?page={random.randint(1, 20)}')
+        done += 1
+        errors += response.status_code >= 400
+    connections.close_all()
+    results.append((done, errors))
+
+
+def run_scenario(name, token, task_ids, args, conn_max_age, pragmas):
+    connections.close_all()
+    connections.settings['default']['CONN_MAX_AGE'] = conn_max_age
+    settings.SQLITE_PRAGMAS = pragmas
+
+    results = []
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker, args=(token, task_ids, deadline, args.write_ratio, results)
+        )
+        for _ in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = sum(done for done, _ in results)
+    errors = sum(failed for _, failed in results)
+    print(f'{name:<10} {total / args.duration:>10.1f} req/s   errors: {errors}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = ['*']
+    settings.TASKS_RESPONSE_CACHE_TIMEOUT = 0  # измеряем базу, а не кэш ответов
+    if connection.vendor == 'sqlite':
+        # Файловая база: in-memory база не показывает эффект WAL и mmap
+        test_name = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+
+    try:
+        token, task_ids = seed(args.tasks)
+        print(f'{connection.vendor} ({connection.settings_dict["ENGINE"]}), '
+              f'{args.tasks} задач, {args.threads} потоков, {args.duration} с')
+        # Значения SQLite по умолчанию (journal_mode сохраняется в файле базы)
+        baseline_pragmas = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+        run_scenario('baseline', token, task_ids, args, conn_max_age=0, pragmas=baseline_pragmas)
+        run_scenario('tuned', token, task_ids, args, conn_max_age=600, pragmas=DEFAULT_PRAGMAS)
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(connection.settings_dict['NAME'], verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
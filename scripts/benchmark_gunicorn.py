@@ -0,0 +1,121 @@
+"""
+Сравнение профилей Gunicorn: время холодного старта и память воркеров.
+
+Профили:
+- legacy: sync-воркеры без preload_app (прежняя конфигурация);
+- tuned: gunicorn_config.py по умолчанию (preload_app, gthread, gc.freeze, прогрев).
+
+Для каждого профиля измеряется время от запуска до первого ответа 200,
+задержка первых запросов и после прогона нагрузки - RSS, PSS и USS
+(собственная память) каждого воркера по /proc/<pid>/smaps_rollup.
+
+Использование:
+    python scripts/benchmark_gunicorn.py --workers 4 --requests 200
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_asgi import HOST, prepare_database, request
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    'legacy': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_PRELOAD': 'False'},
+    'tuned': {},
+}
+
+
+def start_server(profile_env, port, args):
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        DEBUG='False',
+        ALLOWED_HOSTS=HOST,
+        WEB_CONCURRENCY=str(args.workers),
+        **profile_env
+    )
+    return subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py',
+            'task_manager.wsgi:application', '--bind', f'{HOST}:{port}',
+        ],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def memory(pid):
+    """RSS, PSS и USS процесса в МБ"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(':')
+            if rest.strip().endswith('kB'):
+                values[name] = int(rest.split()[0]) / 1024
+    uss = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values.get('Rss', 0), values.get('Pss', 0), uss
+
+
+def workers_of(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as children:
+        return [int(child) for child in children.read().split()]
+
+
+async def measure(name, port, token, args):
+    server = start_server(PROFILES[name], port, args)
+    started = time.perf_counter()
+    try:
+        while True:
+            try:
+                code, connection = await request(None, port, '/api/tasks/', token)
+            except (OSError, asyncio.IncompleteReadError):
+                await asyncio.sleep(0.05)
+                continue
+            if code == 200:
+                break
+        cold_start = time.perf_counter() - started
+
+        first = []
+        for _ in range(args.workers * 2):
+            request_started = time.perf_counter()
+            await request(None, port, '/api/tasks/', token)
+            first.append(time.perf_counter() - request_started)
+        for _ in range(args.requests):
+            await request(None, port, '/api/tasks/?page=2', token)
+
+        stats = [memory(pid) for pid in workers_of(server.pid)]
+        rss, pss, uss = (sum(values) / len(stats) for values in zip(*stats))
+        print(
+            f'{name:<8} старт {cold_start:>6.2f} с   первые запросы {max(first) * 1000:>7.1f} ms'
+            f'   на воркер: RSS {rss:>6.1f} МБ  PSS {pss:>6.1f} МБ  USS {uss:>6.1f} МБ'
+            f'   (воркеров: {len(stats)})'
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--port', type=int, default=8775)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+    if args.database_url is None:
+        path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        args.database_url = f'sqlite:///{path}'
+
+    token, _, _ = prepare_database(args)
+    for offset, name in enumerate(PROFILES):
+        asyncio.run(measure(name, args.port + offset, token, args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Сравнение двух отчетов pytest benchmarks --benchmark-json.
+
+Для каждого теста выводит медиану времени и число SQL-запросов в
+старом и новом отчете. Код выхода 1, если медиана выросла больше чем
+на --threshold процентов или выросло число запросов.
+
+Использование:
+    python scripts/compare_benchmarks.py old.json new.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    benchmarks = {
+        item['fullname']: {
+            'median': item['stats']['median'],
+            'queries': item.get('extra_info', {}).get('queries'),
+        }
+        for item in report['benchmarks']
+    }
+    return report.get('dataset', {}), benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument(
+        '--threshold', type=float, default=10.0,
+        help='Допустимый рост медианы, %% (по умолчанию 10)'
+    )
+    args = parser.parse_args()
+
+    old_dataset, old = load(args.old)
+    new_dataset, new = load(args.new)
+    if old_dataset != new_dataset:
+        print(f'Внимание: разные данные: {old_dataset} и {new_dataset}')
+
+    regressions = 0
+    print(f'{"тест":<60} {"было, мс":>9} {"стало, мс":>9} {"Δ, %":>7} {"запросы":>9}')
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after['median'] / before['median'] - 1) * 100
+        slower = change > args.threshold
+        more_queries = (
+            before['queries'] is not None and after['queries'] is not None
+            and after['queries'] > before['queries']
+        )
+        mark = ' !' if slower or more_queries else ''
+        regressions += bool(mark)
+        print(
+            f'{name.split("::", 1)[-1]:<60} {before["median"] * 1000:>9.2f} '
+            f'{after["median"] * 1000:>9.2f} {change:>+7.1f} '
+            f'{before["queries"]!s:>4}→{after["queries"]!s:<4}{mark}'
+        )
+    for name in sorted(new.keys() - old.keys()):
+        print(f'{name.split("::", 1)[-1]:<60} новый тест')
+
+    if regressions:
+        print(f'Регрессий: {regressions}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
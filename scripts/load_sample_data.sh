@@ -16,29 +16,18 @@ fi
 echo "1. Применение миграций..."
 python manage.py migrate
 
-# Загрузка данных
-echo "2. Загрузка примеров данных..."
-python manage.py loaddata fixtures/sample_data.json
-
-# Установка паролей для пользователей
-echo "3. Установка паролей для пользователей..."
-python manage.py shell << END
-from django.contrib.auth.models import User
-
-# Установить пароль для admin
-admin = User.objects.get(username='admin')
-admin.set_password('admin123')
-admin.save()
-
-# Установить пароль для developer
-developer = User.objects.get(username='developer')
-developer.set_password('dev123')
-developer.save()
-
-print("Пароли установлены:")
-print("  admin:admin123")
-print("  developer:dev123")
-END
+# Администратор создается штатной командой (пароль из переменной окружения)
+echo "2. Создание администратора..."
+if ! DJANGO_SUPERUSER_PASSWORD=admin123 python manage.py createsuperuser \
+        --noinput --username admin --email admin@example.com 2>/dev/null; then
+    echo "   admin уже существует"
+fi
+
+# Задачи загружаются потоком; проекты и остальные пользователи создаются по
+# названию / username, пароль хэшируется один раз для всех новых пользователей
+echo "3. Загрузка примеров данных..."
+python manage.py import_tasks fixtures/sample_tasks.ndjson \
+    --create-missing --default-password dev123
 
 echo ""
 echo "✅ Примеры данных успешно загружены!"
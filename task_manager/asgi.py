@@ -3,6 +3,8 @@ ASGI config for task_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Запуск: gunicorn -c gunicorn_asgi_config.py task_manager.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -12,6 +14,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+# Асинхронные представления для нагруженных GET-эндпоинтов задач
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+# Синхронный код каждого запроса выполняется в отдельном потоке, поэтому
+# постоянные соединения не переиспользуются; для PostgreSQL используйте
+# пул (DATABASE_POOL=True)
+os.environ.setdefault('CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
 
@@ -0,0 +1,73 @@
+"""
+PostgreSQL с пулом соединений внутри процесса (psycopg_pool).
+
+Соединения берутся из пула при открытии и возвращаются в него при
+закрытии, поэтому с CONN_MAX_AGE = 0 запрос не тратит время на
+установку нового соединения. Пул создается лениво в каждом процессе
+(после fork воркера gunicorn), размеры задаются в OPTIONS:
+    'pool': {'min_size': 2, 'max_size': 10, 'timeout': 30}
+"""
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError as e:
+    raise ImproperlyConfigured(
+        'Для DATABASE_POOL требуется пакет psycopg_pool: pip install "psycopg[pool]"'
+    ) from e
+
+
+class _PooledDatabase:
+    """Модуль psycopg, у которого connect() выдает соединение из пула"""
+
+    def __init__(self, module, pool):
+        self._module = module
+        self._pool = pool
+
+    def connect(self, **conn_params):
+        return self._pool.getconn()
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict['OPTIONS'].get('pool', {})
+        key = (self.alias, os.getpid())
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    kwargs=conn_params,
+                    min_size=options.get('min_size', 2),
+                    max_size=options.get('max_size', 10),
+                    timeout=options.get('timeout', 30),
+                    max_idle=options.get('max_idle', 600),
+                    name=f'django-{self.alias}',
+                )
+                self._pools[key] = pool
+        return pool
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        self._pool = self.get_pool(conn_params)
+        self.Database = _PooledDatabase(base.Database, self._pool)
+        return super().get_new_connection(conn_params)
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # putconn откатывает незавершенную транзакцию
+                self._pool.putconn(self.connection)
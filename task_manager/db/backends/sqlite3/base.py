@@ -0,0 +1,34 @@
+"""
+SQLite с настройками PRAGMA для конкурентной нагрузки.
+
+PRAGMA задаются настройкой SQLITE_PRAGMAS и применяются к каждому
+новому соединению: WAL позволяет читателям не блокироваться писателем,
+synchronous=NORMAL убирает fsync на каждый коммит (в режиме WAL это
+безопасно для целостности), busy_timeout ждет блокировку вместо ошибки
+"database is locked", mmap_size читает файл базы через отображение в память.
+
+busy_timeout по умолчанию берется из OPTIONS['timeout'] (секунды, как у
+sqlite3.connect): иначе PRAGMA переопределила бы заданное там ожидание.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+    'cache_size': -20000,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS))
+        pragmas.setdefault('busy_timeout', int(conn_params.get('timeout', 5) * 1000))
+        for name, value in pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
@@ -0,0 +1,239 @@
+"""
+Метрики запросов в формате Prometheus, общие для всех воркеров.
+
+Каждый процесс пишет значения в свой файл METRICS_DIR/worker_<pid>.db,
+отображенный в память (mmap): запись - это изменение восьми байт без
+блокировок между процессами. Эндпоинт /metrics читает файлы всех воркеров
+и суммирует значения. Файл завершившегося воркера мастер Gunicorn
+переносит в archive.db (хук child_exit), чтобы счетчики не обнулялись
+при перезапуске воркеров по max_requests.
+
+Модуль не зависит от Django: его используют и хуки Gunicorn в мастере.
+"""
+import glob
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'http_requests_total': ('counter', 'Запросы по представлению, методу и статусу'),
+    'http_request_duration_seconds': ('histogram', 'Время обработки запроса в Django'),
+    'http_request_db_queries': ('summary', 'Число SQL-запросов на запрос'),
+    'http_request_db_seconds': ('summary', 'Время SQL-запросов на запрос'),
+    'http_request_serialize_seconds': ('summary', 'Время сериализации (serializer.data)'),
+    'http_request_render_seconds': ('summary', 'Время рендеринга ответа (JSON)'),
+    'http_response_size_bytes': ('summary', 'Размер тела ответа'),
+    'http_query_budget_exceeded_total': ('counter', 'Запросы, превысившие бюджет SQL-запросов'),
+    'gunicorn_request_duration_seconds': ('histogram', 'Время запроса в воркере Gunicorn'),
+    'gunicorn_worker_aborts_total': ('counter', 'Воркеры, прерванные по таймауту'),
+    'gunicorn_worker_exits_total': ('counter', 'Завершения воркеров'),
+}
+
+_HEADER = struct.Struct('<i')
+_VALUE = struct.Struct('<d')
+ARCHIVE_NAME = 'archive.db'
+
+
+def get_dir():
+    return os.environ.get('METRICS_DIR') or os.path.join(
+        tempfile.gettempdir(), 'task_manager_metrics'
+    )
+
+
+class MmapedDict:
+    """
+    Словарь "ключ -> float64" в файле, отображенном в память.
+    Писатель - один процесс; читать файл могут другие процессы.
+
+    Формат: 8 байт заголовка (занятый размер), затем записи
+    [длина ключа: int32][ключ, выровненный до 8 байт][значение: float64].
+    """
+    INITIAL_SIZE = 1 << 16
+
+    def __init__(self, path):
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+        self._used = _HEADER.unpack_from(self._mmap, 0)[0]
+        if self._used == 0:
+            self._used = 8
+            _HEADER.pack_into(self._mmap, 0, self._used)
+        self._positions = {key: pos for key, _, pos in _iter_entries(self._mmap, self._used)}
+
+    def inc(self, key, amount):
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = self._add_key(key)
+        _VALUE.pack_into(self._mmap, pos, _VALUE.unpack_from(self._mmap, pos)[0] + amount)
+
+    def _add_key(self, key):
+        encoded = key.encode()
+        padded = encoded + b' ' * (-(len(encoded) + _HEADER.size) % 8)
+        entry = _HEADER.pack(len(encoded)) + padded + _VALUE.pack(0.0)
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._file.truncate(self._capacity)
+            self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+        self._mmap[self._used:self._used + len(entry)] = entry
+        self._used += len(entry)
+        _HEADER.pack_into(self._mmap, 0, self._used)
+        pos = self._used - _VALUE.size
+        self._positions[key] = pos
+        return pos
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+def _iter_entries(data, used):
+    pos = 8
+    while pos < used:
+        length = _HEADER.unpack_from(data, pos)[0]
+        pos += _HEADER.size
+        key = bytes(data[pos:pos + length]).decode()
+        pos += length + (-(length + _HEADER.size) % 8)
+        yield key, _VALUE.unpack_from(data, pos)[0], pos
+        pos += _VALUE.size
+
+
+def read_file(path):
+    """Прочитать значения из файла метрик (без mmap, для других процессов)"""
+    with open(path, 'rb') as metrics_file:
+        data = metrics_file.read()
+    if len(data) < 8:
+        return {}
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    return {key: value for key, value, _ in _iter_entries(data, used)}
+
+
+_lock = threading.Lock()
+_store = None
+_store_pid = None
+
+
+def _get_store():
+    """Файл текущего процесса; после fork открывается новый"""
+    global _store, _store_pid
+    if _store_pid != os.getpid():
+        directory = get_dir()
+        os.makedirs(directory, exist_ok=True)
+        _store = MmapedDict(os.path.join(directory, f'worker_{os.getpid()}.db'))
+        _store_pid = os.getpid()
+    return _store
+
+
+def _key(name, labels=None):
+    if not labels:
+        return name
+    pairs = ','.join(f'{label}="{_escape(value)}"' for label, value in sorted(labels.items()))
+    return f'{name}{{{pairs}}}'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def inc(name, labels=None, amount=1.0):
+    with _lock:
+        _get_store().inc(_key(name, labels), amount)
+
+
+def observe(name, value, labels=None):
+    """Наблюдение для summary (_sum/_count) или histogram (+ бакеты)"""
+    labels = labels or {}
+    with _lock:
+        store = _get_store()
+        if METRICS[name][0] == 'histogram':
+            for bound in DURATION_BUCKETS + (math.inf,):
+                if value <= bound:
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    store.inc(_key(f'{name}_bucket', {**labels, 'le': le}), 1.0)
+        store.inc(_key(f'{name}_sum', labels), value)
+        store.inc(_key(f'{name}_count', labels), 1.0)
+
+
+def observe_request(view, method, status, duration, db_queries, db_seconds,
+                    serialize_seconds, render_seconds, size):
+    """Записать метрики одного запроса Django"""
+    labels = {'view': view}
+    inc('http_requests_total', {'view': view, 'method': method, 'status': status})
+    observe('http_request_duration_seconds', duration, labels)
+    observe('http_request_db_queries', db_queries, labels)
+    observe('http_request_db_seconds', db_seconds, labels)
+    observe('http_request_serialize_seconds', serialize_seconds, labels)
+    observe('http_request_render_seconds', render_seconds, labels)
+    if size is not None:
+        observe('http_response_size_bytes', size, labels)
+
+
+def collect():
+    """Суммарные значения по всем файлам каталога метрик"""
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(get_dir(), '*.db')):
+        try:
+            values = read_file(path)
+        except OSError:
+            continue  # файл удален между glob и чтением
+        for key, value in values.items():
+            totals[key] += value
+    return totals
+
+
+def _base_name(key):
+    name = key.split('{', 1)[0]
+    for suffix in ('_bucket', '_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+def render():
+    """Метрики в текстовом формате Prometheus"""
+    grouped = defaultdict(list)
+    for key, value in collect().items():
+        grouped[_base_name(key)].append((key, value))
+
+    lines = []
+    for name in sorted(grouped):
+        kind, description = METRICS.get(name, ('untyped', ''))
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{key} {value:g}' for key, value in sorted(grouped[name]))
+    return '\n'.join(lines) + '\n'
+
+
+def merge_worker(pid):
+    """Перенести значения завершившегося воркера в архив (вызывается мастером)"""
+    path = os.path.join(get_dir(), f'worker_{pid}.db')
+    try:
+        values = read_file(path)
+    except OSError:
+        return
+    archive = MmapedDict(os.path.join(get_dir(), ARCHIVE_NAME))
+    try:
+        for key, value in values.items():
+            archive.inc(key, value)
+    finally:
+        archive.close()
+    os.remove(path)
+
+
+def reset():
+    """Удалить файлы метрик предыдущего запуска (вызывается мастером при старте)"""
+    global _store, _store_pid
+    with _lock:
+        if _store is not None:
+            _store.close()
+        _store = _store_pid = None
+        for path in glob.glob(os.path.join(get_dir(), '*.db')):
+            os.remove(path)
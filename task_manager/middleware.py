@@ -0,0 +1,212 @@
+"""
+Middleware инструментирования запросов.
+
+Для каждого запроса измеряются общее время, число и время SQL-запросов
+(execute_wrapper на всех соединениях), время serializer.data и рендеринга
+ответа, размер тела. Значения пишутся в task_manager.metrics, медленные
+запросы - в лог 'task_manager.slow_requests' вместе с SQL самых долгих
+запросов к БД. Число SQL-запросов сравнивается с бюджетом действия
+(task_manager/query_budget.py).
+
+Middleware поддерживает sync и async: под ASGI цепочка middleware не
+переводится в поток. SQL считает обертка, установленная на каждое
+соединение (_record_query); измерения текущего запроса она берет из
+contextvar, поэтому учитываются и запросы из sync_to_async
+async-представлений.
+"""
+import contextvars
+import heapq
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer
+
+from . import metrics
+from .query_budget import QueryBudgetExceeded, get_action, get_query_budget
+
+logger = logging.getLogger('task_manager.slow_requests')
+budget_logger = logging.getLogger('task_manager.query_budget')
+
+_recorder = contextvars.ContextVar('request_recorder', default=None)
+
+
+class RequestRecorder:
+    """Измерения одного запроса"""
+
+    def __init__(self, slow_queries):
+        self.slow_queries = slow_queries
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.serializing = False
+        self.worst = []  # куча (время, sql) из slow_queries самых долгих запросов
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.db_queries += 1
+            self.db_seconds += duration
+            item = (duration, sql)
+            if len(self.worst) < self.slow_queries:
+                heapq.heappush(self.worst, item)
+            elif self.slow_queries:
+                heapq.heappushpop(self.worst, item)
+
+
+def _record_query(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    """Установить _record_query на соединение (обработчик connection_created)"""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+def instrument_serializers():
+    """
+    Измерять время BaseSerializer.data (его вызывают Serializer.data и
+    ListSerializer.data). Учитывается только внешний вызов: вложенные
+    сериализаторы внутри to_representation не суммируются повторно.
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, 'instrumented', False):
+        return
+
+    def data(self):
+        recorder = _recorder.get()
+        if recorder is None or recorder.serializing:
+            return original.fget(self)
+        recorder.serializing = True
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            recorder.serialize_seconds += time.perf_counter() - started
+            recorder.serializing = False
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+
+class MetricsMiddleware:
+    """Метрики и лог медленных запросов"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_request_seconds = getattr(settings, 'METRICS_SLOW_REQUEST_MS', 500) / 1000
+        self.slow_queries = getattr(settings, 'METRICS_SLOW_QUERIES', 3)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        instrument_serializers()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        # Соединения, открытые до загрузки middleware, connection_created не получили
+        for connection in connections.all():
+            install_query_recorder(connection)
+        recorder = RequestRecorder(self.slow_queries)
+        token = _recorder.set(recorder)
+        request._metrics_recorder = recorder
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.process_metrics(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = RequestRecorder(self.slow_queries)
+        token = _recorder.set(recorder)
+        request._metrics_recorder = recorder
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.process_metrics(request, response, recorder, time.perf_counter() - started)
+
+    def process_metrics(self, request, response, recorder, duration):
+        """Запись метрик, лог медленного запроса и проверка бюджета SQL"""
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        if view == 'metrics':
+            return response
+        size = None if response.streaming else len(response.content)
+        metrics.observe_request(
+            view, request.method, response.status_code, duration,
+            recorder.db_queries, recorder.db_seconds,
+            recorder.serialize_seconds, recorder.render_seconds, size
+        )
+        if duration >= self.slow_request_seconds:
+            self.log_slow_request(request, response, view, duration, recorder)
+        if match:
+            self.check_query_budget(request, match, view, recorder)
+        return response
+
+    def check_query_budget(self, request, match, view, recorder):
+        """
+        Превышение бюджета: метрика и лог; при QUERY_BUDGET_ENFORCE для
+        безопасных методов - исключение. Изменение к этому моменту уже
+        зафиксировано, и ответ 500 на сохраненную запись ввел бы клиента
+        в заблуждение, поэтому для POST / PUT / PATCH / DELETE только лог.
+        """
+        budget = get_query_budget(*get_action(match.func, request.method))
+        if budget is None or recorder.db_queries <= budget:
+            return
+        metrics.inc('http_query_budget_exceeded_total', {'view': view})
+        message = (
+            f'{request.method} {request.get_full_path()} ({view}): '
+            f'{recorder.db_queries} SQL-запросов при бюджете {budget}'
+        )
+        if request.method in SAFE_METHODS and getattr(
+            settings, 'QUERY_BUDGET_ENFORCE', settings.DEBUG
+        ):
+            raise QueryBudgetExceeded(message)
+        budget_logger.warning('Превышен бюджет SQL-запросов: %s', message)
+
+    def process_template_response(self, request, response):
+        """Время рендеринга (DRF Response рендерится после представления)"""
+        recorder = getattr(request, '_metrics_recorder', None)
+        if recorder is not None:
+            started = time.perf_counter()
+
+            def record_render(rendered):
+                recorder.render_seconds += time.perf_counter() - started
+
+            response.add_post_render_callback(record_render)
+        return response
+
+    def log_slow_request(self, request, response, view, duration, recorder):
+        queries = '\n'.join(
+            f'  {seconds * 1000:.1f} ms: {sql[:2000]}'
+            for seconds, sql in sorted(recorder.worst, reverse=True)
+        )
+        logger.warning(
+            'Медленный запрос %s %s (%s) -> %s: %.1f ms; SQL: %d за %.1f ms; '
+            'сериализация %.1f ms; рендеринг %.1f ms\n%s',
+            request.method, request.get_full_path(), view, response.status_code,
+            duration * 1000, recorder.db_queries, recorder.db_seconds * 1000,
+            recorder.serialize_seconds * 1000, recorder.render_seconds * 1000,
+            queries
+        )
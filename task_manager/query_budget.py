@@ -0,0 +1,54 @@
+"""
+Бюджеты SQL-запросов для действий представлений.
+
+Бюджет - максимальное число SQL-запросов на один HTTP-запрос к действию.
+Он объявляется декоратором @query_budget(n) на методе действия или
+атрибутом ViewSet query_budgets = {'list': n, ...}; query_budget(None)
+явно снимает ограничение (число запросов зависит от входных данных).
+
+MetricsMiddleware сравнивает с бюджетом число запросов за всю обработку,
+включая аутентификацию и проверку ETag. Превышение учитывается в метрике
+http_query_budget_exceeded_total и пишется в лог; при QUERY_BUDGET_ENFORCE
+(по умолчанию - DEBUG) для GET / HEAD / OPTIONS вызывает QueryBudgetExceeded.
+Изменяющие запросы к этому моменту уже зафиксированы, и ошибка в ответе
+на сохраненное изменение недопустима; в тестах их превышение проверяет
+фикстура enforce_query_budgets по логу.
+"""
+
+UNSET = object()
+
+
+class QueryBudgetExceeded(Exception):
+    """Действие выполнило больше SQL-запросов, чем разрешает его бюджет"""
+
+
+def query_budget(limit):
+    """Декоратор метода действия: не более limit SQL-запросов на запрос"""
+    def decorator(func):
+        func.query_budget = limit
+        return func
+    return decorator
+
+
+def get_action(view_func, method):
+    """(класс представления, имя метода-обработчика) для запроса или (None, None)"""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return None, None
+    method = method.lower()
+    actions = getattr(view_func, 'actions', None)
+    if actions is None:
+        return view_class, method
+    if method == 'head' and 'head' not in actions:
+        method = 'get'  # ViewSet обрабатывает HEAD методом для GET
+    return view_class, actions.get(method)
+
+
+def get_query_budget(view_class, action, default=None):
+    """Бюджет действия: атрибут метода, затем query_budgets класса; UNSET - не объявлен"""
+    if action is None:
+        return default
+    budget = getattr(getattr(view_class, action, None), 'query_budget', UNSET)
+    if budget is UNSET:
+        budget = getattr(view_class, 'query_budgets', {}).get(action, default)
+    return budget
@@ -0,0 +1,157 @@
+"""
+Кэшированная и предварительно сжатая схема OpenAPI.
+
+drf_yasg строит спецификацию, обходя все ViewSet'ы, сериализаторы и
+swagger_auto_schema, - десятки миллисекунд CPU на каждый запрос. Здесь
+спецификация строится один раз на процесс (для каждой схемы http/https;
+поле host удаляется, и клиенты используют адрес, с которого получена
+спецификация) или читается из файла, созданного командой generate_schema
+при деплое, и отдается готовыми байтами в сжатии br или
+gzip в зависимости от Accept-Encoding.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.test import RequestFactory
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:  # Brotli - необязательная зависимость
+    brotli = None
+
+CONTENT_TYPE = 'application/json; charset=utf-8'
+FILE_KEY = 'file'
+
+
+def compress(content):
+    """Сжатые варианты содержимого: {'gzip': ..., 'br': ...}"""
+    encoded = {'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(content, quality=11)
+    return encoded
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме запрещенных через q=0"""
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class RenderedSchema:
+    """Байты спецификации и их сжатые варианты"""
+
+    def __init__(self, content, encoded=None):
+        self.content = content
+        self.encoded = encoded if encoded is not None else compress(content)
+        self.etag = '"%s"' % hashlib.md5(content).hexdigest()
+
+    @classmethod
+    def from_file(cls, path):
+        path = Path(path)
+        encoded = {}
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            compressed = path.with_name(path.name + suffix)
+            if compressed.exists():
+                encoded[encoding] = compressed.read_bytes()
+        content = path.read_bytes()
+        if len(encoded) < 2:
+            # Файлы сжатия не созданы (например, без Brotli) - сжимаем в памяти
+            encoded = {**compress(content), **encoded}
+        return cls(content, encoded)
+
+    def response(self, request):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and self.etag in parse_etags(if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            accepted = accepted_encodings(request)
+            encoding = next((e for e in ('br', 'gzip') if e in accepted and e in self.encoded), None)
+            response = HttpResponse(
+                self.encoded[encoding] if encoding else self.content,
+                content_type=CONTENT_TYPE
+            )
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = self.etag
+        patch_vary_headers(response, ['Accept-Encoding'])
+        patch_cache_control(response, public=True, max_age=settings.SCHEMA_CACHE_MAX_AGE)
+        return response
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def render_schema(spec_view, scheme, host):
+    """Построить JSON-спецификацию представлением drf_yasg (без кэша)"""
+    request = RequestFactory().get(
+        '/swagger.json', HTTP_HOST=host, HTTP_ACCEPT='application/json',
+        secure=scheme == 'https'
+    )
+    response = spec_view(request)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(f'Не удалось построить схему: HTTP {response.status_code}')
+    return response.content
+
+
+def without_host(content):
+    """
+    Спецификация без поля host. Ключ кэша не зависит от заголовка Host:
+    иначе каждый новый порт или поддомен из ALLOWED_HOSTS строил бы схему
+    заново и добавлял запись в кэш.
+    """
+    spec = json.loads(content)
+    spec.pop('host', None)
+    return json.dumps(spec, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def get_schema(spec_view, request):
+    """Спецификация из файла generate_schema или построенная один раз на процесс"""
+    schema_file = Path(settings.SCHEMA_FILE)
+    key = FILE_KEY if schema_file.exists() else request.scheme
+    schema = _cache.get(key)
+    if schema is None:
+        with _lock:
+            schema = _cache.get(key)
+            if schema is None:
+                if key == FILE_KEY:
+                    schema = RenderedSchema.from_file(schema_file)
+                else:
+                    schema = RenderedSchema(
+                        without_host(render_schema(spec_view, key, request.get_host()))
+                    )
+                _cache[key] = schema
+    return schema
+
+
+def clear():
+    _cache.clear()
+
+
+def cached_spec_view(spec_view, ui_view=None):
+    """
+    Представление спецификации с кэшем. С ui_view запросы без ?format=openapi
+    (страницы Swagger UI / ReDoc) передаются ему: они дешевы, а саму
+    спецификацию UI запрашивает по тому же адресу с ?format=openapi.
+    """
+    def view(request, *args, **kwargs):
+        if ui_view is not None and request.GET.get('format') != 'openapi':
+            return ui_view(request, *args, **kwargs)
+        return get_schema(spec_view, request).response(request)
+
+    view.spec_view = spec_view
+    view.csrf_exempt = True
+    return view
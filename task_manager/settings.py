@@ -4,6 +4,8 @@ Django settings for task_manager project.
 
 import os
 from pathlib import Path
+
+import dj_database_url
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'task_manager.middleware.MetricsMiddleware',  # Метрики /metrics и лог медленных запросов
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -77,11 +80,105 @@ WSGI_APPLICATION = 'task_manager.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Подключение задается переменной DATABASE_URL (например,
+# postgres://user:password@db:5432/taskmanager), по умолчанию - SQLite.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': dj_database_url.config(
+        default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
+        # Постоянные соединения: не открывать новое соединение на каждый запрос
+        conn_max_age=int(os.getenv('CONN_MAX_AGE', '600')),
+        conn_health_checks=True,
+    )
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # PRAGMA для конкурентного доступа применяются при подключении
+    DATABASES['default']['ENGINE'] = 'task_manager.db.backends.sqlite3'
+    DATABASES['default']['OPTIONS'] = {'timeout': 20}
+elif os.getenv('DATABASE_POOL', 'False') == 'True':
+    # Пул соединений в процессе; переиспользованием занимается пул
+    DATABASES['default']['ENGINE'] = 'task_manager.db.backends.postgresql_pool'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+        },
     }
+
+# PRAGMA для SQLite переопределяются настройкой SQLITE_PRAGMAS
+# (по умолчанию - DEFAULT_PRAGMAS из task_manager/db/backends/sqlite3/base.py)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Кэш ответов API (tasks/cache.py): locmem по умолчанию,
+# RESPONSE_CACHE_BACKEND=file - общий для всех воркеров кэш на диске.
+
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'task-manager-responses',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('RESPONSE_CACHE_DIR', str(BASE_DIR / '.cache' / 'responses')),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': RESPONSE_CACHE_BACKENDS[os.getenv('RESPONSE_CACHE_BACKEND', 'locmem')],
+}
+
+TASKS_RESPONSE_CACHE_ALIAS = 'responses'
+# Время жизни записи, сек. (0 - кэш отключен). Ограничивает и устаревание
+# полей, зависящих от текущего времени (is_overdue, overdue_tasks).
+TASKS_RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '60'))
+
+
+# Кэш проверенных учетных данных (tasks/authentication.py), в памяти процесса.
+# Другие процессы узнают об удалении токена по поколению в кэше 'responses':
+# с бэкендом locmem оно тоже локально, и устаревание ограничивает только TTL.
+TASKS_AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', '1024'))
+_shared_response_cache = os.getenv('RESPONSE_CACHE_BACKEND', 'locmem') != 'locmem'
+TASKS_AUTH_TOKEN_CACHE_TTL = int(
+    os.getenv('AUTH_TOKEN_CACHE_TTL', '300' if _shared_response_cache else '5')
+)
+TASKS_AUTH_BASIC_CACHE_TTL = int(
+    os.getenv('AUTH_BASIC_CACHE_TTL', '30' if _shared_response_cache else '5')
+)
+
+# Асинхронные версии list/retrieve/my_tasks/statistics (tasks/async_views.py).
+# Включается в task_manager/asgi.py; под WSGI async-представления только добавят накладные расходы.
+TASKS_ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+
+# Метрики запросов (task_manager/metrics.py). Каталог файлов метрик задается
+# переменной окружения METRICS_DIR и должен быть общим для воркеров.
+METRICS_SLOW_REQUEST_MS = int(os.getenv('METRICS_SLOW_REQUEST_MS', '500'))
+METRICS_SLOW_QUERIES = 3  # Сколько самых долгих SQL-запросов выводить в лог
+# Превышение бюджета SQL-запросов действия (task_manager/query_budget.py):
+# True - исключение для GET/HEAD/OPTIONS (разработка, тесты), иначе и для
+# изменяющих запросов (уже зафиксированных) - метрика и предупреждение в лог
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', str(DEBUG)) == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'task_manager.slow_requests': {'handlers': ['console'], 'level': 'WARNING'},
+        'task_manager.query_budget': {'handlers': ['console'], 'level': 'WARNING'},
+        'tasks.deadlines': {'handlers': ['console'], 'level': 'INFO'},
+    },
 }
 
 
@@ -122,6 +219,10 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Спецификация OpenAPI, созданная командой generate_schema (отдается nginx и Django)
+SCHEMA_FILE = STATIC_ROOT / 'schema' / 'swagger.json'
+SCHEMA_CACHE_MAX_AGE = 3600
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -132,14 +233,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # orjson, если установлен (tasks/renderers.py), иначе стандартный json
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tasks.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',  # Bearer Token
-        'rest_framework.authentication.BasicAuthentication',  # Basic Auth для curl
+        'tasks.authentication.CachedTokenAuthentication',  # Bearer Token
+        'tasks.authentication.CachedBasicAuthentication',  # Basic Auth для curl
         'rest_framework.authentication.SessionAuthentication',  # Session для браузера
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -177,3 +288,15 @@ SWAGGER_SETTINGS = {
     'JSON_EDITOR': True,
 }
 
+
+# Полнотекстовый поиск (tasks/search.py).
+# По умолчанию бэкенд выбирается по типу базы: FTS5 для SQLite, tsvector для PostgreSQL.
+TASKS_SEARCH_BACKEND = os.getenv('TASKS_SEARCH_BACKEND') or None
+
+# Планировщик дедлайнов (tasks/deadlines.py, manage.py run_deadline_scheduler).
+# Получатели событий - пути классов через запятую: tasks.deadlines.LogSink,
+# tasks.deadlines.WebhookSink, tasks.deadlines.DatabaseSink.
+TASKS_DEADLINE_SINKS = os.getenv('DEADLINE_SINKS', 'tasks.deadlines.LogSink').split(',')
+# За сколько секунд до дедлайна отправляется событие due_soon (0 - не отправлять)
+TASKS_DEADLINE_DUE_SOON = int(os.getenv('DEADLINE_DUE_SOON', '3600'))
+TASKS_DEADLINE_WEBHOOK_URL = os.getenv('DEADLINE_WEBHOOK_URL', '')
@@ -8,6 +8,9 @@ from rest_framework.authtoken.views import obtain_auth_token
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from .schema import cached_spec_view
+from .views import metrics_view
+
 schema_view = get_schema_view(
    openapi.Info(
       title="Task Manager API",
@@ -32,6 +35,8 @@ schema_view = get_schema_view(
    permission_classes=(permissions.AllowAny,),
 )
 
+spec_view = schema_view.without_ui(cache_timeout=0)
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('tasks.urls')),
@@ -40,8 +45,15 @@ urlpatterns = [
     path('api/auth/token/', obtain_auth_token, name='api-token-auth'),
     
     # Swagger documentation
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    # Спецификация строится один раз на процесс (task_manager/schema.py),
+    # страницы UI запрашивают ее по своему адресу с ?format=openapi
+    path('swagger/', cached_spec_view(spec_view, schema_view.with_ui('swagger', cache_timeout=0)),
+         name='schema-swagger-ui'),
+    path('redoc/', cached_spec_view(spec_view, schema_view.with_ui('redoc', cache_timeout=0)),
+         name='schema-redoc'),
+    path('swagger.json', cached_spec_view(spec_view), name='schema-json'),
+
+    # Метрики Prometheus
+    path('metrics', metrics_view, name='metrics'),
 ]
 
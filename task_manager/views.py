@@ -0,0 +1,11 @@
+"""
+Служебные представления проекта.
+"""
+from django.http import HttpResponse
+
+from . import metrics
+
+
+def metrics_view(request):
+    """Метрики всех воркеров в текстовом формате Prometheus"""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
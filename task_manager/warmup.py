@@ -0,0 +1,54 @@
+"""
+Прогрев приложения в мастер-процессе Gunicorn (preload_app).
+
+Все, что строится лениво при первом запросе - URL-резолвер, поля
+сериализаторов, схема OpenAPI - выполняется один раз до fork, и воркеры
+получают готовые объекты в общих страницах памяти.
+"""
+import inspect
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import get_resolver, resolve
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PATHS = ['/api/tasks/', '/api/projects/', '/swagger/']
+
+
+def warm_url_resolver():
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018 - заполняет кэши резолвера
+    for path in WARMUP_PATHS:
+        resolve(path)
+
+
+def warm_serializers():
+    """Построить поля всех сериализаторов приложения tasks"""
+    from tasks import serializers as task_serializers
+
+    for _, serializer_class in inspect.getmembers(task_serializers, inspect.isclass):
+        if issubclass(serializer_class, serializers.BaseSerializer):
+            serializer_class().fields  # noqa: B018
+
+
+def warm_schema():
+    """Построить и закэшировать схему OpenAPI (без обращений к БД)"""
+    from task_manager.schema import get_schema
+    from task_manager.urls import spec_view
+
+    host = next((h for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost').lstrip('.')
+    get_schema(spec_view, RequestFactory().get('/swagger.json', HTTP_HOST=host))
+
+
+def warm_up():
+    for step in (warm_url_resolver, warm_serializers, warm_schema):
+        try:
+            step()
+        except Exception:
+            logger.exception('Ошибка прогрева: %s', step.__name__)
+    # Соединения с БД не должны наследоваться воркерами
+    connections.close_all()
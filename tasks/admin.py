@@ -2,7 +2,7 @@
 Административная панель Django для управления проектами и задачами.
 """
 from django.contrib import admin
-from .models import Project, Task
+from .models import Change, DeadlineEvent, Project, Task, request_now
 
 
 @admin.register(Project)
@@ -25,6 +25,10 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Счетчики задач считаются одним запросом для всей страницы"""
+        return super().get_queryset(request).select_related('owner').with_task_counts()
+
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
@@ -55,9 +59,29 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Просроченность вычисляется в SQL для всей страницы"""
+        return super().get_queryset(request).with_is_overdue(request_now(request))
+
     def is_overdue(self, obj):
         """Отображение просроченных задач"""
         return obj.is_overdue
     is_overdue.boolean = True
     is_overdue.short_description = 'Просрочена'
+    is_overdue.admin_order_field = 'annotated_is_overdue'
+
+
+@admin.register(DeadlineEvent)
+class DeadlineEventAdmin(admin.ModelAdmin):
+    """События планировщика дедлайнов (DatabaseSink)"""
+    list_display = ['task', 'kind', 'deadline', 'created_at']
+    list_filter = ['kind', 'created_at']
+    list_select_related = ['task']
+    raw_id_fields = ['task']
+
 
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    """Журнал изменений (/api/changes/)"""
+    list_display = ['id', 'model', 'object_id', 'action', 'assignee_id', 'created_at']
+    list_filter = ['model', 'action']
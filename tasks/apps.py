@@ -6,3 +6,8 @@ class TasksConfig(AppConfig):
     name = 'tasks'
     verbose_name = 'Управление задачами'
 
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(signals.restore_search_schema, sender=self)
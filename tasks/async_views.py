@@ -0,0 +1,98 @@
+"""
+Асинхронные версии нагруженных действий ViewSet'ов для режима ASGI.
+
+DRF 3.14 вызывает обработчики синхронно, поэтому маршрут, среди действий
+которого есть перечисленные в async_actions, получает асинхронный dispatch:
+аутентификация и проверка прав выполняются в потоке, обработчик a<действие>
+работает с БД через асинхронный ORM, остальные методы маршрута (например,
+POST на списке) вызываются синхронно через sync_to_async.
+
+Режим включается настройкой TASKS_ASYNC_VIEWS (task_manager/asgi.py
+включает ее по умолчанию); под WSGI представления остаются синхронными.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class AsyncViewSetMixin:
+    """
+    Асинхронный dispatch для действий из async_actions.
+
+    Асинхронный обработчик действия называется 'a' + имя действия
+    (alist, aretrieve, amy_tasks) и не должен обращаться к БД синхронно:
+    в асинхронном контексте Django выбросит SynchronousOnlyOperation.
+    """
+    async_actions = ()
+    async_route = False
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        async_route = initkwargs.pop('async_route', None)
+        if async_route is None:
+            async_route = getattr(settings, 'TASKS_ASYNC_VIEWS', False) and any(
+                action in cls.async_actions for action in (actions or {}).values()
+            )
+        view = super().as_view(actions, async_route=async_route, **initkwargs)
+        if async_route:
+            # dispatch возвращает корутину - Django должен ее дождаться
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_route:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        handler = getattr(self, f'a{action}', None) if action in self.async_actions else None
+        if handler is None:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        # Повторяет APIView.dispatch
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self, queryset=None):
+        """Асинхронная версия get_object"""
+        if queryset is None:
+            queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginated_response(self, queryset):
+        """Пагинированный ответ по queryset'у через асинхронную пагинацию"""
+        page = None
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.apaginated_response(self.filter_queryset(self.get_queryset()))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
@@ -0,0 +1,156 @@
+"""
+Аутентификация с кэшированием проверенных учетных данных.
+
+TokenAuthentication выполняет запрос Token + User на каждый запрос,
+а BasicAuthentication - полный расчет PBKDF2 (~100 мс CPU). Здесь результаты
+проверки хранятся в ограниченном LRU-кэше процесса с временем жизни записи.
+Записи удаляются обработчиками сигналов при удалении токена и изменении
+или удалении пользователя. Для других процессов сигналы увеличивают
+поколение 'auth:<id пользователя>' в общем кэше ответов (tasks/cache.py):
+запись, сохраненная при другом поколении, считается промахом.
+"""
+import copy
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import authentication
+
+from . import cache
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU-кэш с ограничением размера и временем жизни записей.
+    Значения - тройки (user, auth, поколение учетных данных пользователя).
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_user(self, user_id):
+        """Удалить все записи пользователя"""
+        with self._lock:
+            stale = [key for key, (value, _) in self._data.items() if value[0].pk == user_id]
+            for key in stale:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+token_cache = LRUCache(
+    getattr(settings, 'TASKS_AUTH_CACHE_SIZE', 1024),
+    getattr(settings, 'TASKS_AUTH_TOKEN_CACHE_TTL', 300),
+)
+basic_cache = LRUCache(
+    getattr(settings, 'TASKS_AUTH_CACHE_SIZE', 1024),
+    getattr(settings, 'TASKS_AUTH_BASIC_CACHE_TTL', 30),
+)
+
+
+def invalidate_token(key):
+    token_cache.delete(key)
+
+
+def invalidate_user(user_id):
+    token_cache.delete_user(user_id)
+    basic_cache.delete_user(user_id)
+
+
+def clear():
+    token_cache.clear()
+    basic_cache.clear()
+
+
+def generation(user_id):
+    return cache.get_generations([f'auth:{user_id}'])[0]
+
+
+def cached_credentials(lru, key):
+    """(user, auth) из кэша процесса, если поколение пользователя не изменилось"""
+    value = lru.get(key)
+    if value is None:
+        return None
+    user, auth, user_generation = value
+    if user_generation != generation(user.pk):
+        lru.delete(key)
+        return None
+    return user, auth
+
+
+def store_credentials(lru, key, credentials):
+    # Пользователь известен только после проверки, поэтому поколение
+    # читается после нее; cache.bump повторяется после фиксации транзакции,
+    # и проверка, прочитавшая данные до коммита, обычно получает старое поколение
+    user, auth = credentials
+    lru.set(key, (user, auth, generation(user.pk)))
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """TokenAuthentication с кэшем token -> user"""
+
+    def authenticate_credentials(self, key):
+        credentials = cached_credentials(token_cache, key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            store_credentials(token_cache, key, credentials)
+        user, token = credentials
+        # Каждый запрос получает свою копию: атрибуты, которые код
+        # устанавливает на request.user, не должны попадать в общий кэш
+        return copy.copy(user), token
+
+
+class CachedBasicAuthentication(authentication.BasicAuthentication):
+    """
+    BasicAuthentication с коротким кэшем проверенных пар логин/пароль.
+    Ключом служит HMAC от учетных данных, пароль в памяти не хранится.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = hmac.new(
+            settings.SECRET_KEY.encode(),
+            f'{userid}:{password}'.encode(),
+            hashlib.sha256
+        ).hexdigest()
+        credentials = cached_credentials(basic_cache, key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(userid, password, request)
+            store_credentials(basic_cache, key, credentials)
+        user, auth = credentials
+        return copy.copy(user), auth
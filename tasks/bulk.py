@@ -0,0 +1,210 @@
+"""
+Массовые операции над задачами.
+
+Полезная нагрузка проверяется за один проход, проекты и исполнители
+загружаются одним запросом на каждую модель, запись выполняется через
+bulk_create / bulk_update в одной транзакции вместе с записями журнала
+изменений. Ошибки возвращаются для каждого элемента отдельно и не
+прерывают обработку остальных.
+"""
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Project, Task, ProjectTaskCounter
+from .serializers import TaskCreateUpdateSerializer
+from . import cache
+from .changes import CREATE, UPDATE, log_tasks
+
+MAX_BULK_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+
+class TaskBulkItemSerializer(TaskCreateUpdateSerializer):
+    """
+    Проверка одного элемента массовой операции.
+    Связанные объекты принимаются как ID и разрешаются пакетно.
+    """
+    id = serializers.IntegerField(required=False)
+    project = serializers.IntegerField()
+    assignee = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta(TaskCreateUpdateSerializer.Meta):
+        read_only_fields = []
+
+
+def _validate_payload(items):
+    """Проверить, что полезная нагрузка - непустой список допустимого размера"""
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError('Ожидается непустой список объектов')
+    if len(items) > MAX_BULK_ITEMS:
+        raise serializers.ValidationError(f'Не более {MAX_BULK_ITEMS} элементов за запрос')
+
+
+def _resolve_related(validated):
+    """Загрузить проекты и исполнителей всех элементов (по одному запросу)"""
+    project_ids = {data['project'] for data in validated.values() if 'project' in data}
+    user_ids = {data['assignee'] for data in validated.values() if data.get('assignee')}
+    projects = Project.objects.in_bulk(project_ids) if project_ids else {}
+    users = User.objects.in_bulk(user_ids) if user_ids else {}
+    return projects, users
+
+
+def _apply_related(data, projects, users):
+    """Заменить ID связанных объектов на экземпляры; вернуть ошибки"""
+    errors = {}
+    if 'project' in data:
+        project = projects.get(data['project'])
+        if project is None:
+            errors['project'] = ['Проект не найден']
+        data['project'] = project
+    if data.get('assignee') is not None:
+        assignee = users.get(data['assignee'])
+        if assignee is None:
+            errors['assignee'] = ['Пользователь не найден']
+        data['assignee'] = assignee
+    return errors
+
+
+def _validate_items(items, partial=False):
+    """Проверить элементы; вернуть {index: validated_data} и список ошибок"""
+    validated, errors = {}, []
+    for index, item in enumerate(items):
+        serializer = TaskBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            validated[index] = dict(serializer.validated_data)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+
+    projects, users = _resolve_related(validated)
+    for index in list(validated):
+        item_errors = _apply_related(validated[index], projects, users)
+        if item_errors:
+            del validated[index]
+            errors.append({'index': index, 'errors': item_errors})
+    return validated, errors
+
+
+def _invalidate_cache(tasks):
+    """Массовые операции не вызывают сигналы - инвалидируем кэш ответов явно"""
+    project_ids, assignee_ids = set(), set()
+    for task in tasks:
+        old_project_id, old_assignee_id = getattr(task, '_cache_state', (None, None))
+        project_ids.update((task.project_id, old_project_id))
+        assignee_ids.update((task.assignee_id, old_assignee_id))
+    cache.invalidate_tasks(project_ids, assignee_ids)
+
+
+def _locked(queryset, ids):
+    """
+    in_bulk с блокировкой строк задач (SELECT ... FOR UPDATE) до конца
+    транзакции; порядок по id исключает взаимную блокировку двух операций
+    """
+    return queryset.select_for_update(of=('self',)).order_by('pk').in_bulk(ids)
+
+
+def bulk_create_tasks(items, creator):
+    """Создать задачи; вернуть (созданные задачи, ошибки по элементам)"""
+    _validate_payload(items)
+    validated, errors = _validate_items(items)
+
+    now = timezone.now()
+    tasks = []
+    for data in validated.values():
+        data.pop('id', None)
+        task = Task(creator=creator, **data)
+        task.sync_completed_at(now)
+        tasks.append(task)
+
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=BULK_BATCH_SIZE)
+        ProjectTaskCounter.apply_deltas(
+            Counter((task.project_id, task.status) for task in created)
+        )
+        log_tasks(created, CREATE)
+        _invalidate_cache(created)
+    return created, sorted(errors, key=lambda error: error['index'])
+
+
+def bulk_update_tasks(items):
+    """Частично обновить задачи по id; вернуть (обновленные задачи, ошибки)"""
+    _validate_payload(items)
+    validated, errors = _validate_items(items, partial=True)
+
+    ids, seen = {}, set()
+    for index, data in list(validated.items()):
+        task_id = data.pop('id', None)
+        if task_id is None or task_id in seen:
+            message = 'Требуется id' if task_id is None else 'Повторяющийся id'
+            errors.append({'index': index, 'errors': {'id': [message]}})
+            del validated[index]
+            continue
+        seen.add(task_id)
+        ids[index] = task_id
+
+    now = timezone.now()
+    tasks, fields, deltas = [], {'completed_at', 'updated_at'}, Counter()
+    # Строки блокируются до конца транзакции: дельты счетчиков считаются
+    # от статуса и проекта, которые не изменит параллельная запись
+    with transaction.atomic():
+        existing = _locked(Task.objects.select_related('project', 'assignee', 'creator'), ids.values())
+        for index, data in validated.items():
+            task = existing.get(ids[index])
+            if task is None:
+                errors.append({'index': index, 'errors': {'id': ['Задача не найдена']}})
+                continue
+
+            deltas[(task.project_id, task.status)] -= 1
+            for field, value in data.items():
+                setattr(task, field, value)
+                fields.add(field)
+            task.sync_completed_at(now)
+            task.updated_at = now
+            deltas[(task.project_id, task.status)] += 1
+            tasks.append(task)
+
+        Task.objects.bulk_update(tasks, sorted(fields), batch_size=BULK_BATCH_SIZE)
+        ProjectTaskCounter.apply_deltas(deltas)
+        log_tasks(tasks, UPDATE)
+        _invalidate_cache(tasks)
+    return tasks, sorted(errors, key=lambda error: error['index'])
+
+
+def bulk_change_status(ids, new_status):
+    """Изменить статус задач; вернуть (ID обновленных задач, ошибки)"""
+    if new_status not in dict(Task.STATUS_CHOICES):
+        raise serializers.ValidationError({'status': ['Недопустимый статус']})
+    _validate_payload(ids)
+    try:
+        ids = [int(task_id) for task_id in ids]
+    except (TypeError, ValueError):
+        raise serializers.ValidationError({'ids': ['Ожидается список целых чисел']})
+
+    now = timezone.now()
+    deltas = Counter()
+    with transaction.atomic():
+        existing = _locked(
+            Task.objects.only('id', 'project_id', 'assignee_id', 'status', 'completed_at'), ids
+        )
+        for task in existing.values():
+            deltas[(task.project_id, task.status)] -= 1
+            task.status = new_status
+            task.sync_completed_at(now)
+            task.updated_at = now
+            deltas[(task.project_id, task.status)] += 1
+
+        Task.objects.bulk_update(
+            existing.values(), ['status', 'completed_at', 'updated_at'],
+            batch_size=BULK_BATCH_SIZE
+        )
+        ProjectTaskCounter.apply_deltas(deltas)
+        log_tasks(existing.values(), UPDATE)
+        _invalidate_cache(existing.values())
+    errors = [
+        {'id': task_id, 'errors': {'id': ['Задача не найдена']}}
+        for task_id in ids if task_id not in existing
+    ]
+    return sorted(existing), errors
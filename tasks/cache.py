@@ -0,0 +1,238 @@
+"""
+Кэш ответов API с инвалидацией по счетчикам поколений.
+
+Каждая запись кэша помечена поколениями областей ("scopes"), от которых
+зависит ответ: 'tasks', 'projects', 'project:<id>', 'assignee:<id>' и
+'users' (вложенные данные владельцев, исполнителей и авторов), а также
+'auth:<id>' для кэша учетных данных (tasks/authentication.py).
+Обработчики сигналов Task / Project / User увеличивают поколения затронутых
+областей, и записи со старыми поколениями считаются вытесненными при
+следующем чтении. Поколения хранятся в том же кэше, поэтому инвалидация
+работает и для нескольких процессов с файловым бэкендом.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+GENERATION_PREFIX = 'tasks:gen:'
+RESPONSE_PREFIX = 'tasks:response:'
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, 'TASKS_RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'TASKS_RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def _record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def stats():
+    """Метрики кэша текущего процесса: hits, misses, evictions, stores"""
+    with _stats_lock:
+        data = {key: _stats[key] for key in ('hits', 'misses', 'evictions', 'stores')}
+    lookups = data['hits'] + data['misses']
+    data['hit_ratio'] = round(data['hits'] / lookups, 4) if lookups else 0.0
+    return data
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _bump_now(scopes):
+    cache = get_cache()
+    for scope in scopes:
+        key = GENERATION_PREFIX + scope
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Ключ отсутствует: начальное значение из времени, чтобы поколение,
+            # вытесненное из кэша, не совпало со старыми записями
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump(*scopes):
+    """
+    Увеличить поколения областей. Повторяется после фиксации транзакции:
+    иначе параллельный запрос мог бы закэшировать данные, прочитанные до
+    коммита, под уже новым поколением.
+    """
+    scopes = [scope for scope in scopes if scope]
+    if not scopes:
+        return
+    _bump_now(scopes)
+    transaction.on_commit(lambda: _bump_now(scopes))
+
+
+def invalidate_tasks(project_ids=(), assignee_ids=()):
+    """Инвалидировать ответы, зависящие от задач указанных проектов и исполнителей"""
+    bump(
+        'tasks',
+        *{f'project:{pk}' for pk in project_ids if pk},
+        *{f'assignee:{pk}' for pk in assignee_ids if pk}
+    )
+
+
+def invalidate_project(project_id):
+    bump('projects', f'project:{project_id}')
+
+
+def invalidate_users():
+    """Инвалидировать ответы с вложенными данными пользователей"""
+    bump('users')
+
+
+def invalidate_credentials(user_id):
+    """Сбросить учетные данные пользователя в кэшах аутентификации всех процессов"""
+    bump(f'auth:{user_id}')
+
+
+def get_generations(scopes):
+    cache = get_cache()
+    keys = [GENERATION_PREFIX + scope for scope in scopes]
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    for key in missing:
+        cache.add(key, time.time_ns(), timeout=None)
+    if missing:
+        values.update(cache.get_many(missing))
+    return tuple(values.get(key) for key in keys)
+
+
+class ResponseCacheMixin:
+    """
+    Кэширование GET-ответов ViewSet'а для каждого пользователя и строки запроса.
+
+    ViewSet реализует get_cache_scopes() - список областей, от которых зависит
+    ответ текущего действия (None - не кэшировать). В кэш кладутся данные
+    ответа до рендеринга, поэтому при попадании не выполняются ни запросы
+    к БД, ни сериализация.
+    """
+
+    def get_cache_scopes(self):
+        return None
+
+    def get_cache_key(self, request):
+        return RESPONSE_PREFIX + ':'.join([
+            str(request.user.pk),
+            request.accepted_renderer.format,
+            request.path,
+            request.GET.urlencode(),
+        ])
+
+    def cached_response(self, request, build_response):
+        """Вернуть ответ из кэша или построить его и сохранить"""
+        lookup = self._cache_lookup(request)
+        if lookup is None:
+            return build_response()
+        key, generations, response = lookup
+        if response is not None:
+            return response
+        return self._cache_store(key, generations, build_response())
+
+    async def acached_response(self, request, build_response):
+        """
+        cached_response для async-представлений: build_response возвращает
+        корутину. Операции с кэшем выполняются синхронно - для бэкендов
+        в памяти процесса это дешевле переключения в поток.
+        """
+        lookup = self._cache_lookup(request)
+        if lookup is None:
+            return await build_response()
+        key, generations, response = lookup
+        if response is not None:
+            return response
+        return self._cache_store(key, generations, await build_response())
+
+    def _cache_lookup(self, request):
+        """
+        Вернуть (ключ, поколения, ответ из кэша или None)
+        или None, если ответ действия не кэшируется
+        """
+        scopes = self.get_cache_scopes()
+        if request.method != 'GET' or scopes is None or get_timeout() <= 0:
+            return None
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        generations = get_generations(scopes)
+        entry = cache.get(key)
+        if entry is not None and entry['generations'] != generations:
+            _record('evictions')
+            cache.delete(key)
+            entry = None
+
+        if entry is not None:
+            _record('hits')
+            return key, generations, self._response_from_entry(request, entry)
+        _record('misses')
+        return key, generations, None
+
+    def _cache_store(self, key, generations, response):
+        if response.status_code == status.HTTP_200_OK and response.data is not None:
+            get_cache().set(key, {
+                'generations': generations,
+                'data': response.data,
+                'headers': {h: response[h] for h in CACHED_HEADERS if h in response},
+            }, get_timeout())
+            _record('stores')
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def _response_from_entry(self, request, entry):
+        """Ответ из кэша с учетом If-None-Match / If-Modified-Since"""
+        headers = dict(entry['headers'])
+        if self._is_fresh(request, headers):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        else:
+            response = Response(entry['data'], headers=headers)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def _is_fresh(self, request, headers):
+        # Те же правила, что и в ConditionalRequestMixin.not_modified
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return 'ETag' in headers and ('*' in etags or headers['ETag'] in etags)
+        if not self.detail or 'Last-Modified' not in headers:
+            return False
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return bool(since and parse_http_date_safe(headers['Last-Modified']) <= since)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(ResponseCacheMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(
+            request, lambda: super(ResponseCacheMixin, self).alist(request, *args, **kwargs)
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(
+            request, lambda: super(ResponseCacheMixin, self).aretrieve(request, *args, **kwargs)
+        )
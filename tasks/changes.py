@@ -0,0 +1,205 @@
+"""
+Журнал изменений задач и проектов для инкрементальной синхронизации.
+
+Каждое создание, изменение и удаление задачи или проекта добавляет запись
+Change в той же транзакции: одиночные операции - обработчиками сигналов
+(tasks/signals.py), массовые и загрузка файлов - явно через log_tasks.
+Задачи, удаленные вместе с проектом, отдельных записей не получают:
+клиент удаляет их по записи об удалении проекта.
+
+GET /api/changes/?since=<номер> возвращает записи с номером больше since
+вместе с текущим состоянием объектов, поэтому синхронизация стоит
+O(изменений), а не O(данных). С ?wait=<сек.> запрос ждет новых записей
+(long-poll). Без since возвращается только текущий номер: клиент
+запоминает его, загружает данные целиком и дальше читает журнал.
+
+Номера выдаются при вставке, а видны после фиксации транзакции: на
+PostgreSQL запись с большим номером может стать видна раньше записи с
+меньшим. Поэтому лента не заходит за пропуск номера перед записью моложе
+GAP_TIMEOUT - пропуск может оказаться еще не зафиксированной транзакцией.
+Пропуски от откаченных транзакций задерживают ленту не дольше GAP_TIMEOUT.
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Change, Project, Task, request_now
+from .serializers import ProjectListSerializer, TaskListSerializer
+
+CREATE, UPDATE, DELETE = 'create', 'update', 'delete'
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_WAIT = 30
+POLL_INTERVAL = 0.5
+GAP_TIMEOUT = timedelta(seconds=10)
+
+changes_committed = Signal()
+
+
+class ChangesGone(Exception):
+    """Записи после since удалены очисткой: клиенту нужна полная синхронизация"""
+
+
+def task_change(task, action):
+    """Несохраненная запись журнала о задаче"""
+    # Исходные проект и исполнитель запоминаются в from_db (см. Task.from_db)
+    old_project_id, old_assignee_id = getattr(task, '_cache_state', (None, None))
+    return Change(
+        model='task', object_id=task.pk, action=action,
+        project_id=task.project_id,
+        previous_project_id=old_project_id if old_project_id != task.project_id else None,
+        assignee_id=task.assignee_id,
+        previous_assignee_id=old_assignee_id if old_assignee_id != task.assignee_id else None,
+    )
+
+
+def project_change(project, action):
+    """Несохраненная запись журнала о проекте"""
+    return Change(model='project', object_id=project.pk, project_id=project.pk, action=action)
+
+
+def change_filter(project=None, assignee=None):
+    """
+    Условие записей проекта и/или исполнителя, включая задачи, перенесенные
+    в другой проект или переназначенные (клиент должен убрать их у себя)
+    """
+    condition = Q()
+    if project is not None:
+        condition &= Q(project_id=project) | Q(previous_project_id=project)
+    if assignee is not None:
+        condition &= Q(model='task') & (Q(assignee_id=assignee) | Q(previous_assignee_id=assignee))
+    return condition
+
+
+def matches(change, project=None, assignee=None):
+    """change_filter для записи в памяти"""
+    if project is not None and project not in (change.project_id, change.previous_project_id):
+        return False
+    if assignee is not None and (
+        change.model != 'task' or assignee not in (change.assignee_id, change.previous_assignee_id)
+    ):
+        return False
+    return True
+
+
+def record(changes):
+    """
+    Добавить записи журнала. После фиксации транзакции отправляется
+    changes_committed: ожидающие ленты процесса (tasks/push.py) читают
+    записи сразу, не дожидаясь следующего опроса.
+    """
+    Change.objects.bulk_create(changes)
+    transaction.on_commit(lambda: changes_committed.send(sender=Change))
+
+
+def log_tasks(tasks, action):
+    """Записать изменения задач массовой операции (сигналы не вызываются)"""
+    record([task_change(task, action) for task in tasks])
+
+
+def last_seq():
+    return Change.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def visible_until(since, top, now):
+    """
+    Номер, дальше которого ленту отдавать нельзя: последний номер перед
+    первым пропуском, за которым следует запись моложе GAP_TIMEOUT (или top).
+    """
+    recent = list(
+        Change.objects.filter(id__gt=since, id__lte=top, created_at__gte=now - GAP_TIMEOUT)
+        .order_by('id').values_list('id', flat=True)
+    )
+    if not recent:
+        return top
+    previous = Change.objects.filter(id__gt=since, id__lt=recent[0]).order_by('-id').values_list(
+        'id', flat=True
+    ).first() or since
+    for seq in recent:
+        if seq != previous + 1:
+            return previous
+        previous = seq
+    return top
+
+
+def read_changes(since, limit=DEFAULT_LIMIT, assignee=None, project=None, now=None):
+    """
+    Страница записей после since: (записи, есть ли еще, номер для
+    следующего запроса). project / assignee - см. change_filter; номер
+    продвигается и за пропущенные фильтром записи.
+    """
+    oldest = Change.objects.order_by('id').values_list('id', flat=True).first()
+    if oldest is not None and since < oldest - 1:
+        raise ChangesGone()
+
+    # Верхняя граница читается до записей: номер для следующего запроса не
+    # должен перескочить записи, зафиксированные между запросами
+    top = visible_until(since, last_seq(), now or timezone.now())
+    changes = Change.objects.filter(change_filter(project, assignee), id__gt=since, id__lte=top)
+    rows = list(changes.order_by('id')[:limit + 1])
+    if len(rows) > limit:
+        return rows[:limit], True, rows[limit - 1].id
+    return rows, False, max(top, since)
+
+
+def wait_for_changes(since, limit=DEFAULT_LIMIT, assignee=None, project=None, wait=0):
+    """read_changes, ожидающий появления записей до wait секунд"""
+    deadline = time.monotonic() + wait
+    while True:
+        page = read_changes(since, limit, assignee, project)
+        if page[0] or time.monotonic() >= deadline:
+            return page
+        since = page[2]
+        time.sleep(POLL_INTERVAL)
+
+
+async def await_changes(since, limit=DEFAULT_LIMIT, assignee=None, project=None, wait=0):
+    """Асинхронный wait_for_changes: ожидание не занимает поток"""
+    deadline = time.monotonic() + wait
+    while True:
+        page = await sync_to_async(read_changes)(since, limit, assignee, project)
+        if page[0] or time.monotonic() >= deadline:
+            return page
+        since = page[2]
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+def serialize_changes(rows, request=None):
+    """Записи с текущим состоянием объектов (None - объект удален)"""
+    ids = {'task': set(), 'project': set()}
+    for change in rows:
+        if change.action != DELETE:
+            ids[change.model].add(change.object_id)
+
+    objects = {'task': {}, 'project': {}}
+    if ids['task']:
+        tasks = Task.objects.select_related('project', 'assignee', 'creator').with_is_overdue(
+            request_now(request)
+        ).in_bulk(ids['task'])
+        objects['task'] = {pk: TaskListSerializer(task).data for pk, task in tasks.items()}
+    if ids['project']:
+        projects = Project.objects.select_related('owner').with_task_counts().in_bulk(
+            ids['project']
+        )
+        objects['project'] = {
+            pk: ProjectListSerializer(project).data for pk, project in projects.items()
+        }
+
+    return [
+        {
+            'seq': change.id,
+            'model': change.model,
+            'id': change.object_id,
+            'action': change.action,
+            'created_at': change.created_at,
+            'data': objects[change.model].get(change.object_id),
+        }
+        for change in rows
+    ]
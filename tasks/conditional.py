@@ -0,0 +1,196 @@
+"""
+Условные запросы (ETag / Last-Modified) для ViewSet'ов.
+
+Валидаторы вычисляются одним агрегирующим запросом (MAX(updated_at),
+COUNT(*)) по отфильтрованному queryset'у, поэтому ответ 304 отдается
+до загрузки объектов и сериализации. Данные, изменение которых не видно
+в агрегатах (вложенные пользователи), учитываются через поколения
+областей кэша ответов (conditional_scopes, см. tasks/cache.py).
+"""
+import hashlib
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_generations
+
+
+class ConditionalRequestMixin:
+    """
+    Поддержка If-None-Match / If-Modified-Since для list и retrieve
+    и If-Match для update / partial_update.
+
+    ViewSet реализует get_conditional_aggregates(detail) - выражения агрегации
+    (обязательно с ключом 'count'), изменение результата которых означает
+    изменение ответа. If-Modified-Since учитывается только для отдельных
+    объектов: по дате нельзя обнаружить удаление из списка, а ETag учитывает
+    количество.
+
+    Для async-представлений (tasks/async_views.py) есть варианты alist,
+    aretrieve и aget_conditional_state; ViewSet, переопределяющий
+    get_conditional_state, должен переопределить и асинхронную версию.
+    """
+    conditional_scopes = ()
+
+    def get_conditional_aggregates(self, detail=False):
+        raise NotImplementedError
+
+    def get_conditional_queryset(self):
+        """Queryset, по которому считаются валидаторы"""
+        return self.filter_queryset(self.get_queryset())
+
+    def get_conditional_state(self, queryset, detail=False, aggregates=None):
+        if aggregates is None:
+            aggregates = self.get_conditional_aggregates(detail)
+        return queryset.order_by().aggregate(**aggregates)
+
+    async def aget_conditional_state(self, queryset, detail=False, aggregates=None):
+        if aggregates is None:
+            aggregates = self.get_conditional_aggregates(detail)
+        return await queryset.order_by().aaggregate(**aggregates)
+
+    def get_validators(self, request, queryset, detail=False, aggregates=None):
+        """Вернуть (etag, last_modified) или None, если объект не найден"""
+        state = self.get_conditional_state(queryset, detail, aggregates)
+        return self.make_validators(request, state, detail)
+
+    async def aget_validators(self, request, queryset, detail=False, aggregates=None):
+        state = await self.aget_conditional_state(queryset, detail, aggregates)
+        return self.make_validators(request, state, detail)
+
+    def make_validators(self, request, state, detail=False):
+        if detail and not state.get('count'):
+            return None
+
+        key = [request.path, request.accepted_renderer.format, sorted(state.items())]
+        if not detail:
+            key += [request.GET.urlencode(), request.user.pk]
+        if self.conditional_scopes:
+            key.append(get_generations(self.conditional_scopes))
+        etag = '"%s"' % hashlib.md5(repr(key).encode()).hexdigest()
+        last_modified = max(
+            (value for value in state.values() if isinstance(value, datetime)),
+            default=None
+        )
+        return etag, last_modified
+
+    def get_detail_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_conditional_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def not_modified(self, request, validators, detail=False):
+        """Ответ 304, если клиентская копия актуальна, иначе None"""
+        etag, last_modified = validators
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            fresh = '*' in etags or etag in etags
+        else:
+            since = detail and parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            fresh = bool(since and last_modified and int(last_modified.timestamp()) <= since)
+        if not fresh:
+            return None
+        return self.set_validator_headers(Response(status=status.HTTP_304_NOT_MODIFIED), validators)
+
+    @staticmethod
+    def set_validator_headers(response, validators):
+        if validators:
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def conditional_list_response(self, request, queryset, build_response, aggregates=None):
+        """Проверить валидаторы списка и при необходимости построить ответ"""
+        validators = self.get_validators(request, queryset, aggregates=aggregates)
+        return (
+            self.not_modified(request, validators)
+            or self.set_validator_headers(build_response(), validators)
+        )
+
+    async def aconditional_list_response(self, request, queryset, build_response, aggregates=None):
+        """conditional_list_response для async-представлений"""
+        validators = await self.aget_validators(request, queryset, aggregates=aggregates)
+        return (
+            self.not_modified(request, validators)
+            or self.set_validator_headers(await build_response(), validators)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list_response(
+            request,
+            self.get_conditional_queryset(),
+            lambda: super(ConditionalRequestMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_validators(request, self.get_detail_queryset(), detail=True)
+        if validators:
+            response = self.not_modified(request, validators, detail=True)
+            if response:
+                return response
+        response = super().retrieve(request, *args, **kwargs)
+        return self.set_validator_headers(response, validators)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_list_response(
+            request,
+            self.get_conditional_queryset(),
+            lambda: super(ConditionalRequestMixin, self).alist(request, *args, **kwargs)
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        validators = await self.aget_validators(request, self.get_detail_queryset(), detail=True)
+        if validators:
+            response = self.not_modified(request, validators, detail=True)
+            if response:
+                return response
+        response = await super().aretrieve(request, *args, **kwargs)
+        return self.set_validator_headers(response, validators)
+
+    def update(self, request, *args, **kwargs):
+        if_match = request.headers.get('If-Match')
+        if not if_match:
+            return self._update(request, *args, **kwargs)
+        with transaction.atomic():
+            if not self.lock_object():
+                # RFC 9110: If-Match не выполняется, если объекта нет
+                return self.precondition_failed()
+            validators = self.get_validators(request, self.get_detail_queryset(), detail=True)
+            etags = parse_etags(if_match)
+            if not validators or ('*' not in etags and validators[0] not in etags):
+                return self.precondition_failed()
+            return self._update(request, *args, **kwargs)
+
+    def lock_object(self):
+        """
+        Заблокировать строку объекта до конца транзакции; False - объекта нет.
+        Пустой UPDATE берет блокировку строки на PostgreSQL и блокировку
+        записи на SQLite (SELECT ... FOR UPDATE там не поддерживается), так
+        что проверка If-Match и запись не разделяются параллельным запросом.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        model = self.get_queryset().model
+        return bool(model._base_manager.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).update(updated_at=F('updated_at')))
+
+    def precondition_failed(self):
+        return Response(
+            {'error': 'Объект был изменен (If-Match не совпадает)'},
+            status=status.HTTP_412_PRECONDITION_FAILED
+        )
+
+    def _update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            validators = self.get_validators(request, self.get_detail_queryset(), detail=True)
+            self.set_validator_headers(response, validators)
+        return response
@@ -0,0 +1,257 @@
+"""
+Планировщик дедлайнов (manage.py run_deadline_scheduler).
+
+Для каждой незакрытой задачи с дедлайном наступают два события:
+due_soon - за DUE_SOON до дедлайна и overdue - в момент дедлайна. Они
+хранятся в min-куче по времени наступления. В памяти держатся только
+события ближайшего горизонта (horizon): задачи подгружаются пачками по
+частичному индексу task_open_deadline_idx в порядке (deadline, id), и
+курсор только движется вперед - повторного просмотра таблицы нет.
+
+Изменения задач планировщик, работающий отдельным процессом, узнает
+опросом индекса по updated_at (сигналы post_save веб-процессов до него не
+доходят). Изменившаяся задача ставится в кучу заново; прежняя запись
+становится неактуальной и пропускается при извлечении. Перед отправкой
+задачи события перечитываются одним запросом: удаленные, закрытые и
+сменившие дедлайн задачи отбрасываются.
+
+Момент, до которого все события отправлены, сохраняется в
+SchedulerWatermark после каждого шага. После перезапуска планировщик
+продолжает с него: события, наступившие за время простоя, отправляются
+при первом шаге, отправленные ранее не повторяются. При первом запуске
+отметка - текущий момент, прошедшие дедлайны не отправляются.
+
+Получатели событий (sinks) задаются настройкой TASKS_DEADLINE_SINKS:
+LogSink, WebhookSink, DatabaseSink или свой подкласс DeadlineSink.
+"""
+import heapq
+import logging
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import CLOSED_STATUSES, DeadlineEvent, SchedulerWatermark, Task
+
+logger = logging.getLogger(__name__)
+
+DUE_SOON = 'due_soon'
+OVERDUE = 'overdue'
+
+HORIZON = timedelta(hours=6)
+BATCH_SIZE = 1000
+# Запас при опросе изменений: транзакции, зафиксированные позже, чем
+# записан их updated_at, и расхождение часов процессов
+CHANGES_OVERLAP = timedelta(minutes=1)
+
+
+class Notice:
+    """Наступившее событие: вид, задача (с проектом и исполнителем) и момент"""
+
+    def __init__(self, kind, task, fire_at):
+        self.kind = kind
+        self.task = task
+        self.fire_at = fire_at
+
+    def as_dict(self):
+        return {
+            'event': self.kind,
+            'task': self.task.pk,
+            'title': self.task.title,
+            'project': self.task.project_id,
+            'assignee': self.task.assignee_id,
+            'deadline': self.task.deadline.isoformat(),
+            'fire_at': self.fire_at.isoformat(),
+        }
+
+
+class DeadlineSink:
+    """Получатель событий планировщика"""
+
+    def emit(self, notices):
+        raise NotImplementedError
+
+
+class LogSink(DeadlineSink):
+    """Запись событий в лог tasks.deadlines"""
+
+    def emit(self, notices):
+        for notice in notices:
+            logger.info(
+                '%s: задача %s "%s", дедлайн %s', notice.kind, notice.task.pk,
+                notice.task.title, notice.task.deadline.isoformat()
+            )
+
+
+class WebhookSink(DeadlineSink):
+    """
+    POST пачки событий в JSON на TASKS_DEADLINE_WEBHOOK_URL. Ошибка
+    доставки пишется в лог; повторной отправки нет.
+    """
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url or settings.TASKS_DEADLINE_WEBHOOK_URL
+        self.timeout = timeout
+
+    def emit(self, notices):
+        if not self.url:
+            logger.warning('TASKS_DEADLINE_WEBHOOK_URL не задан, события не отправлены')
+            return
+        payload = {'events': [notice.as_dict() for notice in notices]}
+        try:
+            requests.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+        except requests.RequestException as exc:
+            logger.warning('Не удалось отправить события на %s: %s', self.url, exc)
+
+
+class DatabaseSink(DeadlineSink):
+    """Запись событий в таблицу DeadlineEvent (повторы игнорируются)"""
+
+    def emit(self, notices):
+        DeadlineEvent.objects.bulk_create(
+            [
+                DeadlineEvent(task=notice.task, kind=notice.kind, deadline=notice.task.deadline)
+                for notice in notices
+            ],
+            ignore_conflicts=True
+        )
+
+
+def get_sinks(paths=None):
+    """Получатели по путям классов, по умолчанию - из TASKS_DEADLINE_SINKS"""
+    paths = paths or settings.TASKS_DEADLINE_SINKS
+    return [import_string(path)() for path in paths]
+
+
+class DeadlineScheduler:
+    """
+    Планировщик событий дедлайнов. tick(now) выполняет один шаг:
+    применяет изменения задач, подгружает горизонт, отправляет наступившие
+    события и сохраняет отметку.
+    """
+
+    def __init__(self, sinks=None, due_soon=None, horizon=HORIZON,
+                 batch_size=BATCH_SIZE, name='default'):
+        self.sinks = get_sinks() if sinks is None else sinks
+        if due_soon is None:
+            due_soon = timedelta(seconds=settings.TASKS_DEADLINE_DUE_SOON)
+        self.due_soon = due_soon
+        # События due_soon должны попадать в кучу раньше, чем наступят
+        self.horizon = max(horizon, due_soon)
+        self.batch_size = batch_size
+        self.name = name
+        self.heap = []  # (момент, id задачи, вид, дедлайн)
+        self.scheduled = {}  # (id задачи, вид) -> момент актуальной записи в куче
+        self.watermark = None
+        self.loaded_until = None  # задачи с дедлайном не позже - в куче
+        self.cursor = None  # (deadline, id) последней подгруженной задачи
+        self.changes_since = None
+
+    def start(self, now=None, since=None):
+        """Восстановить отметку (since - начать с заданного момента)"""
+        now = now or timezone.now()
+        state, created = SchedulerWatermark.objects.get_or_create(
+            name=self.name, defaults={'value': since or now}
+        )
+        self.watermark = since or state.value
+        self.loaded_until = self.watermark
+        self.cursor = None
+        self.changes_since = now
+        self.heap.clear()
+        self.scheduled.clear()
+
+    def tick(self, now=None):
+        """Один шаг; вернуть отправленные события"""
+        now = now or timezone.now()
+        if self.watermark is None:
+            self.start(now)
+        self.apply_changes(now)
+        self.load(now + self.horizon)
+        notices = self.verify(self.pop_due(now))
+        if notices:
+            for sink in self.sinks:
+                sink.emit(notices)
+        self.watermark = now
+        SchedulerWatermark.objects.filter(name=self.name).update(value=now)
+        return notices
+
+    def events(self, deadline):
+        """(вид, момент) событий задачи с данным дедлайном"""
+        if self.due_soon:
+            yield DUE_SOON, deadline - self.due_soon
+        yield OVERDUE, deadline
+
+    def schedule(self, task_id, deadline):
+        """
+        Поставить события задачи в кучу; deadline=None - снять (задача
+        закрыта или без дедлайна). Задачи за пределами подгруженного
+        горизонта подгрузит курсор.
+        """
+        if deadline is None:
+            for kind in (DUE_SOON, OVERDUE):
+                self.scheduled.pop((task_id, kind), None)
+            return
+        for kind, fire_at in self.events(deadline):
+            key = (task_id, kind)
+            if fire_at <= self.watermark or deadline > self.loaded_until:
+                self.scheduled.pop(key, None)
+            elif self.scheduled.get(key) != fire_at:
+                self.scheduled[key] = fire_at
+                heapq.heappush(self.heap, (fire_at, task_id, kind, deadline))
+
+    def load(self, until):
+        """Подгрузить задачи с дедлайном до until пачками по индексу"""
+        while self.loaded_until < until:
+            tasks = Task.objects.open().filter(deadline__lte=until)
+            if self.cursor is None:
+                tasks = tasks.filter(deadline__gt=self.watermark)
+            else:
+                deadline, pk = self.cursor
+                # deadline__gte задает начало диапазона по индексу, OR - порядок внутри
+                tasks = tasks.filter(deadline__gte=deadline).filter(
+                    Q(deadline__gt=deadline) | Q(deadline=deadline, id__gt=pk)
+                )
+            rows = list(
+                tasks.order_by('deadline', 'id').values_list('deadline', 'id')[:self.batch_size]
+            )
+            if rows:
+                self.cursor = rows[-1]
+            self.loaded_until = until if len(rows) < self.batch_size else self.cursor[0]
+            for deadline, pk in rows:
+                self.schedule(pk, deadline)
+
+    def apply_changes(self, now):
+        """Поставить заново задачи, измененные после прошлого опроса"""
+        rows = Task.objects.filter(
+            updated_at__gte=self.changes_since - CHANGES_OVERLAP
+        ).order_by().values_list('id', 'status', 'deadline')
+        self.changes_since = now
+        for pk, status, deadline in rows.iterator():
+            self.schedule(pk, None if status in CLOSED_STATUSES else deadline)
+
+    def pop_due(self, now):
+        """Извлечь из кучи актуальные записи, наступившие к now"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            fire_at, pk, kind, deadline = heapq.heappop(self.heap)
+            if self.scheduled.get((pk, kind)) == fire_at:
+                del self.scheduled[pk, kind]
+                due.append((fire_at, pk, kind, deadline))
+        return due
+
+    def verify(self, due):
+        """События задач, которые по-прежнему открыты и с тем же дедлайном"""
+        notices = []
+        for start in range(0, len(due), self.batch_size):
+            chunk = due[start:start + self.batch_size]
+            tasks = Task.objects.open().select_related('project', 'assignee').in_bulk(
+                [pk for _, pk, _, _ in chunk]
+            )
+            for fire_at, pk, kind, deadline in chunk:
+                task = tasks.get(pk)
+                if task is not None and task.deadline == deadline:
+                    notices.append(Notice(kind, task, fire_at))
+        return notices
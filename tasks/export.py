@@ -0,0 +1,125 @@
+"""
+Потоковая выгрузка задач в CSV и NDJSON.
+
+Строки читаются из курсора БД порциями (values_list().iterator(): на
+PostgreSQL - серверный курсор) без создания моделей и сериализаторов и
+кодируются пачками по мере отправки, поэтому память не зависит от
+размера выгрузки. Используется эндпоинтом /api/tasks/export/ и командой
+manage.py export_tasks.
+"""
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer
+
+from .renderers import FastJSONRenderer
+
+CHUNK_SIZE = 2000
+
+# (колонка, выражение для values_list)
+EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('project', 'project_id'),
+    ('project_name', 'project__name'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('assignee', 'assignee_id'),
+    ('assignee_username', 'assignee__username'),
+    ('creator', 'creator_id'),
+    ('creator_username', 'creator__username'),
+    ('deadline', 'deadline'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('completed_at', 'completed_at'),
+)
+COLUMNS = [column for column, _ in EXPORT_FIELDS]
+DATETIME_COLUMNS = ('deadline', 'created_at', 'updated_at', 'completed_at')
+
+_json = FastJSONRenderer()
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Кортежи значений EXPORT_FIELDS из курсора БД"""
+    return queryset.values_list(*(lookup for _, lookup in EXPORT_FIELDS)).iterator(chunk_size)
+
+
+def format_datetime(value):
+    """Дата в формате API (ISO 8601, 'Z' для UTC)"""
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+def iter_csv(rows, batch_size=CHUNK_SIZE):
+    """CSV с заголовком; байты отдаются пачками по batch_size строк"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    positions = [COLUMNS.index(column) for column in DATETIME_COLUMNS]
+    count = 0
+    for row in rows:
+        row = list(row)
+        for position in positions:
+            if row[position] is not None:
+                row[position] = format_datetime(row[position])
+        writer.writerow(row)
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def iter_ndjson(rows, batch_size=CHUNK_SIZE):
+    """По JSON-объекту на строку; байты отдаются пачками по batch_size строк"""
+    lines = []
+    for row in rows:
+        lines.append(_json.dumps(dict(zip(COLUMNS, row))))
+        if len(lines) >= batch_size:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Рендерер формата ?format=csv. Данные выгрузки отдаются потоком мимо
+    рендерера; render используется только для ответов с ошибками.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    writer = staticmethod(iter_csv)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return buffer.getvalue().encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Рендерер формата ?format=ndjson (см. CSVRenderer)"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+    writer = staticmethod(iter_ndjson)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return _json.dumps(data) + b'\n'
+
+
+EXPORT_RENDERERS = (CSVRenderer, NDJSONRenderer)
+FORMATS = {renderer.format: renderer for renderer in EXPORT_RENDERERS}
@@ -2,7 +2,7 @@
 Фильтры для API задач и проектов.
 """
 from django_filters import rest_framework as filters
-from .models import Task, Project
+from .models import Task, Project, request_now
 
 
 class ProjectFilter(filters.FilterSet):
@@ -80,12 +80,7 @@ class TaskFilter(filters.FilterSet):
     def filter_overdue(self, queryset, name, value):
         """Фильтр просроченных задач"""
         if value:
-            from django.utils import timezone
-            return queryset.filter(
-                deadline__lt=timezone.now()
-            ).exclude(
-                status__in=['completed', 'cancelled']
-            )
+            return queryset.overdue(request_now(self.request))
         return queryset
 
     def filter_no_assignee(self, queryset, name, value):
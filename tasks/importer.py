@@ -0,0 +1,349 @@
+"""
+Потоковая загрузка задач из CSV и NDJSON.
+
+Файл читается построчно, ссылки на проекты и пользователей (ID или
+название / username) разрешаются по словарям, загруженным один раз
+в начале. Задачи записываются bulk_create пачками по batch_size, по
+transaction_batches пачек в транзакции: прерванная загрузка оставляет
+уже зафиксированные пачки. Сигналы post_save при bulk_create не
+вызываются, поэтому записи журнала изменений добавляются в транзакции
+каждой пачки явно, а счетчики задач пересчитываются и кэш ответов
+инвалидируется один раз в конце.
+
+Колонки совпадают с выгрузкой (tasks/export.py); id, created_at и
+updated_at игнорируются - задачи создаются заново. Используется командой
+manage.py import_tasks и эндпоинтом /api/tasks/import/.
+"""
+import csv
+import io
+import json
+import time
+from pathlib import PurePath
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import reset_queries, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Project, ProjectTaskCounter, Task
+from . import cache
+from .changes import CREATE, log_tasks
+
+try:
+    import orjson
+except ImportError:  # orjson - необязательная зависимость
+    orjson = None
+
+BATCH_SIZE = 1000
+TRANSACTION_BATCHES = 10
+MAX_REPORTED_ERRORS = 100
+
+STATUSES = {value for value, _ in Task.STATUS_CHOICES}
+PRIORITIES = {value for value, _ in Task.PRIORITY_CHOICES}
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+PROJECT_NAME_MAX_LENGTH = Project._meta.get_field('name').max_length
+USERNAME_FIELD = User._meta.get_field('username')
+
+
+def read_csv(stream):
+    """(номер строки, словарь) из CSV с заголовком; stream - бинарный файл"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        # Не закрывать stream вместе с оберткой
+        text.detach()
+
+
+def read_ndjson(stream):
+    """(номер строки, словарь) из NDJSON; при ошибке разбора словарь - None"""
+    loads = orjson.loads if orjson is not None else json.loads
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            data = loads(line)
+        except ValueError:
+            data = None
+        yield line_number, data if isinstance(data, dict) else None
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+def detect_format(filename):
+    """Формат по расширению файла ('.jsonl' - тоже NDJSON)"""
+    suffix = PurePath(filename or '').suffix.lower().lstrip('.')
+    return 'ndjson' if suffix == 'jsonl' else suffix if suffix in READERS else None
+
+
+class ImportStats:
+    """Ход загрузки: прочитано, создано, ошибки, скорость"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+        self.started = time.perf_counter()
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        seconds = self.seconds
+        return self.created / seconds if seconds else 0.0
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 3),
+        }
+
+
+class MissingReference:
+    """
+    Проект или пользователь, указанный по названию и отсутствующий в базе
+    (create_missing). Создается только после проверки всей строки: строка
+    с ошибкой не должна оставлять новых объектов.
+    """
+
+    def __init__(self, name, ids, by_name, create):
+        self.name = name
+        self.ids = ids
+        self.by_name = by_name
+        self.create = create
+
+    @staticmethod
+    def get_pk(value):
+        """ID объекта; MissingReference создается (один раз на название)"""
+        if not isinstance(value, MissingReference):
+            return value
+        pk = value.by_name.get(value.name)
+        if pk is None:
+            pk = value.by_name[value.name] = value.create(value.name)
+            value.ids.add(pk)
+        return pk
+
+
+class TaskImporter:
+    """
+    Загрузка задач из итератора (номер строки, словарь).
+
+    creator - создатель задач без колонки creator/creator_username.
+    create_missing - создавать проекты и пользователей, указанных по
+    названию / username и отсутствующих в базе (пароль пользователей -
+    default_password, хэшируется один раз; без него - непригодный).
+    progress(stats) вызывается после каждой транзакции.
+    """
+
+    def __init__(self, creator=None, batch_size=BATCH_SIZE,
+                 transaction_batches=TRANSACTION_BATCHES, create_missing=False,
+                 default_password=None, progress=None):
+        self.creator = creator
+        self.batch_size = batch_size
+        self.transaction_batches = transaction_batches
+        self.create_missing = create_missing
+        self.default_password = default_password
+        self._password = None
+        self.progress = progress
+        self.stats = ImportStats()
+        self.project_ids = set()
+        self.assignee_ids = set()
+
+    @property
+    def password(self):
+        """Хэш пароля новых пользователей (вычисляется один раз)"""
+        if self._password is None:
+            self._password = make_password(self.default_password)
+        return self._password
+
+    def load_maps(self):
+        self.projects = set(Project.objects.values_list('id', flat=True))
+        self.projects_by_name = {}
+        for pk, name in Project.objects.order_by('-id').values_list('id', 'name'):
+            self.projects_by_name[name] = pk  # при совпадении названий - с меньшим id
+        self.users = set()
+        self.users_by_username = {}
+        for pk, username in User.objects.values_list('id', 'username'):
+            self.users.add(pk)
+            self.users_by_username[username] = pk
+
+    def run(self, rows):
+        """Загрузить строки; вернуть ImportStats"""
+        self.load_maps()
+        self.now = timezone.now()
+        try:
+            chunk = []
+            for line, data in rows:
+                self.stats.rows += 1
+                task = self.build_task(line, data)
+                if task is not None:
+                    chunk.append(task)
+                if len(chunk) >= self.batch_size * self.transaction_batches:
+                    self.write(chunk)
+                    chunk = []
+            if chunk:
+                self.write(chunk)
+        finally:
+            self.finish()
+        return self.stats
+
+    def write(self, tasks):
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+            log_tasks(tasks, CREATE)
+        # При DEBUG=True журнал SQL иначе растет с каждой пачкой
+        reset_queries()
+        self.stats.created += len(tasks)
+        if self.progress is not None:
+            self.progress(self.stats)
+
+    def finish(self):
+        """Отложенная работа обработчиков сигналов: счетчики и кэш"""
+        if self.project_ids:
+            ProjectTaskCounter.rebuild(self.project_ids)
+        cache.invalidate_tasks(self.project_ids, self.assignee_ids)
+
+    def build_task(self, line, data):
+        """Task из словаря строки или None (ошибки записываются в stats)"""
+        if data is None:
+            self.stats.add_error(line, {'non_field_errors': ['Неверный JSON-объект']})
+            return None
+
+        errors = {}
+        values = {}
+        title = str(data.get('title') or '').strip()
+        if not title:
+            errors['title'] = ['Обязательное поле']
+        elif len(title) > TITLE_MAX_LENGTH:
+            errors['title'] = [f'Не более {TITLE_MAX_LENGTH} символов']
+        values['title'] = title
+        values['description'] = str(data.get('description') or '')
+
+        status = data.get('status') or 'todo'
+        if not isinstance(status, str) or status not in STATUSES:
+            errors['status'] = ['Недопустимый статус']
+        values['status'] = status
+
+        try:
+            priority = int(data.get('priority') or 2)
+        except (TypeError, ValueError):
+            priority = None
+        if priority not in PRIORITIES:
+            errors['priority'] = ['Недопустимый приоритет']
+        values['priority'] = priority
+
+        for field in ('deadline', 'completed_at'):
+            value = data.get(field)
+            if value in (None, ''):
+                values[field] = None
+                continue
+            parsed = parse_datetime(str(value))
+            if parsed is None:
+                errors[field] = ['Неверный формат даты']
+            elif timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            values[field] = parsed
+
+        creator_id = self.resolve_user(data, 'creator', errors)
+        if creator_id is None and 'creator' not in errors:
+            if self.creator is None:
+                errors['creator'] = ['Обязательное поле']
+            else:
+                creator_id = self.creator.pk
+        assignee_id = self.resolve_user(data, 'assignee', errors)
+        project_id = self.resolve_project(data, creator_id, errors)
+
+        if errors:
+            self.stats.add_error(line, errors)
+            return None
+
+        # Отсутствующие объекты создаются только для строки без ошибок;
+        # владелец нового проекта - создатель задачи, поэтому он создается первым
+        creator_id = MissingReference.get_pk(creator_id)
+        assignee_id = MissingReference.get_pk(assignee_id)
+        project_id = MissingReference.get_pk(project_id)
+        task = Task(project_id=project_id, creator_id=creator_id, assignee_id=assignee_id, **values)
+        task.sync_completed_at(self.now)
+        self.project_ids.add(project_id)
+        self.assignee_ids.add(assignee_id)
+        return task
+
+    def resolve(self, data, field, name_field, ids, by_name, create=None):
+        """
+        ID связанного объекта по названию из name_field или, если его нет,
+        по ID из field. Названия переносимы между системами, поэтому имеют
+        приоритет. С create(name) для отсутствующего объекта возвращается
+        MissingReference.
+        """
+        name = str(data.get(name_field) or '')
+        if name:
+            pk = by_name.get(name)
+            if pk is None and create is not None:
+                return MissingReference(name, ids, by_name, create)
+            return pk
+
+        pk = data.get(field)
+        if pk in (None, ''):
+            return None
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        return pk if pk in ids else None
+
+    def resolve_user(self, data, field, errors):
+        """ID пользователя из колонки <field>_username или <field>"""
+        create = self.create_user if self.create_missing else None
+        pk = self.resolve(
+            data, field, f'{field}_username', self.users, self.users_by_username, create
+        )
+        if isinstance(pk, MissingReference):
+            try:
+                USERNAME_FIELD.clean(pk.name, None)
+            except ValidationError as error:
+                errors[field] = error.messages
+                return None
+        if pk is None and (data.get(field) or data.get(f'{field}_username')):
+            errors[field] = ['Пользователь не найден']
+        return pk
+
+    def resolve_project(self, data, owner_id, errors):
+        """ID проекта из колонки project_name или project"""
+        if len(str(data.get('project_name') or '')) > PROJECT_NAME_MAX_LENGTH:
+            errors['project'] = [f'Не более {PROJECT_NAME_MAX_LENGTH} символов']
+            return None
+
+        create = (
+            (lambda name: self.create_project(name, MissingReference.get_pk(owner_id)))
+            if self.create_missing and owner_id is not None else None
+        )
+
+        pk = self.resolve(
+            data, 'project', 'project_name', self.projects, self.projects_by_name, create
+        )
+        if pk is None:
+            missing = data.get('project') or data.get('project_name')
+            errors['project'] = ['Проект не найден' if missing else 'Обязательное поле']
+        return pk
+
+    def create_user(self, username):
+        return User.objects.create(username=username, password=self.password).pk
+
+    def create_project(self, name, owner_id):
+        return Project.objects.create(name=name, owner_id=owner_id).pk
@@ -0,0 +1,71 @@
+"""
+Выгрузка задач в CSV или NDJSON (те же форматы, что /api/tasks/export/).
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from tasks.export import CHUNK_SIZE, FORMATS, export_rows
+from tasks.filters import TaskFilter
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Выгрузить задачи в CSV или NDJSON потоком из курсора БД'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', dest='export_format')
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл выгрузки; по умолчанию stdout'
+        )
+        parser.add_argument(
+            '--filter',
+            action='append',
+            dest='filters',
+            default=[],
+            metavar='ПАРАМЕТР=ЗНАЧЕНИЕ',
+            help='Фильтр TaskFilter, как в query string API (можно указать несколько раз)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        for item in options['filters']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Фильтр должен иметь вид параметр=значение: {item}')
+            params.appendlist(name, value)
+
+        task_filter = TaskFilter(params, queryset=Task.objects.order_by('id'))
+        if not task_filter.is_valid():
+            raise CommandError(f'Неверные фильтры: {task_filter.errors.as_json()}')
+
+        writer = FORMATS[options['export_format']].writer
+        chunk_size = options['chunk_size']
+        rows = self.count_rows(export_rows(task_filter.qs, chunk_size))
+
+        started = time.perf_counter()
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in writer(rows, chunk_size):
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено задач: {self.exported} за {elapsed:.1f} с '
+            f'({self.exported / elapsed if elapsed else 0:.0f} строк/с)'
+        ))
+
+    def count_rows(self, rows):
+        self.exported = 0
+        for row in rows:
+            self.exported += 1
+            yield row
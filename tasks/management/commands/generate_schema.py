@@ -0,0 +1,49 @@
+"""
+Генерация спецификации OpenAPI в статический файл при деплое.
+"""
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from task_manager import schema
+from task_manager.urls import spec_view
+
+
+class Command(BaseCommand):
+    help = 'Сохранить спецификацию OpenAPI (swagger.json) и ее сжатые варианты .gz/.br'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=str(settings.SCHEMA_FILE),
+            help='Путь к файлу спецификации (по умолчанию SCHEMA_FILE)'
+        )
+        parser.add_argument(
+            '--url',
+            default='http://localhost',
+            help='Базовый адрес API, указываемый в спецификации'
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https') or not url.netloc:
+            raise CommandError('--url должен иметь вид http(s)://host[:port]')
+
+        # Адрес задается явно и не обязан входить в ALLOWED_HOSTS этого окружения
+        with override_settings(ALLOWED_HOSTS=[url.hostname]):
+            content = schema.render_schema(spec_view, url.scheme, url.netloc)
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(content)
+        sizes = [f'json {len(content)} Б']
+        for encoding, data in schema.compress(content).items():
+            suffix = '.gz' if encoding == 'gzip' else '.br'
+            output.with_name(output.name + suffix).write_bytes(data)
+            sizes.append(f'{encoding} {len(data)} Б')
+        if schema.brotli is None:
+            self.stdout.write(self.style.WARNING('Brotli не установлен: .br не создан'))
+
+        self.stdout.write(self.style.SUCCESS(f'Спецификация сохранена в {output} ({", ".join(sizes)})'))
@@ -0,0 +1,88 @@
+"""
+Потоковая загрузка задач из CSV или NDJSON (см. tasks/importer.py).
+"""
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from tasks.importer import BATCH_SIZE, READERS, TRANSACTION_BATCHES, TaskImporter, detect_format
+from tasks.search import deferred_search_index
+
+
+class Command(BaseCommand):
+    help = 'Загрузить задачи из CSV или NDJSON пачками bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл с задачами; '-' - stdin")
+        parser.add_argument(
+            '--format', choices=sorted(READERS), dest='import_format',
+            help='Формат файла; по умолчанию - по расширению'
+        )
+        parser.add_argument(
+            '--creator',
+            help='Username создателя задач без колонки creator/creator_username'
+        )
+        parser.add_argument(
+            '--create-missing', action='store_true',
+            help='Создавать отсутствующие проекты (по project_name) и пользователей (по username)'
+        )
+        parser.add_argument(
+            '--default-password',
+            help='Пароль пользователей, созданных с --create-missing'
+        )
+        parser.add_argument(
+            '--defer-search-index', action='store_true',
+            help='Перестроить поисковый индекс один раз в конце, а не построчно'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--transaction-batches', type=int, default=TRANSACTION_BATCHES,
+            help='Пачек bulk_create в одной транзакции'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or detect_format(path)
+        if import_format is None:
+            raise CommandError('Не удалось определить формат файла, укажите --format')
+
+        creator = None
+        if options['creator']:
+            try:
+                creator = User.objects.get(username=options['creator'])
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь не найден: {options["creator"]}')
+
+        importer = TaskImporter(
+            creator=creator,
+            batch_size=options['batch_size'],
+            transaction_batches=options['transaction_batches'],
+            create_missing=options['create_missing'],
+            default_password=options['default_password'],
+            progress=self.report_progress,
+        )
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            rows = READERS[import_format](stream)
+            if options['defer_search_index']:
+                with deferred_search_index(connection, 'tasks_task'):
+                    stats = importer.run(rows)
+            else:
+                stats = importer.run(rows)
+        finally:
+            if path != '-':
+                stream.close()
+
+        for error in stats.errors:
+            self.stderr.write(f'Строка {error["line"]}: {error["errors"]}')
+        if stats.error_count > len(stats.errors):
+            self.stderr.write(f'... и еще {stats.error_count - len(stats.errors)} ошибок')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено задач: {stats.created} из {stats.rows} строк за {stats.seconds:.1f} с '
+            f'({stats.rate:.0f} строк/с), ошибок: {stats.error_count}'
+        ))
+
+    def report_progress(self, stats):
+        self.stderr.write(f'  загружено {stats.created} задач, {stats.rate:.0f} строк/с')
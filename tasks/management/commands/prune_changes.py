@@ -0,0 +1,31 @@
+"""
+Очистка журнала изменений (/api/changes/) по давности.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.changes import last_seq
+from tasks.models import Change
+
+
+class Command(BaseCommand):
+    help = 'Удалить записи журнала изменений старше --days дней'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Хранить записи за последние N дней (по умолчанию 30)'
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        # Последняя запись остается всегда: по ней лента отличает клиента,
+        # пропустившего очищенные записи (ответ 410), от актуального
+        deleted, _ = Change.objects.filter(created_at__lt=before).exclude(
+            id=last_seq()
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f'Удалено записей журнала: {deleted}'))
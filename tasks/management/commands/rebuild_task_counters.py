@@ -0,0 +1,24 @@
+"""
+Пересчет денормализованных счетчиков задач по проектам.
+"""
+from django.core.management.base import BaseCommand
+
+from tasks.models import ProjectTaskCounter
+
+
+class Command(BaseCommand):
+    help = 'Пересчитать счетчики задач по проектам (ProjectTaskCounter)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='projects',
+            help='ID проекта (можно указать несколько раз); по умолчанию все проекты'
+        )
+
+    def handle(self, *args, **options):
+        ProjectTaskCounter.rebuild(options['projects'])
+        total = ProjectTaskCounter.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Счетчики пересчитаны: {total} записей'))
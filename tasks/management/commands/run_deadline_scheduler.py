@@ -0,0 +1,71 @@
+"""
+Планировщик событий дедлайнов (см. tasks/deadlines.py).
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from tasks.deadlines import BATCH_SIZE, HORIZON, DeadlineScheduler, get_sinks
+
+
+class Command(BaseCommand):
+    help = 'Отправлять события due_soon и overdue по дедлайнам задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=30,
+            help='Пауза между шагами, сек.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить один шаг и завершиться (запуск из cron)'
+        )
+        parser.add_argument(
+            '--sink', action='append', dest='sinks',
+            help='Путь класса получателя событий; по умолчанию - TASKS_DEADLINE_SINKS'
+        )
+        parser.add_argument(
+            '--due-soon', type=int,
+            help='За сколько секунд до дедлайна отправлять due_soon'
+        )
+        parser.add_argument(
+            '--horizon', type=int, default=int(HORIZON.total_seconds()),
+            help='Горизонт подгрузки задач в память, сек.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--name', default='default', help='Имя отметки планировщика')
+        parser.add_argument(
+            '--since',
+            help='Начать с заданного момента (ISO 8601) вместо сохраненной отметки'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None or since.tzinfo is None:
+                raise CommandError('--since: нужна дата с часовым поясом в формате ISO 8601')
+
+        due_soon = options['due_soon']
+        scheduler = DeadlineScheduler(
+            sinks=get_sinks(options['sinks']),
+            due_soon=None if due_soon is None else timedelta(seconds=due_soon),
+            horizon=timedelta(seconds=options['horizon']),
+            batch_size=options['batch_size'],
+            name=options['name'],
+        )
+        scheduler.start(since=since)
+        self.stdout.write(f'Отметка: {scheduler.watermark.isoformat()}')
+
+        try:
+            while True:
+                notices = scheduler.tick()
+                if notices:
+                    self.stdout.write(f'Отправлено событий: {len(notices)}')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Остановлено')
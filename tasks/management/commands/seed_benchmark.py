@@ -0,0 +1,39 @@
+"""
+Синтетические данные для нагрузочных тестов (см. tasks/seeding.py).
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.seeding import BATCH_SIZE, PASSWORD, USERNAME_PREFIX, BenchmarkSeeder
+
+
+class Command(BaseCommand):
+    help = 'Заполнить базу пользователями, проектами и задачами для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=42, help='Зерно генератора случайных чисел')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['projects'] < 1 or options['tasks'] < 0:
+            raise CommandError('Нужен хотя бы один пользователь и один проект')
+
+        started = time.perf_counter()
+
+        def progress(created, total):
+            rate = created / (time.perf_counter() - started)
+            self.stderr.write(f'  задач: {created} из {total}, {rate:.0f} строк/с')
+
+        seeder = BenchmarkSeeder(
+            seed=options['seed'], batch_size=options['batch_size'], progress=progress
+        )
+        users, projects, tasks = seeder.run(options['users'], options['projects'], options['tasks'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {users}, проектов: {projects}, задач: {tasks} '
+            f'за {time.perf_counter() - started:.1f} с '
+            f'(пользователи {USERNAME_PREFIX}*, пароль {PASSWORD})'
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_counters(apps, schema_editor):
+    """Заполнить счетчики по существующим задачам"""
+    Task = apps.get_model('tasks', 'Task')
+    ProjectTaskCounter = apps.get_model('tasks', 'ProjectTaskCounter')
+    rows = Task.objects.order_by().values('project_id', 'status').annotate(
+        total=models.Count('id')
+    )
+    ProjectTaskCounter.objects.bulk_create(
+        ProjectTaskCounter(project_id=row['project_id'], status=row['status'], count=row['total'])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('todo', 'К выполнению'), ('in_progress', 'В процессе'), ('review', 'На проверке'), ('completed', 'Завершена'), ('cancelled', 'Отменена')], max_length=20, verbose_name='Статус')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество задач')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='tasks.project', verbose_name='Проект')),
+            ],
+            options={
+                'verbose_name': 'Счетчик задач проекта',
+                'verbose_name_plural': 'Счетчики задач проектов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskcounter',
+            constraint=models.UniqueConstraint(fields=('project', 'status'), name='unique_project_status_counter'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_project_task_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-priority', '-created_at', 'id'], name='task_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from tasks.search import install_search_schema
+    install_search_schema(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from tasks.search import uninstall_search_schema
+    uninstall_search_schema(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
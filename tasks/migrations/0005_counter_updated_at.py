@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projecttaskcounter',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата обновления'),
+        ),
+    ]
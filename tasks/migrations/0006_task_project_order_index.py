@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_counter_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', '-priority', '-created_at'], name='task_project_order_idx'),
+        ),
+    ]
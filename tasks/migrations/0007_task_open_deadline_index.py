@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_project_order_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline__isnull', False), models.Q(('status__in', ('completed', 'cancelled')), _negated=True)), fields=['deadline'], name='task_open_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_open_deadline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadlineEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('due_soon', 'Скоро дедлайн'), ('overdue', 'Просрочена')], max_length=20, verbose_name='Вид события')),
+                ('deadline', models.DateTimeField(verbose_name='Срок выполнения')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Событие дедлайна',
+                'verbose_name_plural': 'События дедлайнов',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SchedulerWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Планировщик')),
+                ('value', models.DateTimeField(verbose_name='Отметка')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Отметка планировщика',
+                'verbose_name_plural': 'Отметки планировщиков',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='tasks_task_updated_33a240_idx'),
+        ),
+        migrations.AddField(
+            model_name='deadlineevent',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deadline_events', to='tasks.task', verbose_name='Задача'),
+        ),
+        migrations.AddConstraint(
+            model_name='deadlineevent',
+            constraint=models.UniqueConstraint(fields=('task', 'kind', 'deadline'), name='unique_deadline_event'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_deadline_scheduler'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('task', 'Задача'), ('project', 'Проект')], max_length=20, verbose_name='Модель')),
+                ('object_id', models.BigIntegerField(verbose_name='ID объекта')),
+                ('action', models.CharField(choices=[('create', 'Создание'), ('update', 'Изменение'), ('delete', 'Удаление')], max_length=10, verbose_name='Действие')),
+                ('assignee_id', models.BigIntegerField(blank=True, null=True, verbose_name='Исполнитель')),
+                ('previous_assignee_id', models.BigIntegerField(blank=True, null=True, verbose_name='Прежний исполнитель')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['assignee_id', 'id'], name='tasks_chang_assigne_fff57b_idx'), models.Index(fields=['previous_assignee_id', 'id'], name='tasks_chang_previou_0d6d6c_idx'), models.Index(fields=['created_at'], name='tasks_chang_created_1411c4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='previous_project_id',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Прежний проект'),
+        ),
+        migrations.AddField(
+            model_name='change',
+            name='project_id',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Проект'),
+        ),
+    ]
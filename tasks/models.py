@@ -1,9 +1,152 @@
 """
 Модели для управления проектами и задачами.
 """
-from django.db import models
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import BooleanField, Case, Count, F, Prefetch, Q, Sum, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Статусы закрытых задач: такие задачи не бывают просроченными
+CLOSED_STATUSES = ('completed', 'cancelled')
+
+
+def request_now(request=None):
+    """
+    Текущее время, единое для всего запроса: просроченность в фильтре,
+    аннотации и ETag вычисляется относительно одного момента.
+    """
+    if request is None:
+        return timezone.now()
+    request = getattr(request, '_request', request)
+    if not hasattr(request, 'tasks_now'):
+        request.tasks_now = timezone.now()
+    return request.tasks_now
+
+
+def open_condition(prefix=''):
+    """
+    Условие незакрытой задачи. Закрытые статусы подставляются в SQL
+    литералами, а не параметрами: SQLite применяет частичный индекс
+    task_open_deadline_idx, только если условие запроса совпадает с
+    условием индекса.
+    """
+    closed = [RawSQL(f"'{value}'", ()) for value in CLOSED_STATUSES]
+    return ~Q(**{f'{prefix}status__in': closed})
+
+
+def overdue_condition(now=None, prefix=''):
+    """Условие просроченности задачи: дедлайн прошел, задача не закрыта"""
+    return Q(**{f'{prefix}deadline__lt': now or timezone.now()}) & open_condition(prefix)
+
+
+def statistics_aggregates(prefix='', now=None):
+    """
+    Выражения условной агрегации для статистики по задачам.
+    prefix задает путь до задач (например, 'tasks__' для запросов по проектам).
+    """
+    def count(condition=None):
+        if condition is None:
+            return Count(f'{prefix}id')
+        return Count(f'{prefix}id', filter=condition)
+
+    def field(name):
+        return f'{prefix}{name}'
+
+    aggregates = {'total_tasks': count()}
+    for value, _ in Task.STATUS_CHOICES:
+        aggregates[f'status_{value}'] = count(Q(**{field('status'): value}))
+    for value, _ in Task.PRIORITY_CHOICES:
+        aggregates[f'priority_{value}'] = count(Q(**{field('priority'): value}))
+    aggregates['overdue_tasks'] = count(overdue_condition(now, prefix))
+    aggregates['unassigned_tasks'] = count(Q(**{field('assignee__isnull'): True}))
+    return aggregates
+
+
+def format_statistics(row):
+    """Преобразовать результат агрегации в ответ API"""
+    by_status = {value: row[f'status_{value}'] for value, _ in Task.STATUS_CHOICES}
+    by_priority = {
+        value: row[f'priority_{value}'] for value, _ in Task.PRIORITY_CHOICES
+    }
+    return {
+        'total_tasks': row['total_tasks'],
+        'completed_tasks': by_status['completed'],
+        'in_progress_tasks': by_status['in_progress'],
+        'todo_tasks': by_status['todo'],
+        'review_tasks': by_status['review'],
+        'cancelled_tasks': by_status['cancelled'],
+        'overdue_tasks': row['overdue_tasks'],
+        'unassigned_tasks': row['unassigned_tasks'],
+        'by_status': by_status,
+        'by_priority': by_priority,
+    }
+
+
+class ProjectQuerySet(models.QuerySet):
+    """QuerySet проектов с агрегатами по задачам"""
+
+    def with_task_counts(self):
+        """
+        Аннотировать проекты количеством задач одним запросом.
+        Значения берутся из счетчиков ProjectTaskCounter (не более одной
+        строки на статус) и читаются свойствами tasks_count / completed_tasks_count.
+        """
+        return self.annotate(
+            annotated_tasks_count=Coalesce(Sum('task_counters__count'), 0),
+            annotated_completed_tasks_count=Coalesce(
+                Sum('task_counters__count', filter=Q(task_counters__status='completed')),
+                0
+            ),
+        )
+
+    def with_task_previews(self, limit=None, now=None):
+        """
+        Подгрузить первые limit задач каждого проекта в атрибут task_previews
+        одним запросом на все проекты страницы: срез в Prefetch выполняется
+        через ROW_NUMBER() OVER (PARTITION BY project_id), исполнитель и
+        создатель загружаются JOIN в том же запросе.
+        """
+        tasks = Task.objects.select_related('assignee', 'creator').with_is_overdue(now)
+        return self.prefetch_related(Prefetch(
+            'tasks', queryset=tasks[:limit or Project.TASK_PREVIEWS], to_attr='task_previews'
+        ))
+
+    def statistics(self, now=None):
+        """Статистика по задачам для каждого проекта одним сгруппированным запросом"""
+        rows = self.order_by().values('id').annotate(**statistics_aggregates('tasks__', now))
+        return {row['id']: format_statistics(row) for row in rows}
+
+
+class TaskQuerySet(models.QuerySet):
+    """QuerySet задач"""
+
+    def open(self):
+        """Незакрытые задачи"""
+        return self.filter(open_condition())
+
+    def overdue(self, now=None):
+        """Просроченные задачи (по частичному индексу task_open_deadline_idx)"""
+        return self.filter(overdue_condition(now))
+
+    def with_is_overdue(self, now=None):
+        """Аннотировать просроченность в SQL; читается свойством is_overdue"""
+        return self.annotate(annotated_is_overdue=Case(
+            When(overdue_condition(now), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ))
+
+    def statistics(self, now=None):
+        """Статистика по задачам одним запросом с условной агрегацией"""
+        return format_statistics(self.order_by().aggregate(**statistics_aggregates(now=now)))
+
+    async def astatistics(self, now=None):
+        return format_statistics(
+            await self.order_by().aaggregate(**statistics_aggregates(now=now))
+        )
 
 
 class Project(models.Model):
@@ -41,6 +184,10 @@ class Project(models.Model):
         help_text='Отметьте, если проект активен'
     )
 
+    objects = ProjectQuerySet.as_manager()
+
+    TASK_PREVIEWS = 10  # Задач в превью проекта (детали, ?expand=tasks)
+
     class Meta:
         verbose_name = 'Проект'
         verbose_name_plural = 'Проекты'
@@ -53,15 +200,26 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Журнал изменений пишется обработчиком post_save в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     @property
     def tasks_count(self):
         """Количество задач в проекте"""
-        return self.tasks.count()
+        if hasattr(self, 'annotated_tasks_count'):
+            return self.annotated_tasks_count
+        return self.task_counters.aggregate(total=Coalesce(Sum('count'), 0))['total']
 
     @property
     def completed_tasks_count(self):
         """Количество выполненных задач"""
-        return self.tasks.filter(status='completed').count()
+        if hasattr(self, 'annotated_completed_tasks_count'):
+            return self.annotated_completed_tasks_count
+        return self.task_counters.filter(status='completed').values_list(
+            'count', flat=True
+        ).first() or 0
 
 
 class Task(models.Model):
@@ -146,6 +304,8 @@ class Task(models.Model):
         verbose_name='Дата завершения'
     )
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Задача'
         verbose_name_plural = 'Задачи'
@@ -155,25 +315,274 @@ class Task(models.Model):
             models.Index(fields=['assignee', 'status']),
             models.Index(fields=['status', 'priority']),
             models.Index(fields=['deadline']),
+            # Опрос изменений планировщиком дедлайнов (tasks/deadlines.py)
+            models.Index(fields=['updated_at']),
+            # Только открытые задачи с дедлайном: фильтр просроченных (overdue_condition)
+            models.Index(
+                fields=['deadline'], name='task_open_deadline_idx',
+                condition=Q(deadline__isnull=False) & ~Q(status__in=CLOSED_STATUSES)
+            ),
+            # Ключ keyset-пагинации (см. tasks/pagination.py)
+            models.Index(fields=['-priority', '-created_at', 'id'], name='task_keyset_idx'),
+            # Задачи проекта в порядке по умолчанию: превью и /projects/{id}/tasks/
+            models.Index(fields=['project', '-priority', '-created_at'], name='task_project_order_idx'),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
-    def save(self, *args, **kwargs):
-        """Автоматически устанавливаем дату завершения при изменении статуса"""
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем исходные проект, статус и исполнителя (счетчики и кэш)"""
+        instance = super().from_db(db, field_names, values)
+        instance._counter_state = (
+            instance.__dict__.get('project_id'), instance.__dict__.get('status')
+        )
+        instance._cache_state = (
+            instance.__dict__.get('project_id'), instance.__dict__.get('assignee_id')
+        )
+        return instance
+
+    def sync_completed_at(self, now=None):
+        """Установить или сбросить дату завершения в соответствии со статусом"""
         if self.status == 'completed' and not self.completed_at:
-            from django.utils import timezone
-            self.completed_at = timezone.now()
+            self.completed_at = now or timezone.now()
         elif self.status != 'completed':
             self.completed_at = None
-        super().save(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        """Автоматически устанавливаем дату завершения при изменении статуса"""
+        self.sync_completed_at()
+        # Аннотация просроченности после изменения статуса или дедлайна устарела
+        self.__dict__.pop('annotated_is_overdue', None)
+        # Счетчики и журнал изменений обновляются обработчиками post_save
+        # в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     @property
     def is_overdue(self):
         """Проверка, просрочена ли задача"""
-        if self.deadline and self.status not in ['completed', 'cancelled']:
-            from django.utils import timezone
+        if hasattr(self, 'annotated_is_overdue'):
+            return self.annotated_is_overdue
+        if self.deadline and self.status not in CLOSED_STATUSES:
             return timezone.now() > self.deadline
         return False
 
+
+class ProjectTaskCounter(models.Model):
+    """
+    Денормализованное количество задач проекта в каждом статусе.
+    Обновляется инкрементально при сохранении и удалении задач
+    (см. tasks/signals.py), пересчитывается командой rebuild_task_counters.
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='task_counters',
+        verbose_name='Проект'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Task.STATUS_CHOICES,
+        verbose_name='Статус'
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество задач'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата обновления'
+    )
+
+    class Meta:
+        verbose_name = 'Счетчик задач проекта'
+        verbose_name_plural = 'Счетчики задач проектов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'status'], name='unique_project_status_counter'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}:{self.status}={self.count}"
+
+    @classmethod
+    def adjust(cls, project_id, status, delta):
+        """Изменить счетчик на delta через UPDATE ... SET count = count + delta"""
+        if not delta:
+            return
+        updated = cls.objects.filter(project_id=project_id, status=status).update(
+            count=F('count') + delta, updated_at=timezone.now()
+        )
+        if updated or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(project_id=project_id, status=status, count=delta)
+        except IntegrityError:
+            # Строку успел создать параллельный запрос
+            cls.objects.filter(project_id=project_id, status=status).update(
+                count=F('count') + delta, updated_at=timezone.now()
+            )
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Применить изменения {(project_id, status): delta} (массовые операции)"""
+        for (project_id, status), delta in deltas.items():
+            cls.adjust(project_id, status, delta)
+
+    @classmethod
+    def rebuild(cls, project_ids=None):
+        """Пересчитать счетчики по таблице задач одним сгруппированным запросом"""
+        counters = cls.objects.all()
+        tasks = Task.objects.all()
+        if project_ids is not None:
+            counters = counters.filter(project_id__in=project_ids)
+            tasks = tasks.filter(project_id__in=project_ids)
+
+        rows = tasks.order_by().values('project_id', 'status').annotate(total=Count('id'))
+        with transaction.atomic():
+            counters.delete()
+            cls.objects.bulk_create(
+                cls(project_id=row['project_id'], status=row['status'], count=row['total'])
+                for row in rows
+            )
+
+
+class DeadlineEvent(models.Model):
+    """
+    Событие планировщика дедлайнов (tasks/deadlines.py), записанное
+    DatabaseSink. Для задачи с данным дедлайном событие каждого вида
+    записывается один раз, в том числе после перезапуска планировщика.
+    """
+    KIND_CHOICES = [
+        ('due_soon', 'Скоро дедлайн'),
+        ('overdue', 'Просрочена'),
+    ]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='deadline_events',
+        verbose_name='Задача'
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name='Вид события'
+    )
+    deadline = models.DateTimeField(verbose_name='Срок выполнения')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        verbose_name = 'Событие дедлайна'
+        verbose_name_plural = 'События дедлайнов'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'kind', 'deadline'], name='unique_deadline_event'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.task_id}"
+
+
+class SchedulerWatermark(models.Model):
+    """
+    Момент, до которого планировщик дедлайнов отправил все события.
+    После перезапуска планировщик продолжает с него, не повторяя
+    отправленные события и не пропуская наступившие за время простоя.
+    """
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Планировщик'
+    )
+    value = models.DateTimeField(verbose_name='Отметка')
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата обновления'
+    )
+
+    class Meta:
+        verbose_name = 'Отметка планировщика'
+        verbose_name_plural = 'Отметки планировщиков'
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class Change(models.Model):
+    """
+    Запись журнала изменений задач и проектов (tasks/changes.py,
+    /api/changes/). Номер записи (id) возрастает и служит позицией, с
+    которой клиент продолжает синхронизацию. Записи только добавляются
+    (и удаляются командой prune_changes по давности).
+    """
+    ACTION_CHOICES = [
+        ('create', 'Создание'),
+        ('update', 'Изменение'),
+        ('delete', 'Удаление'),
+    ]
+    MODEL_CHOICES = [
+        ('task', 'Задача'),
+        ('project', 'Проект'),
+    ]
+
+    model = models.CharField(
+        max_length=20,
+        choices=MODEL_CHOICES,
+        verbose_name='Модель'
+    )
+    object_id = models.BigIntegerField(verbose_name='ID объекта')
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        verbose_name='Действие'
+    )
+    # Без внешних ключей: запись переживает удаление проекта и пользователя
+    project_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Проект'
+    )
+    previous_project_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Прежний проект'
+    )
+    assignee_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Исполнитель'
+    )
+    previous_assignee_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Прежний исполнитель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ['id']
+        indexes = [
+            # Лента задач исполнителя (?assignee=), в том числе переназначенных
+            models.Index(fields=['assignee_id', 'id']),
+            models.Index(fields=['previous_assignee_id', 'id']),
+            # Недавние записи (пропуски номеров) и очистка по давности
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.id}: {self.get_action_display()} {self.model} {self.object_id}"
@@ -0,0 +1,216 @@
+"""
+Пагинация для API задач.
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация задач по ключу (-priority, -created_at, id).
+
+    Следующая страница выбирается условием по последней строке текущей,
+    поэтому нет ни OFFSET, ни COUNT(*): стоимость страницы не зависит от
+    ее номера. Порядок сортировки фиксирован (параметр ordering игнорируется),
+    поддерживается только переход вперед.
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('-priority', '-created_at', 'id')
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(*self.decode_cursor(cursor)))
+
+        return self._set_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Асинхронная версия paginate_queryset для async-представлений"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(*self.decode_cursor(cursor)))
+
+        return self._set_page([task async for task in queryset[:self.page_size + 1]])
+
+    def stream_page(self, queryset, request, chunk_size):
+        """
+        Страница для потоковой выдачи: (итератор строк, envelope). Строки
+        читаются из курсора порциями по chunk_size; envelope() вызывается
+        после обхода итератора и возвращает ссылку на следующую страницу.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.has_next = False
+        self.page = []
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(*self.decode_cursor(cursor)))
+
+        def rows():
+            for index, task in enumerate(queryset[:self.page_size + 1].iterator(chunk_size)):
+                if index == self.page_size:
+                    self.has_next = True
+                    break
+                self.page = [task]
+                yield task
+
+        return rows(), lambda: {'next': self.get_next_link()}
+
+    def _set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    @staticmethod
+    def after(priority, created_at, pk):
+        """Условие 'строго после' позиции в порядке (-priority, -created_at, id)"""
+        return (
+            Q(priority__lt=priority)
+            | Q(priority=priority, created_at__lt=created_at)
+            | Q(priority=priority, created_at=created_at, id__gt=pk)
+        )
+
+    def encode_cursor(self, task):
+        payload = json.dumps([task.priority, task.created_at.isoformat(), task.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            priority, created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return int(priority), datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TaskPagination(PageNumberPagination):
+    """
+    Постраничная пагинация задач с переключением на keyset-режим
+    по параметру ?paginate=cursor.
+    """
+    mode_query_param = 'paginate'
+    cursor_mode = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            self.keyset = TaskKeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Асинхронная версия paginate_queryset: COUNT и выборка страницы
+        выполняются через асинхронный ORM, остальное - как в PageNumberPagination.
+        """
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            self.keyset = TaskKeysetPagination()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # count - cached_property: заполняем заранее, чтобы Paginator не считал синхронно
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        self.page.object_list = [task async for task in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.request = request
+        return list(self.page)
+
+    def stream_page(self, queryset, request, chunk_size):
+        """
+        Страница для потоковой выдачи: (итератор строк, envelope). В отличие
+        от paginate_queryset строки страницы не загружаются списком, а
+        читаются из курсора порциями по chunk_size.
+        """
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            self.keyset = TaskKeysetPagination()
+            return self.keyset.stream_page(queryset, request, chunk_size)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        return self.page.object_list.iterator(chunk_size), lambda: {
+            'count': paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
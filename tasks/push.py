@@ -0,0 +1,187 @@
+"""
+Push изменений задач и проектов через Server-Sent Events (режим ASGI).
+
+GET /api/changes/stream/?project=<id>&assignee=me|<id> держит соединение
+и отправляет записи журнала изменений (tasks/changes.py) событиями
+`change` с id = номер записи. После обрыва EventSource переподключается с
+заголовком Last-Event-ID, и пропущенные записи дочитываются из журнала.
+
+Журнал читает один на процесс ChangeBroker и раздает записи подписчикам
+в памяти: число запросов к БД не зависит от числа открытых соединений.
+Записи, добавленные этим процессом, брокер читает сразу после фиксации
+транзакции (сигнал changes_committed); записи других воркеров и процессов
+(таблица журнала служит общей очередью) - опросом раз в POLL_INTERVAL,
+одним запросом номера последней записи, пока новых записей нет.
+
+Поток завершается через MAX_STREAM_AGE (клиент переподключится сам) и
+при переполнении очереди медленного клиента (дочитает из журнала).
+"""
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+
+from . import changes
+from .models import Change
+from .renderers import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = changes.POLL_INTERVAL
+HEARTBEAT = 15
+MAX_STREAM_AGE = 300
+QUEUE_SIZE = 1000
+# Пауза переподключения EventSource, мс
+RETRY = 1000
+
+_renderer = FastJSONRenderer()
+
+
+def format_event(data, event='change', event_id=None):
+    """Событие SSE в байтах"""
+    lines = [b'id: %d\n' % event_id] if event_id is not None else []
+    lines.append(b'event: ' + event.encode() + b'\n')
+    lines.append(b'data: ' + _renderer.dumps(data) + b'\n\n')
+    return b''.join(lines)
+
+
+class Subscription:
+    """Очередь записей (Change, сериализованная запись) одного потока"""
+
+    def __init__(self, project=None, assignee=None, size=QUEUE_SIZE):
+        self.project = project
+        self.assignee = assignee
+        self.queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def put(self, items):
+        for change, item in items:
+            if not changes.matches(change, self.project, self.assignee):
+                continue
+            try:
+                self.queue.put_nowait((change, item))
+            except asyncio.QueueFull:
+                self.overflowed = True
+                return
+
+
+class ChangeBroker:
+    """
+    Чтение журнала и раздача записей подписчикам. Работает в event loop
+    процесса, пока есть подписчики.
+    """
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.subscribers = set()
+        self.position = None
+        self.loop = None
+        self.wakeup = None
+        self.started = None
+        self.task = None
+
+    def subscribe(self, project=None, assignee=None):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.loop is not loop:
+            self.loop = loop
+            self.wakeup = asyncio.Event()
+            self.started = asyncio.Event()
+            self.position = None
+            self.task = loop.create_task(self.run())
+        subscription = Subscription(project, assignee)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def notify(self, **kwargs):
+        """Обработчик changes_committed; вызывается из любого потока"""
+        loop = self.loop
+        if loop is not None and not loop.is_closed() and self.subscribers:
+            loop.call_soon_threadsafe(self.wakeup.set)
+
+    async def run(self):
+        while self.position is None and self.subscribers:
+            try:
+                self.position = await sync_to_async(changes.last_seq)()
+            except Exception:
+                logger.exception('Не удалось прочитать журнал изменений')
+                await asyncio.sleep(self.interval)
+        self.started.set()
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.poll()
+            except Exception:
+                # Ошибка БД не должна останавливать раздачу: повтор при следующем опросе
+                logger.exception('Не удалось прочитать журнал изменений')
+
+    async def poll(self):
+        """Прочитать новые записи и раздать подписчикам"""
+        if await sync_to_async(changes.last_seq)() <= self.position:
+            return
+        has_more = True
+        while has_more:
+            try:
+                rows, has_more, position = await sync_to_async(changes.read_changes)(
+                    self.position, changes.MAX_LIMIT
+                )
+            except changes.ChangesGone:
+                # Журнал очищен дальше позиции: подписчики дочитают при переподключении
+                for subscription in self.subscribers:
+                    subscription.overflowed = True
+                self.position = await sync_to_async(changes.last_seq)()
+                return
+            self.position = position
+            if rows:
+                items = list(zip(rows, await sync_to_async(changes.serialize_changes)(rows)))
+                for subscription in list(self.subscribers):
+                    subscription.put(items)
+
+
+broker = ChangeBroker()
+changes.changes_committed.connect(broker.notify, sender=Change)
+
+
+async def event_stream(since=None, project=None, assignee=None, broker=broker):
+    """
+    Поток событий SSE: записи после since из журнала, затем новые записи
+    от брокера. since=None - только новые записи.
+    """
+    subscription = broker.subscribe(project, assignee)
+    started = time.monotonic()
+    try:
+        # Записи после позиции брокера попадут в очередь подписки
+        await broker.started.wait()
+        yield b'retry: %d\n\n' % RETRY
+        delivered = since
+        while since is not None:
+            try:
+                rows, has_more, delivered = await sync_to_async(changes.read_changes)(
+                    delivered, changes.MAX_LIMIT, assignee, project
+                )
+            except changes.ChangesGone:
+                yield format_event({'error': 'Изменения после since удалены'}, event='reset')
+                return
+            for item in await sync_to_async(changes.serialize_changes)(rows):
+                yield format_event(item, event_id=item['seq'])
+            if not has_more:
+                break
+
+        while not subscription.overflowed and time.monotonic() - started < MAX_STREAM_AGE:
+            try:
+                change, item = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT)
+            except asyncio.TimeoutError:
+                # Комментарий SSE: соединение не закрывается прокси по простою
+                yield b': ping\n\n'
+                continue
+            if delivered is None or change.id > delivered:
+                yield format_event(item, event_id=change.id)
+    finally:
+        broker.unsubscribe(subscription)
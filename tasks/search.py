@@ -0,0 +1,298 @@
+"""
+Полнотекстовый поиск по задачам и проектам.
+
+Бэкенд выбирается по типу базы данных (или настройкой TASKS_SEARCH_BACKEND):
+- SQLite: виртуальные таблицы FTS5, синхронизируемые триггерами;
+- PostgreSQL: колонка tsvector с GIN-индексом и trigram-индексы
+  для поиска подстроки;
+- остальные базы: поиск подстроки через icontains.
+
+На SQLite слово запроса совпадает с началом слова текста (?search=dock
+находит "docker", ?search=ock - нет). Слова со знаками препинания внутри
+("e-mail", "v1.2") FTS5 разбил бы на части, поэтому они ищутся как
+подстрока через icontains.
+"""
+import re
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+
+# Индексируемые таблицы и колонки. Первая колонка используется
+# для поиска подстроки на PostgreSQL (trigram-индекс).
+SEARCH_INDEXES = {
+    'tasks_task': ('title', 'description'),
+    'tasks_project': ('name', 'description'),
+}
+
+
+def _fts_table(table):
+    return f'{table}_fts'
+
+
+def _sqlite_schema(table, columns):
+    """SQL для FTS5-таблицы с внешним содержимым и триггеров синхронизации"""
+    fts = _fts_table(table)
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    delete_row = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_row = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return {
+        'table': (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, "
+            f"content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        ),
+        'triggers': {
+            f'{fts}_ai': f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+                         f"BEGIN {insert_row} END",
+            f'{fts}_ad': f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+                         f"BEGIN {delete_row} END",
+            f'{fts}_au': f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} "
+                         f"BEGIN {delete_row} {insert_row} END",
+        },
+        'rebuild': f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    }
+
+
+def _postgres_schema(table, columns):
+    """SQL для tsvector-колонки, GIN-индекса и trigram-индекса"""
+    weights = 'ABCD'
+    vector = ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{weights[i]}')"
+        for i, column in enumerate(columns)
+    )
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)",
+        # UPPER(...) совпадает с тем, как Django компилирует icontains,
+        # поэтому индекс используется и фильтрами TaskFilter/ProjectFilter
+        f"CREATE INDEX IF NOT EXISTS {table}_{columns[0]}_trgm ON {table} "
+        f"USING gin ((UPPER({columns[0]}::text)) gin_trgm_ops)",
+    ]
+
+
+def install_search_schema(conn):
+    """
+    Создать поисковые индексы, если их еще нет.
+    Вызывается миграцией и после каждого migrate: на SQLite пересоздание
+    таблицы при миграциях удаляет триггеры, и их нужно восстановить.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+            for table, columns in SEARCH_INDEXES.items():
+                schema = _sqlite_schema(table, columns)
+                missing = [name for name in schema['triggers'] if name not in existing]
+                if _fts_table(table) in existing and not missing:
+                    continue
+                cursor.execute(schema['table'])
+                for name in missing:
+                    cursor.execute(schema['triggers'][name])
+                cursor.execute(schema['rebuild'])
+        elif conn.vendor == 'postgresql':
+            for table, columns in SEARCH_INDEXES.items():
+                for statement in _postgres_schema(table, columns):
+                    cursor.execute(statement)
+
+
+def uninstall_search_schema(conn):
+    """Удалить поисковые индексы (обратная миграция)"""
+    with conn.cursor() as cursor:
+        for table, columns in SEARCH_INDEXES.items():
+            if conn.vendor == 'sqlite':
+                fts = _fts_table(table)
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+            elif conn.vendor == 'postgresql':
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_{columns[0]}_trgm")
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+
+def drop_search_index(conn, table):
+    """
+    Удалить триггеры FTS5 (SQLite) или GIN-индексы (PostgreSQL) таблицы;
+    install_search_schema создаст их заново и перестроит индекс.
+    """
+    columns = SEARCH_INDEXES[table]
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for name in _sqlite_schema(table, columns)['triggers']:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {table}_{columns[0]}_trgm")
+            cursor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+
+
+@contextmanager
+def deferred_search_index(conn, table):
+    """
+    Массовая загрузка без построчного обновления поискового индекса:
+    индекс перестраивается один раз в конце. Пока загрузка идет, новые
+    и измененные строки таблицы в поиске не находятся.
+    """
+    drop_search_index(conn, table)
+    try:
+        yield
+    finally:
+        install_search_schema(conn)
+
+
+class SearchBackend:
+    """
+    Базовый бэкенд: поиск подстроки через icontains по search_fields.
+    Каждое слово запроса должно встретиться хотя бы в одном поле.
+    """
+
+    def search(self, queryset, query, fields):
+        """Отфильтровать queryset и аннотировать его релевантностью search_rank"""
+        return queryset.filter(
+            self.substring_condition(query.split(), fields)
+        ).annotate(search_rank=Value(0.0))
+
+    @staticmethod
+    def substring_condition(terms, fields):
+        """Условие: каждое слово - подстрока хотя бы одного поля"""
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in fields:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        return condition
+
+    def is_indexed(self, model):
+        return model._meta.db_table in SEARCH_INDEXES
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """Поиск через FTS5: префиксное совпадение слов, ранжирование по bm25"""
+
+    # Знаки препинания между буквами или цифрами слова
+    INNER_PUNCTUATION = re.compile(r'\w[^\w\s]+\w')
+    EDGE_PUNCTUATION = re.compile(r'^[^\w]+|[^\w]+$')
+
+    @staticmethod
+    def build_query(query):
+        # Каждое слово берется в кавычки, чтобы спецсимволы FTS5 не
+        # интерпретировались как операторы; '*' - поиск по префиксу
+        terms = query.replace('"', ' ').split()
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, query, fields):
+        if not self.is_indexed(queryset.model):
+            return super().search(queryset, query, fields)
+
+        words, substrings = [], []
+        for term in query.split():
+            if self.INNER_PUNCTUATION.search(term):
+                substrings.append(self.EDGE_PUNCTUATION.sub('', term))
+            else:
+                words.append(term)
+        expression = self.build_query(' '.join(words))
+        if not expression:
+            return super().search(queryset, ' '.join(substrings), fields)
+        queryset = queryset.filter(self.substring_condition(substrings, fields))
+
+        table = queryset.model._meta.db_table
+        pk = queryset.model._meta.pk.column
+        fts = _fts_table(table)
+        # Соединение с FTS-таблицей, MATCH выполняется один раз. Унарный
+        # "+" запрещает планировщику искать в FTS по rowid для каждой строки
+        # таблицы (при фильтре по индексированной колонке он выбирает этот
+        # план), а коррелированный подзапрос для ранга повторял бы MATCH для
+        # каждой найденной строки - на десятках тысяч строк это минуты.
+        # Скрытая колонка rank (bm25) допустима и в запросах с GROUP BY.
+        return queryset.extra(
+            select={'search_rank': f'-"{fts}".rank'},
+            tables=[fts],
+            where=[f'+"{fts}".rowid = "{table}"."{pk}"', f'"{fts}" MATCH %s'],
+            params=[expression],
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Поиск через tsvector (ранжирование ts_rank) и trigram-поиск подстроки"""
+
+    def search(self, queryset, query, fields):
+        if not self.is_indexed(queryset.model):
+            return super().search(queryset, query, fields)
+
+        table = queryset.model._meta.db_table
+        column = SEARCH_INDEXES[table][0]
+        tsquery = "websearch_to_tsquery('simple', %s)"
+        pattern = '%{}%'.format(
+            query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        )
+        match = RawSQL(
+            f'("{table}"."search_vector" @@ {tsquery} '
+            f'OR UPPER("{table}"."{column}"::text) LIKE UPPER(%s))',
+            [query, pattern],
+            output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f'ts_rank("{table}"."search_vector", {tsquery})',
+            [query],
+            output_field=FloatField()
+        )
+        return queryset.filter(match).annotate(search_rank=rank)
+
+
+_VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def get_search_backend():
+    """Бэкенд поиска из настройки TASKS_SEARCH_BACKEND или по типу базы"""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'TASKS_SEARCH_BACKEND', None)
+        backend_class = (
+            import_string(path) if path
+            else _VENDOR_BACKENDS.get(connection.vendor, SearchBackend)
+        )
+        _backend = backend_class()
+    return _backend
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """SearchFilter, выполняющий ?search= через бэкенд полнотекстового поиска"""
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        query = ' '.join(self.get_search_terms(request))
+        if not search_fields or not query:
+            return queryset
+        return get_search_backend().search(queryset, query, search_fields).order_by(
+            '-search_rank', 'pk'
+        )
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter, не перекрывающий сортировку по релевантности:
+    при поиске без явного ?ordering= порядок по умолчанию не применяется.
+    """
+
+    def get_default_ordering(self, view):
+        request = getattr(view, 'request', None)
+        if request is not None and request.query_params.get(FullTextSearchFilter.search_param):
+            return None
+        return super().get_default_ordering(view)
@@ -0,0 +1,175 @@
+"""
+Генерация синтетических данных для нагрузочных тестов (manage.py seed_benchmark).
+
+Распределения приближены к реальным: большая часть задач завершена или
+ждет выполнения, высокий приоритет встречается реже среднего, у трети
+задач нет дедлайна, часть дедлайнов просрочена. Задачи распределены по
+проектам и исполнителям неравномерно (закон Ципфа): несколько крупных
+проектов и загруженных исполнителей и много мелких.
+
+Строки генерируются потоком и пишутся bulk_create пачками, поэтому
+память не зависит от объема; при одинаковом seed данные повторяются.
+"""
+import itertools
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, reset_queries, transaction
+from django.utils import timezone
+
+from .models import Project, ProjectTaskCounter, Task
+from .search import deferred_search_index
+from . import cache
+
+BATCH_SIZE = 2000
+TRANSACTION_BATCHES = 10
+USERNAME_PREFIX = 'bench_'
+PASSWORD = 'bench'
+
+STATUS_WEIGHTS = {'todo': 30, 'in_progress': 20, 'review': 10, 'completed': 35, 'cancelled': 5}
+PRIORITY_WEIGHTS = {1: 20, 2: 45, 3: 25, 4: 10}
+UNASSIGNED_SHARE = 0.15
+NO_DEADLINE_SHARE = 0.3
+HISTORY_DAYS = 365
+
+WORDS = (
+    'API', 'база', 'данных', 'миграция', 'отчет', 'интерфейс', 'клиент', 'сервер',
+    'платеж', 'поиск', 'кэш', 'индекс', 'тест', 'релиз', 'документация', 'ошибка',
+    'авторизация', 'уведомления', 'экспорт', 'импорт', 'дизайн', 'мобильное',
+    'приложение', 'аналитика', 'оптимизация', 'безопасность', 'логирование',
+    'deploy', 'docker', 'frontend', 'backend', 'review', 'refactoring', 'hotfix',
+)
+
+
+def zipf_weights(count):
+    """Веса 1/rank: первые элементы выбираются намного чаще последних"""
+    return list(itertools.accumulate(1 / rank for rank in range(1, count + 1)))
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Отключить auto_now / auto_now_add, чтобы bulk_create сохранил
+    заданные created_at / updated_at (история за HISTORY_DAYS дней).
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BenchmarkSeeder:
+    """Генератор пользователей, проектов и задач"""
+
+    def __init__(self, seed=42, batch_size=BATCH_SIZE, progress=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress
+        self.now = timezone.now()
+
+    def sentence(self, low, high):
+        return ' '.join(self.random.choices(WORDS, k=self.random.randint(low, high)))
+
+    def past(self, days=HISTORY_DAYS):
+        return self.now - timedelta(seconds=self.random.uniform(0, days * 86400))
+
+    def create_users(self, count):
+        password = make_password(PASSWORD)  # хэш один на всех: PBKDF2 дорог
+        start = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+        users = User.objects.bulk_create(
+            (
+                User(
+                    username=f'{USERNAME_PREFIX}{start + i}',
+                    email=f'{USERNAME_PREFIX}{start + i}@example.com',
+                    password=password,
+                )
+                for i in range(count)
+            ),
+            batch_size=self.batch_size
+        )
+        return [user.pk for user in users]
+
+    def create_projects(self, count, user_ids):
+        projects = []
+        for i in range(count):
+            created_at = self.past()
+            projects.append(Project(
+                name=f'{self.sentence(1, 3).capitalize()} #{i}',
+                description=self.sentence(5, 20),
+                owner_id=self.random.choice(user_ids),
+                is_active=self.random.random() > 0.1,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        Project.objects.bulk_create(projects, batch_size=self.batch_size)
+        return [project.pk for project in projects]
+
+    def generate_tasks(self, count, project_ids, user_ids):
+        """Поток несохраненных Task"""
+        statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+        priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+        project_weights = zipf_weights(len(project_ids))
+        assignee_weights = zipf_weights(len(user_ids))
+        rnd = self.random
+        for _ in range(count):
+            created_at = self.past()
+            status = rnd.choices(statuses, weights=status_weights)[0]
+            deadline = None
+            if rnd.random() > NO_DEADLINE_SHARE:
+                deadline = created_at + timedelta(days=max(1.0, rnd.gauss(21, 14)))
+            updated_at = min(self.now, created_at + timedelta(days=rnd.expovariate(1 / 7)))
+            yield Task(
+                title=self.sentence(2, 6).capitalize(),
+                description=self.sentence(10, 40),
+                project_id=rnd.choices(project_ids, cum_weights=project_weights)[0],
+                creator_id=rnd.choice(user_ids),
+                assignee_id=(
+                    None if rnd.random() < UNASSIGNED_SHARE
+                    else rnd.choices(user_ids, cum_weights=assignee_weights)[0]
+                ),
+                status=status,
+                priority=rnd.choices(priorities, weights=priority_weights)[0],
+                deadline=deadline,
+                created_at=created_at,
+                updated_at=updated_at,
+                completed_at=updated_at if status == 'completed' else None,
+            )
+
+    def create_tasks(self, count, project_ids, user_ids):
+        created = 0
+        tasks = self.generate_tasks(count, project_ids, user_ids)
+        while True:
+            chunk = list(itertools.islice(tasks, self.batch_size * TRANSACTION_BATCHES))
+            if not chunk:
+                break
+            with transaction.atomic():
+                Task.objects.bulk_create(chunk, batch_size=self.batch_size)
+            reset_queries()
+            created += len(chunk)
+            if self.progress is not None:
+                self.progress(created, count)
+        return created
+
+    def run(self, users, projects, tasks):
+        """Создать данные; вернуть (пользователи, проекты, задачи)"""
+        with explicit_timestamps(Project, Task), deferred_search_index(connection, 'tasks_task'):
+            user_ids = self.create_users(users)
+            project_ids = self.create_projects(projects, user_ids)
+            created = self.create_tasks(tasks, project_ids, user_ids)
+        # bulk_create не вызывает сигналы: счетчики и кэш - один раз в конце.
+        # В журнал изменений синтетические данные не пишутся: клиенты
+        # загружают их полной синхронизацией
+        ProjectTaskCounter.rebuild(project_ids)
+        cache.invalidate_tasks(project_ids, user_ids)
+        return len(user_ids), len(project_ids), created
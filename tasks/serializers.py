@@ -3,7 +3,7 @@
 """
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Project, Task
+from .models import Project, Task, request_now
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,7 +31,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
 
 
 class ProjectDetailSerializer(serializers.ModelSerializer):
-    """Подробный сериализатор проекта с задачами"""
+    """Подробный сериализатор проекта с задачами (детали и список с ?expand=tasks)"""
     owner = UserSerializer(read_only=True)
     tasks_count = serializers.IntegerField(read_only=True)
     completed_tasks_count = serializers.IntegerField(read_only=True)
@@ -47,8 +47,17 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def get_tasks(self, obj):
-        """Получить краткую информацию о задачах проекта"""
-        tasks = obj.tasks.all()[:10]  # Ограничиваем 10 задачами
+        """
+        Краткая информация о первых Project.TASK_PREVIEWS задачах проекта.
+        Для страницы проектов их подгружает одним запросом
+        ProjectQuerySet.with_task_previews; без него - запрос на проект
+        (project задач подставляет менеджер obj.tasks).
+        """
+        tasks = getattr(obj, 'task_previews', None)
+        if tasks is None:
+            tasks = obj.tasks.select_related('assignee', 'creator').with_is_overdue(
+                request_now(self.context.get('request'))
+            )[:Project.TASK_PREVIEWS]
         return TaskListSerializer(tasks, many=True).data
 
 
@@ -141,3 +150,21 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
         validated_data['creator'] = self.context['request'].user
         return super().create(validated_data)
 
+
+class TaskStatusSerializer(serializers.ModelSerializer):
+    """Краткий ответ на изменение статуса задачи"""
+
+    class Meta:
+        model = Task
+        fields = ['id', 'status', 'completed_at', 'updated_at']
+        read_only_fields = fields
+
+
+class TaskAssignSerializer(serializers.ModelSerializer):
+    """Краткий ответ на назначение задачи"""
+    assignee_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'assignee_id', 'updated_at']
+        read_only_fields = fields
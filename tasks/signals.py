@@ -0,0 +1,131 @@
+"""
+Обработчики сигналов моделей.
+"""
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Project, Task, ProjectTaskCounter
+from rest_framework.authtoken.models import Token
+
+from .search import install_search_schema
+from . import authentication, cache
+from .changes import CREATE, DELETE, UPDATE, project_change, record, task_change
+
+
+def deleted_with_project(origin):
+    """Удаление вызвано удалением проекта (каскадно)"""
+    return isinstance(origin, Project) or getattr(origin, 'model', None) is Project
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    """Перенести задачу между счетчиками при создании или смене статуса/проекта"""
+    if raw:
+        # loaddata: счетчики пересчитываются командой rebuild_task_counters
+        return
+
+    new_state = (instance.project_id, instance.status)
+    old_state = None if created else getattr(instance, '_counter_state', None)
+
+    if not created and (old_state is None or None in old_state):
+        # Исходное состояние неизвестно (объект создан вручную с pk
+        # или загружен через only()) - пересчитываем счетчики проекта целиком
+        project_ids = {instance.project_id}
+        if old_state and old_state[0] is not None:
+            project_ids.add(old_state[0])
+        ProjectTaskCounter.rebuild(project_ids)
+    elif old_state != new_state:
+        if old_state is not None:
+            ProjectTaskCounter.adjust(*old_state, -1)
+        ProjectTaskCounter.adjust(*new_state, 1)
+    instance._counter_state = new_state
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_delete(sender, instance, origin=None, **kwargs):
+    """Уменьшить счетчик при удалении задачи (в том числе каскадном)"""
+    if deleted_with_project(origin):
+        # Задачи удаляются вместе с проектом, а с ними и счетчики проекта:
+        # UPDATE на каждую задачу не нужен
+        return
+    state = getattr(instance, '_counter_state', None)
+    if not state or None in state:
+        state = (instance.project_id, instance.status)
+    ProjectTaskCounter.adjust(*state, -1)
+
+
+# Обработчики журнала подключаются раньше invalidate_task_cache: он
+# перезаписывает _cache_state, по которому определяется прежний исполнитель
+@receiver(post_save, sender=Task)
+def log_task_save(sender, instance, created, raw=False, **kwargs):
+    """Запись журнала изменений о создании или изменении задачи"""
+    if not raw:
+        record([task_change(instance, CREATE if created else UPDATE)])
+
+
+@receiver(post_delete, sender=Task)
+def log_task_delete(sender, instance, origin=None, **kwargs):
+    """Запись журнала об удалении задачи (кроме удаления вместе с проектом)"""
+    if not deleted_with_project(origin):
+        record([task_change(instance, DELETE)])
+
+
+@receiver(post_save, sender=Project)
+def log_project_save(sender, instance, created, raw=False, **kwargs):
+    """Запись журнала изменений о создании или изменении проекта"""
+    if not raw:
+        record([project_change(instance, CREATE if created else UPDATE)])
+
+
+@receiver(post_delete, sender=Project)
+def log_project_delete(sender, instance, **kwargs):
+    """Запись журнала об удалении проекта (его задачи клиент удаляет сам)"""
+    record([project_change(instance, DELETE)])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_cache(sender, instance, **kwargs):
+    """Инвалидировать кэш ответов для старых и новых проекта и исполнителя"""
+    old_project_id, old_assignee_id = getattr(instance, '_cache_state', (None, None))
+    cache.invalidate_tasks(
+        project_ids={instance.project_id, old_project_id},
+        assignee_ids={instance.assignee_id, old_assignee_id}
+    )
+    instance._cache_state = (instance.project_id, instance.assignee_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_cache(sender, instance, **kwargs):
+    """Инвалидировать кэш ответов по проекту"""
+    cache.invalidate_project(instance.pk)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """Удалить токен из кэша аутентификации"""
+    authentication.invalidate_token(instance.key)
+    cache.invalidate_credentials(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_auth_cache(sender, instance, update_fields=None, **kwargs):
+    """
+    Смена пароля, is_active и т.п. - удалить закэшированные учетные данные;
+    смена имени или email - инвалидировать ответы с данными пользователя
+    """
+    authentication.invalidate_user(instance.pk)
+    cache.invalidate_credentials(instance.pk)
+    # Вход обновляет только last_login, которого нет в ответах API
+    if update_fields is None or set(update_fields) - {'last_login'}:
+        cache.invalidate_users()
+
+
+def restore_search_schema(sender, using, **kwargs):
+    """Восстановить поисковые индексы, если миграция пересоздала таблицы"""
+    install_search_schema(connections[using])
@@ -0,0 +1,91 @@
+"""
+Потоковая выдача списков.
+
+По ?stream=true list отдает страницу через StreamingHttpResponse: строки
+читаются из курсора БД порциями (QuerySet.iterator), сериализуются и
+кодируются StreamingJSONRenderer по мере отправки. Пик памяти зависит от
+размера порции, а не от page_size, что важно для больших страниц
+keyset-пагинации (до 1000 задач).
+
+Потоковый ответ не кэшируется (ResponseCacheMixin), но ETag и 304
+работают как обычно. Поля пагинации (count, next, previous) идут после
+results.
+
+streaming_response используется и выгрузкой задач (tasks/export.py).
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from .renderers import StreamingJSONRenderer
+
+
+async def aiterate(iterator):
+    """
+    Асинхронный обход синхронного итератора: каждая порция читается в
+    потоке sync_to_async (там же, где соединение с БД этого запроса).
+    """
+    iterator = iter(iterator)
+    while True:
+        chunk = await sync_to_async(next)(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def streaming_response(request, content, content_type):
+    """
+    StreamingHttpResponse для итератора байтов. Под ASGI Django собирает
+    синхронный итератор в список целиком, поэтому он оборачивается в aiterate.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        content = aiterate(content)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    # nginx отдает порции клиенту сразу, не накапливая ответ в буфере
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class StreamingListMixin:
+    """
+    Потоковый list для ViewSet'ов с пагинацией, поддерживающей stream_page.
+    Должен стоять в MRO перед ResponseCacheMixin и ConditionalRequestMixin.
+    """
+    stream_query_param = 'stream'
+    stream_renderer_class = StreamingJSONRenderer
+
+    def is_streaming_request(self, request):
+        """Запрошен ?stream=true и выбран JSON (не Browsable API)"""
+        return (
+            request.query_params.get(self.stream_query_param) in ('1', 'true')
+            and getattr(request, 'accepted_renderer', None) is not None
+            and request.accepted_renderer.format == 'json'
+        )
+
+    def streaming_list_response(self, request):
+        renderer = self.stream_renderer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows, envelope = self.paginator.stream_page(queryset, request, renderer.chunk_size)
+        context = self.get_serializer_context()
+        serializer_class = self.get_serializer_class()
+
+        def serialize(objects):
+            return serializer_class(objects, many=True, context=context).data
+
+        return streaming_response(
+            request, renderer.render_stream(rows, serialize, envelope),
+            f'{renderer.media_type}; charset={renderer.charset}'
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming_request(request):
+            return super().list(request, *args, **kwargs)
+        return self.conditional_list_response(
+            request, self.get_conditional_queryset(),
+            lambda: self.streaming_list_response(request)
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.is_streaming_request(request):
+            return await super().alist(request, *args, **kwargs)
+        return await sync_to_async(self.list)(request, *args, **kwargs)
@@ -2,9 +2,11 @@
 Тесты API для проектов.
 """
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from tasks.models import Project
+from tasks.models import Project, Task
 
 
 @pytest.mark.django_db
@@ -129,3 +131,102 @@ class TestProjectAPI:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
 
+    def test_project_statistics_breakdown(self, authenticated_client, project, user):
+        """Тест разбивки статистики по статусам и приоритетам"""
+        from tasks.models import Task
+        
+        Task.objects.create(title='Review', project=project, creator=user, status='review', priority=4)
+        Task.objects.create(title='Cancelled', project=project, creator=user, status='cancelled', assignee=user)
+        
+        url = reverse('tasks:project-statistics', kwargs={'pk': project.id})
+        response = authenticated_client.get(url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['review_tasks'] == 1
+        assert response.data['cancelled_tasks'] == 1
+        assert response.data['unassigned_tasks'] == 1
+        assert response.data['by_priority'][4] == 1
+        assert response.data['by_priority'][2] == 1
+    
+    def test_batch_statistics(self, authenticated_client, project, user):
+        """Тест статистики по нескольким проектам"""
+        from tasks.models import Task
+        
+        empty = Project.objects.create(name='Empty Project', owner=user)
+        Task.objects.create(title='Task', project=project, creator=user, status='completed')
+        
+        url = reverse('tasks:project-batch-statistics')
+        response = authenticated_client.get(url, {'ids': f'{project.id},{empty.id}'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[str(project.id)]['completed_tasks'] == 1
+        assert response.data[str(empty.id)]['total_tasks'] == 0
+    
+    def test_batch_statistics_invalid_ids(self, authenticated_client):
+        """Тест статистики с некорректным списком ID"""
+        url = reverse('tasks:project-batch-statistics')
+        response = authenticated_client.get(url, {'ids': '1,abc'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestProjectTaskPreviews:
+    """Тесты превью задач в деталях проекта и в списке с ?expand=tasks"""
+
+    def create_projects(self, count, user, another_user):
+        for i in range(count):
+            project = Project.objects.create(name=f'Project {i}', owner=user)
+            Task.objects.bulk_create([
+                Task(title=f'Task {j}', project=project, creator=user,
+                     assignee=another_user, priority=j % 4 + 1)
+                for j in range(Project.TASK_PREVIEWS + 2)
+            ])
+
+    def get_list(self, client, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('tasks:project-list'), params)
+        assert response.status_code == status.HTTP_200_OK
+        return response, len(queries)
+
+    def test_expand_tasks(self, authenticated_client, user, another_user):
+        """Тест превью задач в списке: первые задачи по приоритету, с пользователями"""
+        self.create_projects(2, user, another_user)
+        response, _ = self.get_list(authenticated_client, expand='tasks')
+
+        for item in response.data['results']:
+            tasks = item['tasks']
+            assert len(tasks) == Project.TASK_PREVIEWS
+            assert tasks[0]['priority'] == 4
+            assert tasks[0]['project_name'] == item['name']
+            assert tasks[0]['assignee']['username'] == 'anotheruser'
+        assert 'tasks' not in self.get_list(authenticated_client)[0].data['results'][0]
+
+    def test_expand_tasks_constant_queries(self, authenticated_client, user, another_user):
+        """Тест: число запросов не зависит от числа проектов на странице"""
+        self.create_projects(1, user, another_user)
+        _, one = self.get_list(authenticated_client, expand='tasks')
+        self.create_projects(5, user, another_user)
+        _, six = self.get_list(authenticated_client, expand='tasks', page_size=50)
+        assert six == one
+
+    def test_detail_previews(self, authenticated_client, user, another_user):
+        """Тест превью в деталях проекта"""
+        self.create_projects(1, user, another_user)
+        project = Project.objects.get()
+        url = reverse('tasks:project-detail', args=[project.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(url)
+        assert len(response.data['tasks']) == Project.TASK_PREVIEWS
+        assert len(queries) <= 4
+
+    def test_expand_tasks_etag(self, authenticated_client, user, another_user):
+        """Тест: ETag списка с превью меняется при изменении задачи"""
+        self.create_projects(1, user, another_user)
+        etag = self.get_list(authenticated_client, expand='tasks')[0]['ETag']
+        task = Task.objects.first()
+        task.title = 'Changed'
+        task.save()
+
+        response, _ = self.get_list(authenticated_client, expand='tasks')
+        assert response['ETag'] != etag
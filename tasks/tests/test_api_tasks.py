@@ -208,3 +208,98 @@ class TestTaskAPI:
         assert len(response.data['results']) == 1
         assert response.data['results'][0]['title'] == 'Django Development'
 
+    def test_cursor_pagination_walks_all_tasks(self, authenticated_client, project, user):
+        """Тест обхода всех задач в keyset-режиме пагинации"""
+        for i in range(25):
+            Task.objects.create(
+                title=f'Task {i}',
+                project=project,
+                creator=user,
+                priority=i % 4 + 1,
+                status='completed' if i % 5 == 0 else 'todo'
+            )
+        
+        url = reverse('tasks:task-list')
+        params = {'paginate': 'cursor', 'status': 'todo'}
+        seen = []
+        while url:
+            response = authenticated_client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            seen.extend(item['id'] for item in response.data['results'])
+            url, params = response.data['next'], None
+        
+        expected = list(
+            Task.objects.filter(status='todo')
+            .order_by('-priority', '-created_at', 'id')
+            .values_list('id', flat=True)
+        )
+        assert seen == expected
+    
+    def test_cursor_pagination_invalid_cursor(self, authenticated_client, task):
+        """Тест некорректного курсора"""
+        url = reverse('tasks:task-list')
+        response = authenticated_client.get(url, {'paginate': 'cursor', 'cursor': 'garbage'})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_bulk_create_tasks(self, authenticated_client, project, user):
+        """Тест массового создания задач с ошибками по элементам"""
+        url = reverse('tasks:task-bulk')
+        data = [
+            {'title': 'Bulk 1', 'project': project.id, 'status': 'completed'},
+            {'title': 'Bulk 2', 'project': project.id, 'assignee': user.id},
+            {'title': 'Bulk 3', 'project': 999999},
+            {'project': project.id},
+        ]
+        response = authenticated_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert [error['index'] for error in response.data['errors']] == [2, 3]
+        
+        completed = Task.objects.get(title='Bulk 1')
+        assert completed.completed_at is not None
+        assert completed.creator == user
+        assert project.tasks_count == 2
+        assert project.completed_tasks_count == 1
+    
+    def test_bulk_update_tasks(self, authenticated_client, task):
+        """Тест массового обновления задач"""
+        url = reverse('tasks:task-bulk')
+        data = [
+            {'id': task.id, 'status': 'completed', 'priority': 4},
+            {'id': 999999, 'title': 'Missing'},
+        ]
+        response = authenticated_client.patch(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['errors'][0]['index'] == 1
+        
+        task.refresh_from_db()
+        assert task.status == 'completed'
+        assert task.priority == 4
+        assert task.completed_at is not None
+        assert task.project.completed_tasks_count == 1
+    
+    def test_bulk_change_status(self, authenticated_client, project, user):
+        """Тест массовой смены статуса"""
+        tasks = [
+            Task.objects.create(title=f'Task {i}', project=project, creator=user)
+            for i in range(3)
+        ]
+        url = reverse('tasks:task-bulk-change-status')
+        data = {'ids': [t.id for t in tasks] + [999999], 'status': 'completed'}
+        response = authenticated_client.post(url, data, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [t.id for t in tasks]
+        assert response.data['errors'][0]['id'] == 999999
+        assert Task.objects.filter(status='completed', completed_at__isnull=False).count() == 3
+        assert project.completed_tasks_count == 3
+        
+        response = authenticated_client.post(url, {'ids': [tasks[0].id], 'status': 'bad'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = authenticated_client.post(url, [tasks[0].id], format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
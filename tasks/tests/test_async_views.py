@@ -0,0 +1,107 @@
+"""
+Тесты асинхронных представлений (режим ASGI).
+"""
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, override_settings
+from rest_framework import status
+from rest_framework.test import force_authenticate
+from tasks.models import Task
+from tasks.views import ProjectViewSet, TaskViewSet
+
+
+def call(viewset, actions, request, user, **kwargs):
+    """Выполнить запрос через асинхронный маршрут ViewSet'а"""
+    view = viewset.as_view(actions, async_route=True)
+    force_authenticate(request, user=user)
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.fixture
+def factory():
+    return AsyncRequestFactory()
+
+
+@pytest.mark.django_db
+class TestAsyncTaskViews:
+    """Тесты асинхронных list / retrieve / my_tasks"""
+
+    def test_list(self, factory, user, task):
+        """Тест асинхронного списка задач"""
+        response = call(TaskViewSet, {'get': 'list'}, factory.get('/api/tasks/'), user)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['id'] == task.id
+        assert 'ETag' in response
+
+    def test_list_filters_and_cursor_pagination(self, factory, user, project):
+        """Тест фильтрации и keyset-пагинации в асинхронном режиме"""
+        for i in range(3):
+            Task.objects.create(title=f'T{i}', project=project, creator=user, priority=i + 1)
+        request = factory.get('/api/tasks/', {'paginate': 'cursor', 'page_size': 2})
+        response = call(TaskViewSet, {'get': 'list'}, request, user)
+        assert [item['title'] for item in response.data['results']] == ['T2', 'T1']
+        assert response.data['next']
+
+        request = factory.get('/api/tasks/', {'priority': 1})
+        response = call(TaskViewSet, {'get': 'list'}, request, user)
+        assert [item['title'] for item in response.data['results']] == ['T0']
+
+    def test_list_not_modified(self, factory, user, task):
+        """Тест ответа 304 по ETag"""
+        etag = call(TaskViewSet, {'get': 'list'}, factory.get('/api/tasks/'), user)['ETag']
+        request = factory.get('/api/tasks/', headers={'If-None-Match': etag})
+        response = call(TaskViewSet, {'get': 'list'}, request, user)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_retrieve(self, factory, user, task):
+        """Тест детального просмотра и 404"""
+        request = factory.get(f'/api/tasks/{task.id}/')
+        response = call(TaskViewSet, {'get': 'retrieve'}, request, user, pk=task.id)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['project_detail']['tasks_count'] == 1
+
+        request = factory.get('/api/tasks/999999/')
+        response = call(TaskViewSet, {'get': 'retrieve'}, request, user, pk=999999)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_my_tasks(self, factory, user, another_user, project):
+        """Тест задач текущего пользователя"""
+        Task.objects.create(title='Mine', project=project, creator=user, assignee=user)
+        Task.objects.create(title='Other', project=project, creator=user, assignee=another_user)
+        request = factory.get('/api/tasks/my_tasks/')
+        response = call(TaskViewSet, {'get': 'my_tasks'}, request, user)
+        assert [item['title'] for item in response.data['results']] == ['Mine']
+
+    def test_sync_method_on_async_route(self, factory, user, project):
+        """Тест POST на асинхронном маршруте списка (синхронный обработчик)"""
+        request = factory.post(
+            '/api/tasks/', {'title': 'Created', 'project': project.id},
+            content_type='application/json'
+        )
+        response = call(TaskViewSet, {'get': 'list', 'post': 'create'}, request, user)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Task.objects.filter(title='Created').exists()
+
+    def test_project_statistics(self, factory, user, project, task):
+        """Тест асинхронной статистики проекта"""
+        request = factory.get(f'/api/projects/{project.id}/statistics/')
+        response = call(ProjectViewSet, {'get': 'statistics'}, request, user, pk=project.id)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_tasks'] == 1
+        assert response.data['todo_tasks'] == 1
+
+
+class TestAsyncRouteSelection:
+    """Тесты выбора асинхронного маршрута"""
+
+    def test_sync_by_default(self):
+        assert not asyncio.iscoroutinefunction(TaskViewSet.as_view({'get': 'list'}))
+
+    @override_settings(TASKS_ASYNC_VIEWS=True)
+    def test_async_when_enabled(self):
+        assert asyncio.iscoroutinefunction(TaskViewSet.as_view({'get': 'list'}))
+        assert not asyncio.iscoroutinefunction(TaskViewSet.as_view({'post': 'bulk'}))
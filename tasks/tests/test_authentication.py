@@ -0,0 +1,133 @@
+"""
+Тесты кэширующей аутентификации.
+"""
+import base64
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from tasks import authentication
+from tasks.authentication import CachedBasicAuthentication, CachedTokenAuthentication
+
+
+def basic_header(username, password):
+    credentials = base64.b64encode(f'{username}:{password}'.encode()).decode()
+    return f'Basic {credentials}'
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    """Тесты кэша token -> user"""
+
+    def test_second_lookup_without_queries(self, user):
+        """Тест повторной проверки токена без обращений к БД"""
+        token = Token.objects.create(user=user)
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+
+        with CaptureQueriesContext(connection) as ctx:
+            cached_user, cached_token = auth.authenticate_credentials(token.key)
+        assert len(ctx.captured_queries) == 0
+        assert cached_user == user
+        assert cached_token == token
+
+    def test_returns_copy_of_user(self, user):
+        """Тест изоляции request.user между запросами"""
+        token = Token.objects.create(user=user)
+        auth = CachedTokenAuthentication()
+        first, _ = auth.authenticate_credentials(token.key)
+        first.first_name = 'Changed'
+        second, _ = auth.authenticate_credentials(token.key)
+        assert second.first_name != 'Changed'
+
+    def test_deleted_token_rejected(self, api_client, user):
+        """Тест инвалидации при удалении токена"""
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        url = reverse('tasks:task-my-tasks')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        token.delete()
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivated_user_rejected(self, api_client, user):
+        """Тест инвалидации при изменении пользователя"""
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        url = reverse('tasks:task-my-tasks')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        user.is_active = False
+        user.save()
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoked_in_other_process(self, api_client, user):
+        """Тест: запись кэша процесса устаревает по поколению в общем кэше"""
+        token = Token.objects.create(user=user)
+        key = token.key
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        url = reverse('tasks:task-my-tasks')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        # Другой процесс удалил токен: локальный кэш этого процесса не очищен
+        with mock.patch.object(authentication, 'invalidate_token'):
+            token.delete()
+        assert authentication.token_cache.get(key) is not None
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_lru_eviction(self):
+        """Тест вытеснения самой старой записи"""
+        cache = authentication.LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Тест истечения времени жизни записи"""
+        cache = authentication.LRUCache(maxsize=2, ttl=60)
+        with mock.patch('tasks.authentication.time.monotonic', return_value=0):
+            cache.set('a', 1)
+        with mock.patch('tasks.authentication.time.monotonic', return_value=61):
+            assert cache.get('a') is None
+
+
+@pytest.mark.django_db
+class TestCachedBasicAuthentication:
+    """Тесты кэша проверенных Basic-учетных данных"""
+
+    def test_password_hashed_once(self, user):
+        """Тест повторной проверки без расчета хэша пароля"""
+        auth = CachedBasicAuthentication()
+        with mock.patch.object(User, 'check_password', autospec=True, return_value=True) as check:
+            auth.authenticate_credentials('testuser', 'testpass123')
+            cached_user, _ = auth.authenticate_credentials('testuser', 'testpass123')
+        assert check.call_count == 1
+        assert cached_user == user
+
+    def test_wrong_password_not_cached(self, api_client, user):
+        """Тест отказа при неверном пароле после успешного входа"""
+        url = reverse('tasks:task-my-tasks')
+        api_client.credentials(HTTP_AUTHORIZATION=basic_header('testuser', 'testpass123'))
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        api_client.credentials(HTTP_AUTHORIZATION=basic_header('testuser', 'wrong'))
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_change_invalidates(self, api_client, user):
+        """Тест инвалидации при смене пароля"""
+        url = reverse('tasks:task-my-tasks')
+        api_client.credentials(HTTP_AUTHORIZATION=basic_header('testuser', 'testpass123'))
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        user.set_password('newpass456')
+        user.save()
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,91 @@
+"""
+Тесты кэша ответов API.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from tasks import cache
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Тесты попаданий в кэш и инвалидации по поколениям"""
+    
+    def test_repeated_list_served_from_cache(self, authenticated_client, task):
+        """Тест повторного запроса без обращений к БД"""
+        url = reverse('tasks:task-list')
+        assert authenticated_client.get(url)['X-Cache'] == 'MISS'
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.data['results'][0]['title'] == task.title
+        assert len(ctx.captured_queries) == 0
+    
+    def test_task_change_invalidates_list(self, authenticated_client, task):
+        """Тест инвалидации списка при изменении задачи"""
+        url = reverse('tasks:task-list')
+        authenticated_client.get(url)
+        
+        task.title = 'Changed'
+        task.save()
+        response = authenticated_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'][0]['title'] == 'Changed'
+    
+    def test_reassign_invalidates_both_assignees(self, authenticated_client, task, user, another_user):
+        """Тест инвалидации my_tasks старого и нового исполнителя"""
+        task.assignee = user
+        task.save()
+        url = reverse('tasks:task-my-tasks')
+        assert len(authenticated_client.get(url).data['results']) == 1
+        
+        task = Task.objects.get(pk=task.pk)
+        task.assignee = another_user
+        task.save()
+        assert len(authenticated_client.get(url).data['results']) == 0
+    
+    def test_bulk_change_status_invalidates_project(self, authenticated_client, project, task):
+        """Тест инвалидации статистики проекта после массовой операции"""
+        url = reverse('tasks:project-statistics', kwargs={'pk': project.id})
+        assert authenticated_client.get(url).data['completed_tasks'] == 0
+        
+        authenticated_client.post(
+            reverse('tasks:task-bulk-change-status'),
+            {'ids': [task.id], 'status': 'completed'},
+            format='json'
+        )
+        assert authenticated_client.get(url).data['completed_tasks'] == 1
+    
+    def test_user_change_invalidates_nested_data(self, authenticated_client, task, user):
+        """Тест: изменение пользователя инвалидирует ответы с его данными, вход - нет"""
+        url = reverse('tasks:task-list')
+        authenticated_client.get(url)
+        
+        user.save(update_fields=['last_login'])
+        assert authenticated_client.get(url)['X-Cache'] == 'HIT'
+        
+        user.first_name = 'Renamed'
+        user.save()
+        response = authenticated_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'][0]['creator']['first_name'] == 'Renamed'
+    
+    def test_cache_stats_endpoint(self, api_client, admin_user, task):
+        """Тест метрик кэша"""
+        cache.reset_stats()
+        api_client.force_authenticate(user=admin_user)
+        url = reverse('tasks:task-list')
+        api_client.get(url)
+        api_client.get(url)
+        task.save()
+        api_client.get(url)
+        
+        response = api_client.get(reverse('tasks:cache-stats'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['hits'] == 1
+        assert response.data['misses'] == 2
+        assert response.data['evictions'] == 1
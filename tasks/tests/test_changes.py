@@ -0,0 +1,227 @@
+"""
+Тесты журнала изменений и ленты /api/changes/.
+"""
+import io
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.management import call_command
+from django.test import AsyncClient, AsyncRequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import force_authenticate
+from tasks import bulk, changes, push
+from tasks.models import Change, Project, Task
+from tasks.views import ChangeViewSet
+
+URL = reverse('tasks:change-list')
+
+
+def feed(client, **params):
+    response = client.get(URL, params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def actions(data):
+    return [(item['model'], item['action']) for item in data['results']]
+
+
+@pytest.mark.django_db
+class TestChangeLog:
+    """Тесты записи журнала при сохранении и удалении"""
+
+    def test_task_lifecycle(self, authenticated_client, project, user, another_user):
+        """Тест создания, переназначения и удаления задачи"""
+        since = feed(authenticated_client)['last_seq']
+        task = Task.objects.create(title='A', project=project, creator=user, assignee=user)
+        task.assignee = another_user
+        task.save()
+
+        data = feed(authenticated_client, since=since)
+        assert actions(data) == [('task', 'create'), ('task', 'update')]
+        assert data['results'][1]['data']['assignee']['id'] == another_user.pk
+        assert Change.objects.last().previous_assignee_id == user.pk
+
+        task.delete()
+        data = feed(authenticated_client, since=data['last_seq'])
+        assert actions(data) == [('task', 'delete')]
+        assert data['results'][0]['data'] is None
+
+    def test_project_delete(self, authenticated_client, project, task):
+        """Тест: задачи, удаленные вместе с проектом, отдельных записей не получают"""
+        since = feed(authenticated_client)['last_seq']
+        project.delete()
+        assert actions(feed(authenticated_client, since=since)) == [('project', 'delete')]
+
+    def test_bulk_operations(self, authenticated_client, project, user):
+        """Тест записей массового создания и смены статуса"""
+        since = feed(authenticated_client)['last_seq']
+        created, _ = bulk.bulk_create_tasks(
+            [{'title': f'T{i}', 'project': project.pk} for i in range(3)], user
+        )
+        bulk.bulk_change_status([task.pk for task in created], 'review')
+
+        data = feed(authenticated_client, since=since)
+        assert actions(data) == [('task', 'create')] * 3 + [('task', 'update')] * 3
+        assert {item['data']['status'] for item in data['results']} == {'review'}
+
+    def test_rollback(self, project, user):
+        """Тест: откат транзакции откатывает и запись журнала"""
+        count = Change.objects.count()
+        with mock.patch('tasks.signals.cache.invalidate_tasks', side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                Task.objects.create(title='A', project=project, creator=user)
+        assert Change.objects.count() == count
+
+
+@pytest.mark.django_db
+class TestChangeFeed:
+    """Тесты ленты изменений"""
+
+    def test_pagination(self, api_client, project, user):
+        """Тест страниц по limit и продолжения с last_seq"""
+        since = feed(api_client)['last_seq']
+        for i in range(5):
+            Task.objects.create(title=f'T{i}', project=project, creator=user)
+
+        first = feed(api_client, since=since, limit=3)
+        assert len(first['results']) == 3 and first['has_more']
+        assert first['last_seq'] == first['results'][-1]['seq']
+        second = feed(api_client, since=first['last_seq'], limit=3)
+        assert [item['data']['title'] for item in second['results']] == ['T3', 'T4']
+        assert not second['has_more']
+
+    def test_assignee(self, authenticated_client, project, user, another_user):
+        """Тест ?assignee=me: задачи пользователя, в том числе снятые с него"""
+        since = feed(authenticated_client)['last_seq']
+        mine = Task.objects.create(title='Mine', project=project, creator=user, assignee=user)
+        Task.objects.create(title='Other', project=project, creator=user, assignee=another_user)
+        mine.assignee = another_user
+        mine.save()
+
+        data = feed(authenticated_client, since=since, assignee='me')
+        assert [(item['id'], item['action']) for item in data['results']] == [
+            (mine.pk, 'create'), (mine.pk, 'update')
+        ]
+        assert data['last_seq'] == Change.objects.last().id
+
+    def test_long_poll(self, api_client, project, user):
+        """Тест ?wait=: ответ с записью, появившейся во время ожидания"""
+        since = feed(api_client)['last_seq']
+
+        def create(seconds):
+            Task.objects.create(title='Later', project=project, creator=user)
+
+        with mock.patch.object(changes.time, 'sleep', side_effect=create) as sleep:
+            data = feed(api_client, since=since, wait=5)
+        assert sleep.call_count == 1
+        assert actions(data) == [('task', 'create')]
+
+    def test_async_long_poll(self, user, project):
+        """Тест асинхронного long-poll (режим ASGI)"""
+        since = changes.last_seq()
+
+        async def create(seconds):
+            await sync_to_async(Task.objects.create)(title='Later', project=project, creator=user)
+
+        request = AsyncRequestFactory().get(URL, {'since': since, 'wait': 5})
+        force_authenticate(request, user=user)
+        view = ChangeViewSet.as_view({'get': 'list'}, async_route=True)
+        with mock.patch.object(changes.asyncio, 'sleep', side_effect=create):
+            response = async_to_sync(view)(request)
+        assert actions(response.data) == [('task', 'create')]
+
+    def test_gap_guard(self, project, user):
+        """Тест: лента не заходит за недавний пропуск номера"""
+        since = changes.last_seq()
+        for i in range(3):
+            Task.objects.create(title=f'T{i}', project=project, creator=user)
+        first, missing, last = Change.objects.filter(id__gt=since).values_list('id', flat=True)
+        # Запись, еще не видимая другим транзакциям
+        Change.objects.filter(id=missing).delete()
+
+        rows, has_more, last_seq = changes.read_changes(since)
+        assert [row.id for row in rows] == [first] and last_seq == first
+
+        later = timezone.now() + changes.GAP_TIMEOUT + timedelta(seconds=1)
+        rows, _, last_seq = changes.read_changes(since, now=later)
+        assert [row.id for row in rows] == [first, last] and last_seq == last
+
+    def test_pruned(self, api_client, project):
+        """Тест ответа 410 для since до очищенных записей"""
+        Project.objects.create(name='Second', owner=project.owner)
+        Change.objects.update(created_at=timezone.now() - timedelta(days=40))
+        stdout = io.StringIO()
+        call_command('prune_changes', '--days', '30', stdout=stdout)
+        assert 'Удалено записей журнала: 1' in stdout.getvalue()
+
+        response = api_client.get(URL, {'since': 0})
+        assert response.status_code == status.HTTP_410_GONE
+        assert feed(api_client, since=Change.objects.get().id)['results'] == []
+
+    @pytest.mark.parametrize('params', [
+        {'since': 'abc'}, {'since': -1}, {'since': 0, 'limit': 0}, {'since': 0, 'assignee': 'x'},
+        {'since': 0, 'assignee': 'me'},
+    ])
+    def test_invalid_params(self, api_client, params):
+        response = api_client.get(URL, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'error' in response.data
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    """Тесты потока SSE /api/changes/stream/"""
+
+    STREAM_URL = reverse('tasks:change-stream')
+
+    @pytest.fixture(autouse=True)
+    def fast_broker(self, monkeypatch):
+        monkeypatch.setattr(push.broker, 'interval', 0.01)
+
+    def read(self, *steps, **params):
+        """Выполнить шаги (sync-функции) между чтениями событий потока под ASGI"""
+        async def scenario():
+            response = await AsyncClient().get(self.STREAM_URL, params)
+            assert response['Content-Type'] == 'text/event-stream'
+            stream = aiter(response.streaming_content)
+            assert await anext(stream) == b'retry: 1000\n\n'
+            events = []
+            for step in steps:
+                if step is not None:
+                    await sync_to_async(step)()
+                events.append(await anext(stream))
+            await stream.aclose()
+            return events
+        return async_to_sync(scenario)()
+
+    def test_stream(self, project, user):
+        """Тест: события задач проекта, задачи других проектов отфильтрованы"""
+        other = Project.objects.create(name='Other', owner=user)
+
+        def create():
+            Task.objects.create(title='Other', project=other, creator=user)
+            Task.objects.create(title='Mine', project=project, creator=user)
+
+        [event] = self.read(create, project=project.pk)
+        seq = Change.objects.last().id
+        assert event.startswith(b'id: %d\nevent: change\ndata: ' % seq)
+        assert b'"title":"Mine"' in event
+
+    def test_resume(self, project, user):
+        """Тест: после переподключения пропущенные записи дочитываются из журнала"""
+        since = changes.last_seq()
+        Task.objects.create(title='Missed', project=project, creator=user)
+        first, second = self.read(None, lambda: project.save(), since=since)
+        assert b'"title":"Missed"' in first
+        assert b'"model":"project"' in second
+
+    def test_wsgi(self, api_client):
+        """Тест: без ASGI поток недоступен"""
+        response = api_client.get(self.STREAM_URL, HTTP_ACCEPT='text/event-stream')
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert response.content.startswith(b'event: error\ndata: ')
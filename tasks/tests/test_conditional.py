@@ -0,0 +1,127 @@
+"""
+Тесты условных запросов (ETag / Last-Modified).
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """Тесты ответов 304 и проверки If-Match"""
+    
+    def test_list_not_modified(self, authenticated_client, task):
+        """Тест 304 для неизмененного списка задач"""
+        url = reverse('tasks:task-list')
+        response = authenticated_client.get(url)
+        etag = response['ETag']
+        
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        task.title = 'Changed'
+        task.save()
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+    
+    def test_list_etag_changes_on_delete(self, authenticated_client, project, user, task):
+        """Тест изменения ETag при удалении задачи"""
+        Task.objects.create(title='Second', project=project, creator=user)
+        url = reverse('tasks:task-list')
+        etag = authenticated_client.get(url)['ETag']
+        
+        task.delete()
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+    
+    @pytest.mark.parametrize('url_name', ['tasks:task-list', 'tasks:project-list'])
+    def test_etag_follows_nested_users(self, authenticated_client, task, user, url_name):
+        """Тест изменения ETag после изменения вложенного пользователя"""
+        url = reverse(url_name)
+        etag = authenticated_client.get(url)['ETag']
+        
+        user.email = 'renamed@example.com'
+        user.save()
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_project_etag_follows_task_counts(self, authenticated_client, project, task):
+        """Тест изменения ETag проекта при смене статуса его задачи"""
+        url = reverse('tasks:project-detail', kwargs={'pk': project.id})
+        etag = authenticated_client.get(url)['ETag']
+        assert authenticated_client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == status.HTTP_304_NOT_MODIFIED
+        
+        task.status = 'completed'
+        task.save()
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['completed_tasks_count'] == 1
+    
+    def test_detail_if_modified_since(self, authenticated_client, task):
+        """Тест If-Modified-Since для задачи"""
+        url = reverse('tasks:task-detail', kwargs={'pk': task.id})
+        last_modified = authenticated_client.get(url)['Last-Modified']
+        
+        response = authenticated_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_if_match_on_update(self, authenticated_client, task):
+        """Тест оптимистической блокировки через If-Match"""
+        url = reverse('tasks:task-detail', kwargs={'pk': task.id})
+        etag = authenticated_client.get(url)['ETag']
+        
+        response = authenticated_client.patch(
+            url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = authenticated_client.patch(
+            url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        task.refresh_from_db()
+        assert task.title == 'First'
+    
+    def test_project_if_match_on_update(self, authenticated_client, project, task):
+        """Тест If-Match проекта с ETag из GET (детали содержат превью задач)"""
+        url = reverse('tasks:project-detail', kwargs={'pk': project.id})
+        etag = authenticated_client.get(url)['ETag']
+        
+        response = authenticated_client.patch(
+            url, {'name': 'First'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] == authenticated_client.get(url)['ETag']
+        
+        response = authenticated_client.patch(
+            url, {'name': 'Second'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    
+    def test_project_list_search_with_filters_and_expand(self, authenticated_client, project, task):
+        """Тест ETag списка проектов с поиском, фильтром и ?expand=tasks"""
+        url = reverse('tasks:project-list')
+        params = {'search': project.name.split()[0], 'is_active': 'true', 'expand': 'tasks'}
+        response = authenticated_client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [project.id]
+        
+        task.title = 'Changed'
+        task.save()
+        response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_if_match_missing_object(self, authenticated_client):
+        """Тест: If-Match для несуществующего объекта - 412, а не 404"""
+        url = reverse('tasks:task-detail', kwargs={'pk': 999999})
+        response = authenticated_client.patch(url, {'title': 'X'}, format='json', HTTP_IF_MATCH='*')
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    
+    def test_missing_object_returns_404(self, authenticated_client):
+        """Тест 404 для несуществующей задачи"""
+        url = reverse('tasks:task-detail', kwargs={'pk': 999999})
+        assert authenticated_client.get(url).status_code == status.HTTP_404_NOT_FOUND
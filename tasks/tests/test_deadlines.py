@@ -0,0 +1,158 @@
+"""
+Тесты планировщика дедлайнов.
+
+Моменты шагов сдвигаются не более чем на минуту от текущего времени:
+изменения задач (updated_at - реальное время) должны попадать в опрос.
+"""
+import io
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.utils import timezone
+from tasks import deadlines
+from tasks.deadlines import DUE_SOON, OVERDUE, DeadlineScheduler
+from tasks.models import DeadlineEvent, SchedulerWatermark, Task
+
+
+class ListSink(deadlines.DeadlineSink):
+    def __init__(self):
+        self.notices = []
+
+    def emit(self, notices):
+        self.notices.extend(notices)
+
+
+def kinds(notices):
+    return sorted((notice.task.title, notice.kind) for notice in notices)
+
+
+@pytest.mark.django_db
+class TestDeadlineScheduler:
+    """Тесты DeadlineScheduler"""
+
+    @pytest.fixture
+    def now(self):
+        return timezone.now()
+
+    def make_task(self, project, user, title, deadline, **kwargs):
+        return Task.objects.create(
+            title=title, project=project, creator=user, deadline=deadline, **kwargs
+        )
+
+    def scheduler(self, now, **kwargs):
+        kwargs.setdefault('due_soon', timedelta(seconds=20))
+        scheduler = DeadlineScheduler(sinks=[ListSink()], **kwargs)
+        scheduler.start(now)
+        return scheduler
+
+    def test_events(self, project, user, now):
+        """Тест due_soon и overdue в свой момент, закрытые задачи без событий"""
+        self.make_task(project, user, 'A', now + timedelta(seconds=30))
+        self.make_task(project, user, 'Done', now + timedelta(seconds=30), status='completed')
+        self.make_task(project, user, 'Later', now + timedelta(hours=1))
+        scheduler = self.scheduler(now)
+
+        assert scheduler.tick(now) == []
+        assert kinds(scheduler.tick(now + timedelta(seconds=15))) == [('A', DUE_SOON)]
+        assert kinds(scheduler.tick(now + timedelta(seconds=31))) == [('A', OVERDUE)]
+        assert scheduler.tick(now + timedelta(seconds=40)) == []
+
+    def test_changes(self, project, user, now):
+        """Тест переноса дедлайна и закрытия задачи после загрузки в кучу"""
+        moved = self.make_task(project, user, 'Moved', now + timedelta(seconds=30))
+        closed = self.make_task(project, user, 'Closed', now + timedelta(seconds=30))
+        scheduler = self.scheduler(now)
+        scheduler.tick(now)
+
+        moved.deadline = now + timedelta(seconds=50)
+        moved.save()
+        closed.status = 'cancelled'
+        closed.save()
+
+        assert scheduler.tick(now + timedelta(seconds=29)) == []
+        assert kinds(scheduler.tick(now + timedelta(seconds=51))) == [
+            ('Moved', DUE_SOON), ('Moved', OVERDUE)
+        ]
+
+    def test_deleted_task(self, project, user, now):
+        """Тест: событие удаленной задачи отбрасывается при проверке"""
+        task = self.make_task(project, user, 'A', now + timedelta(seconds=30))
+        scheduler = self.scheduler(now, due_soon=timedelta(0))
+        scheduler.tick(now)
+        Task.objects.filter(pk=task.pk).delete()
+
+        assert scheduler.tick(now + timedelta(seconds=31)) == []
+
+    def test_incremental_load(self, project, user, now):
+        """Тест: в куче только задачи горизонта, пачки подгружаются курсором"""
+        for i in range(5):
+            self.make_task(project, user, f'Task {i}', now + timedelta(seconds=10 + i))
+        self.make_task(project, user, 'Far', now + timedelta(days=30))
+        scheduler = self.scheduler(
+            now, due_soon=timedelta(0), horizon=timedelta(minutes=1), batch_size=2
+        )
+        scheduler.tick(now)
+
+        assert len(scheduler.scheduled) == 5
+        assert len(kinds(scheduler.tick(now + timedelta(seconds=20)))) == 5
+
+    def test_restart(self, project, user, now):
+        """Тест: после перезапуска отправляются пропущенные события, но не повторяются старые"""
+        self.make_task(project, user, 'Early', now + timedelta(seconds=10))
+        self.make_task(project, user, 'Missed', now + timedelta(seconds=30))
+        first = self.scheduler(now, due_soon=timedelta(0))
+        assert kinds(first.tick(now + timedelta(seconds=15))) == [('Early', OVERDUE)]
+
+        second = self.scheduler(now + timedelta(seconds=40), due_soon=timedelta(0))
+        assert second.watermark == now + timedelta(seconds=15)
+        assert kinds(second.tick(now + timedelta(seconds=40))) == [('Missed', OVERDUE)]
+        assert SchedulerWatermark.objects.get(name='default').value == now + timedelta(seconds=40)
+
+
+@pytest.mark.django_db
+class TestDeadlineSinks:
+    """Тесты получателей событий"""
+
+    @pytest.fixture
+    def notices(self, task):
+        task.deadline = timezone.now()
+        task.save()
+        return [deadlines.Notice(OVERDUE, task, task.deadline)]
+
+    def test_database_sink(self, notices):
+        """Тест записи событий в таблицу без повторов"""
+        sink = deadlines.DatabaseSink()
+        sink.emit(notices)
+        sink.emit(notices)
+        assert DeadlineEvent.objects.filter(kind=OVERDUE).count() == 1
+
+    def test_webhook_sink(self, notices):
+        """Тест отправки пачки событий; ошибка доставки не прерывает работу"""
+        sink = deadlines.WebhookSink(url='http://hooks.example/deadlines')
+        with mock.patch.object(deadlines.requests, 'post') as post:
+            sink.emit(notices)
+        assert post.call_args.kwargs['json']['events'][0]['task'] == notices[0].task.pk
+
+        with mock.patch.object(
+            deadlines.requests, 'post', side_effect=requests.ConnectionError
+        ):
+            sink.emit(notices)
+
+    def test_command(self, project, user):
+        """Тест manage.py run_deadline_scheduler --once"""
+        since = timezone.now() - timedelta(minutes=1)
+        Task.objects.create(
+            title='Overdue', project=project, creator=user,
+            deadline=timezone.now() - timedelta(seconds=1)
+        )
+        stdout = io.StringIO()
+        call_command(
+            'run_deadline_scheduler', '--once', '--sink', 'tasks.deadlines.DatabaseSink',
+            '--since', since.isoformat(), stdout=stdout
+        )
+        # due_soon наступил за час до дедлайна, раньше --since
+        assert 'Отправлено событий: 1' in stdout.getvalue()
+        assert list(DeadlineEvent.objects.values_list('kind', flat=True)) == [OVERDUE]
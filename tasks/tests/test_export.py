@@ -0,0 +1,95 @@
+"""
+Тесты потоковой выгрузки задач.
+"""
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from tasks import export
+from tasks.models import Task
+
+
+@pytest.fixture
+def tasks(project, user, another_user):
+    return Task.objects.bulk_create([
+        Task(
+            title=f'Task {i}', project=project, creator=user,
+            assignee=another_user if i % 2 else None,
+            status='completed' if i % 3 == 0 else 'todo'
+        )
+        for i in range(7)
+    ])
+
+
+class TestWriters:
+    """Тесты кодирования пачками"""
+
+    ROWS = [(i,) + (None,) * (len(export.COLUMNS) - 1) for i in range(7)]
+
+    @pytest.mark.parametrize('writer', [export.iter_csv, export.iter_ndjson])
+    def test_batches(self, writer):
+        """Тест: 7 строк пачками по 3 - три порции"""
+        assert len(list(writer(iter(self.ROWS), batch_size=3))) == 3
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+    """Тесты /api/tasks/export/"""
+
+    url = reverse('tasks:task-export')
+
+    def test_csv(self, api_client, tasks):
+        """Тест выгрузки CSV со всеми задачами"""
+        response = api_client.get(self.url, {'format': 'csv'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert 'tasks.csv' in response['Content-Disposition']
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert len(rows) == 7
+        assert set(rows[0]) == set(export.COLUMNS)
+        assert {row['assignee_username'] for row in rows} == {'', 'anotheruser'}
+        assert all(row['created_at'].endswith('Z') for row in rows)
+
+    def test_ndjson_with_filters(self, api_client, tasks):
+        """Тест NDJSON с фильтрами TaskFilter"""
+        response = api_client.get(self.url, {'format': 'ndjson', 'status': 'completed'})
+        assert response['Content-Type'] == 'application/x-ndjson; charset=utf-8'
+
+        lines = b''.join(response.streaming_content).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert len(rows) == 3
+        assert {row['status'] for row in rows} == {'completed'}
+        assert rows[0]['project_name'] == 'Test Project'
+
+    def test_unknown_format(self, api_client, tasks):
+        """Тест неподдерживаемого формата"""
+        response = api_client.get(self.url, {'format': 'xml'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    """Тесты manage.py export_tasks"""
+
+    def test_export_to_file(self, tasks, tmp_path):
+        """Тест выгрузки в файл с фильтром"""
+        path = tmp_path / 'tasks.ndjson'
+        call_command(
+            'export_tasks', '--format', 'ndjson', '--output', str(path),
+            '--filter', 'status=todo', stderr=io.StringIO()
+        )
+        rows = [json.loads(line) for line in path.read_bytes().splitlines()]
+        assert [row['id'] for row in rows] == sorted(
+            task.id for task in Task.objects.filter(status='todo')
+        )
+
+    def test_invalid_filter(self, tasks):
+        """Тест ошибки в значении фильтра"""
+        with pytest.raises(CommandError):
+            call_command('export_tasks', '--filter', 'status=unknown')
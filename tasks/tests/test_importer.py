@@ -0,0 +1,175 @@
+"""
+Тесты потоковой загрузки задач.
+"""
+import io
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from tasks import importer
+from tasks.models import Project, Task
+from tasks.search import deferred_search_index, get_search_backend
+
+
+def ndjson(*rows):
+    return b''.join(json.dumps(row).encode() + b'\n' for row in rows)
+
+
+@pytest.mark.django_db
+class TestTaskImporter:
+    """Тесты TaskImporter"""
+
+    def run(self, content, import_format='ndjson', **kwargs):
+        rows = importer.READERS[import_format](io.BytesIO(content))
+        return importer.TaskImporter(**kwargs).run(rows)
+
+    def test_csv_with_references(self, user, another_user, project):
+        """Тест CSV: проект по названию, исполнитель по username, создатель по умолчанию"""
+        content = (
+            'title,project_name,assignee_username,status,priority,deadline\n'
+            'First,Test Project,anotheruser,completed,4,2025-01-01T10:00:00Z\n'
+            'Second,Test Project,,todo,,\n'
+        ).encode()
+        stats = self.run(content, 'csv', creator=user)
+
+        assert (stats.rows, stats.created, stats.error_count) == (2, 2, 0)
+        first = Task.objects.get(title='First')
+        assert (first.project, first.assignee, first.creator) == (project, another_user, user)
+        assert first.completed_at is not None
+        assert Task.objects.get(title='Second').priority == 2
+        assert project.tasks_count == 2
+        assert project.completed_tasks_count == 1
+
+    def test_row_errors(self, user, project):
+        """Тест ошибок в отдельных строках: остальные строки загружаются"""
+        content = ndjson(
+            {'title': 'Ok', 'project': project.id},
+            {'title': '', 'project': project.id},
+            {'title': 'Bad status', 'project': project.id, 'status': 'done'},
+            {'title': 'No project', 'project_name': 'Unknown'},
+            {'title': 'No user', 'project': project.id, 'assignee_username': 'ghost'},
+        ) + b'{not json}\n'
+        stats = self.run(content, creator=user)
+
+        assert stats.created == 1
+        assert stats.error_count == 5
+        assert [error['line'] for error in stats.errors] == [2, 3, 4, 5, 6]
+        assert set(stats.errors[1]['errors']) == {'status'}
+
+    def test_batches_and_progress(self, user, project):
+        """Тест записи пачками и отчета о ходе загрузки"""
+        progress = []
+        content = ndjson(*({'title': f'Task {i}', 'project': project.id} for i in range(7)))
+        stats = self.run(
+            content, creator=user, batch_size=2, transaction_batches=2,
+            progress=lambda stats: progress.append(stats.created)
+        )
+        assert stats.created == 7
+        assert progress == [4, 7]
+
+    def test_create_missing(self):
+        """Тест создания проектов и пользователей по названию / username"""
+        content = ndjson(
+            {'title': 'A', 'project_name': 'New', 'creator_username': 'alice'},
+            {'title': 'B', 'project_name': 'New', 'creator_username': 'alice',
+             'assignee_username': 'bob'},
+        )
+        stats = self.run(content, create_missing=True, default_password='secret')
+
+        assert stats.created == 2
+        assert Project.objects.get(name='New').owner.username == 'alice'
+        assert User.objects.get(username='bob').check_password('secret')
+
+    def test_create_missing_skips_invalid_rows(self):
+        """Тест: строка с ошибкой не создает пользователей и проекты"""
+        content = ndjson(
+            {'title': 'A', 'project': 999999, 'creator_username': 'alice',
+             'assignee_username': 'bob'},
+            {'title': '', 'project_name': 'New', 'creator_username': 'carol'},
+            {'title': 'C', 'project_name': 'Other', 'creator_username': 'bad name'},
+            {'title': 'D', 'project_name': 'Other', 'creator_username': 'x' * 151},
+        )
+        stats = self.run(content, create_missing=True)
+
+        assert (stats.created, stats.error_count) == (0, 4)
+        assert not User.objects.filter(username__in=['alice', 'bob', 'carol']).exists()
+        assert not Project.objects.filter(name__in=['New', 'Other']).exists()
+        assert 'creator' in stats.errors[2]['errors']
+        assert 'creator' in stats.errors[3]['errors']
+
+    def test_export_round_trip(self, authenticated_client, user, project, task):
+        """Тест загрузки файла выгрузки"""
+        response = authenticated_client.get(reverse('tasks:task-export'), {'format': 'ndjson'})
+        content = b''.join(response.streaming_content)
+
+        assert self.run(content).created == 1
+        assert Task.objects.filter(title=task.title, project=project, creator=user).count() == 2
+
+
+@pytest.mark.django_db
+class TestDeferredSearchIndex:
+    """Тесты отложенного обновления поискового индекса"""
+
+    def test_index_rebuilt(self, user, project):
+        """Тест: задачи, загруженные без триггеров, находятся поиском"""
+        with deferred_search_index(connection, 'tasks_task'):
+            Task.objects.bulk_create([Task(title='Уникальная', project=project, creator=user)])
+        found = get_search_backend().search(Task.objects.all(), 'Уникальная', ['title'])
+        assert found.count() == 1
+
+
+@pytest.mark.django_db
+class TestImportEndpoint:
+    """Тесты /api/tasks/import/"""
+
+    url = reverse('tasks:task-import')
+
+    def test_upload(self, authenticated_client, user, project):
+        """Тест загрузки файла текущим пользователем"""
+        upload = SimpleUploadedFile(
+            'tasks.jsonl', ndjson({'title': 'Uploaded', 'project': project.id})
+        )
+        response = authenticated_client.post(self.url, {'file': upload})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 1
+        assert Task.objects.get(title='Uploaded').creator == user
+
+    def test_all_rows_invalid(self, authenticated_client, project):
+        """Тест 400, если не загружено ни одной строки"""
+        upload = SimpleUploadedFile('tasks.csv', b'title,project\n,1\n')
+        response = authenticated_client.post(self.url, {'file': upload})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error_count'] == 1
+
+    def test_unknown_format(self, authenticated_client):
+        """Тест файла неизвестного формата"""
+        upload = SimpleUploadedFile('tasks.xlsx', b'')
+        response = authenticated_client.post(self.url, {'file': upload})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, api_client):
+        """Тест: анонимный пользователь не может загружать задачи"""
+        response = api_client.post(self.url, {'file': SimpleUploadedFile('tasks.csv', b'')})
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+
+@pytest.mark.django_db
+class TestImportCommand:
+    """Тесты manage.py import_tasks"""
+
+    def test_sample_data(self):
+        """Тест загрузки примеров данных из fixtures/sample_tasks.ndjson"""
+        stdout = io.StringIO()
+        call_command(
+            'import_tasks', 'fixtures/sample_tasks.ndjson', '--create-missing',
+            '--defer-search-index', stdout=stdout, stderr=io.StringIO()
+        )
+        assert 'Загружено задач: 8 из 8' in stdout.getvalue()
+        assert Project.objects.count() == 2
+        assert sum(project.tasks_count for project in Project.objects.all()) == 8
@@ -0,0 +1,108 @@
+"""
+Тесты метрик запросов и лога медленных запросов.
+"""
+import logging
+import os
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse
+from task_manager import metrics
+from task_manager.middleware import MetricsMiddleware
+from tasks.models import Task
+
+
+@pytest.fixture
+def clean_metrics(metrics_dir):
+    metrics.reset()
+    yield metrics_dir
+    metrics.reset()
+
+
+class TestMmapedDict:
+    """Тесты файлового хранилища метрик"""
+
+    def test_values_readable_from_file(self, tmp_path):
+        path = str(tmp_path / 'worker.db')
+        store = metrics.MmapedDict(path)
+        store.inc('a', 1)
+        store.inc('a', 2.5)
+        store.inc('b{view="x"}', 1)
+        assert metrics.read_file(path) == {'a': 3.5, 'b{view="x"}': 1}
+
+        store.close()
+        reopened = metrics.MmapedDict(path)
+        reopened.inc('a', 1)
+        assert metrics.read_file(path)['a'] == 4.5
+
+    def test_file_grows(self, tmp_path):
+        path = str(tmp_path / 'worker.db')
+        store = metrics.MmapedDict(path)
+        for i in range(5000):
+            store.inc(f'metric_{i}', i)
+        values = metrics.read_file(path)
+        assert len(values) == 5000
+        assert values['metric_4999'] == 4999
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Тесты middleware и эндпоинта /metrics"""
+
+    def test_request_metrics_exposed(self, clean_metrics, authenticated_client, task):
+        authenticated_client.get(reverse('tasks:task-list'))
+        body = authenticated_client.get('/metrics').content.decode()
+
+        assert '# TYPE http_requests_total counter' in body
+        assert 'http_requests_total{method="GET",status="200",view="tasks:task-list"} 1' in body
+        assert 'http_request_duration_seconds_bucket{le="+Inf",view="tasks:task-list"} 1' in body
+        db_queries = next(
+            line for line in body.splitlines()
+            if line.startswith('http_request_db_queries_sum{view="tasks:task-list"}')
+        )
+        assert float(db_queries.split()[-1]) > 0
+        assert 'view="metrics"' not in body
+
+    def test_worker_values_survive_exit(self, clean_metrics):
+        metrics.inc('gunicorn_worker_aborts_total')
+        metrics.merge_worker(os.getpid())
+        assert not os.path.exists(os.path.join(clean_metrics, f'worker_{os.getpid()}.db'))
+        assert metrics.collect()['gunicorn_worker_aborts_total'] == 1
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=0)
+    def test_slow_request_logged_with_sql(self, clean_metrics, authenticated_client, task, caplog):
+        with caplog.at_level(logging.WARNING, logger='task_manager.slow_requests'):
+            authenticated_client.get(reverse('tasks:task-list'))
+        message = caplog.records[-1].getMessage()
+        assert 'tasks:task-list' in message
+        assert 'SELECT' in message
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncMiddleware:
+    """Тесты MetricsMiddleware под ASGI"""
+
+    def test_handler_not_adapted(self, caplog):
+        """Тест: цепочка middleware остается асинхронной"""
+        with caplog.at_level(logging.DEBUG, logger='django.request'):
+            handler = ASGIHandler()
+        assert iscoroutinefunction(handler._middleware_chain)
+        assert not [r for r in caplog.records if 'adapted' in r.getMessage()]
+
+    def test_async_sql_counted(self, user):
+        """Тест: SQL из sync_to_async учитывается в метриках запроса"""
+        async def view(request):
+            await sync_to_async(lambda: list(Task.objects.all()))()
+            await sync_to_async(User.objects.count)()
+            return HttpResponse()
+
+        middleware = MetricsMiddleware(view)
+        assert iscoroutinefunction(middleware)
+        request = AsyncRequestFactory().get('/')
+        request.resolver_match = None
+        async_to_sync(middleware)(request)
+        assert request._metrics_recorder.db_queries == 2
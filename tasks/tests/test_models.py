@@ -2,6 +2,7 @@
 Тесты для моделей Project и Task.
 """
 import pytest
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 from tasks.models import Project, Task
@@ -120,3 +121,98 @@ class TestTaskModel:
         task.save()
         assert task.is_overdue is False
 
+
+@pytest.mark.django_db
+class TestOverdueAnnotation:
+    """Тесты просроченности, вычисляемой в SQL"""
+
+    @pytest.fixture
+    def tasks(self, project, user):
+        past = timezone.now() - timedelta(days=1)
+        future = timezone.now() + timedelta(days=1)
+        return {
+            (status, label): Task.objects.create(
+                title=f'{status} {label}', project=project, creator=user,
+                status=status, deadline=deadline
+            ).pk
+            for status in ('todo', 'review', 'completed', 'cancelled')
+            for label, deadline in (('past', past), ('future', future), ('none', None))
+        }
+
+    def test_annotation_matches_property(self, tasks):
+        """Тест: аннотация совпадает с вычислением в Python"""
+        annotated = Task.objects.with_is_overdue()
+        assert {task.pk: task.is_overdue for task in annotated} == {
+            task.pk: task.is_overdue for task in Task.objects.all()
+        }
+        assert set(Task.objects.overdue().values_list('pk', flat=True)) == {
+            tasks['todo', 'past'], tasks['review', 'past']
+        }
+
+    def test_single_now(self, tasks):
+        """Тест: просроченность считается относительно переданного момента"""
+        later = timezone.now() + timedelta(days=2)
+        assert Task.objects.overdue(later).count() == 4
+        assert Task.objects.with_is_overdue(later).filter(annotated_is_overdue=True).count() == 4
+
+    def test_save_resets_annotation(self, tasks):
+        """Тест: после сохранения аннотация не используется"""
+        task = Task.objects.with_is_overdue().get(pk=tasks['todo', 'past'])
+        assert task.is_overdue is True
+        task.status = 'completed'
+        task.save()
+        assert task.is_overdue is False
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='план запроса SQLite')
+    def test_partial_index(self):
+        """Тест: фильтр просроченных использует частичный индекс"""
+        plan = Task.objects.overdue().order_by().values('pk').explain()
+        assert 'task_open_deadline_idx' in plan
+
+
+@pytest.mark.django_db
+class TestProjectTaskCounter:
+    """Тесты денормализованных счетчиков задач"""
+    
+    def _counters(self, project):
+        return dict(project.task_counters.values_list('status', 'count'))
+    
+    def test_counters_follow_status_changes(self, project, task):
+        """Тест обновления счетчиков при смене статуса"""
+        assert self._counters(project) == {'todo': 1}
+        
+        task.status = 'completed'
+        task.save()
+        assert self._counters(project) == {'todo': 0, 'completed': 1}
+        assert project.completed_tasks_count == 1
+        assert project.tasks_count == 1
+    
+    def test_counters_follow_project_change(self, project, task, user):
+        """Тест переноса задачи в другой проект"""
+        other = Project.objects.create(name='Other', owner=user)
+        task = Task.objects.get(pk=task.pk)
+        task.project = other
+        task.save()
+        
+        assert project.tasks_count == 0
+        assert other.tasks_count == 1
+    
+    def test_counters_on_delete(self, project, task, user):
+        """Тест уменьшения счетчиков при удалении"""
+        Task.objects.create(title='Second', project=project, creator=user)
+        task.delete()
+        assert project.tasks_count == 1
+        
+        Task.objects.filter(project=project).delete()
+        assert project.tasks_count == 0
+    
+    def test_rebuild_task_counters_command(self, project, task):
+        """Тест пересчета счетчиков командой"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        project.task_counters.all().delete()
+        assert project.tasks_count == 0
+        
+        call_command('rebuild_task_counters', stdout=StringIO())
+        assert self._counters(project) == {'todo': 1}
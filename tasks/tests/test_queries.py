@@ -0,0 +1,102 @@
+"""
+Тесты количества SQL-запросов для основных эндпоинтов.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from tasks.models import Project, Task
+
+
+def _create_projects(owner, count):
+    """Создать проекты с задачами в разных статусах"""
+    for i in range(count):
+        project = Project.objects.create(name=f'Project {i}', owner=owner)
+        Task.objects.create(title='Todo', project=project, creator=owner)
+        Task.objects.create(
+            title='Done', project=project, creator=owner, status='completed'
+        )
+
+
+def _count_queries(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), response
+
+
+@pytest.mark.django_db
+class TestProjectQueryCount:
+    """Число запросов к списку проектов не зависит от размера страницы"""
+
+    def test_project_list_constant_queries(self, authenticated_client, user):
+        url = reverse('tasks:project-list')
+
+        _create_projects(user, 2)
+        small, _ = _count_queries(authenticated_client, url)
+
+        _create_projects(user, 8)
+        large, response = _count_queries(authenticated_client, url)
+
+        assert small == large
+        result = response.data['results'][0]
+        assert result['tasks_count'] == 2
+        assert result['completed_tasks_count'] == 1
+
+    def test_task_detail_project_counts(self, authenticated_client, user):
+        _create_projects(user, 1)
+        task = Task.objects.first()
+        url = reverse('tasks:task-detail', kwargs={'pk': task.id})
+
+        queries, response = _count_queries(authenticated_client, url)
+
+        # ETag-агрегат, задача с пользователями, проект со счетчиками
+        assert queries <= 3
+        assert response.data['project_detail']['tasks_count'] == 2
+        assert response.data['project_detail']['completed_tasks_count'] == 1
+
+
+@pytest.mark.django_db
+class TestTaskWriteQueries:
+    """Точечные UPDATE для change_status и assign"""
+
+    def _task_updates(self, ctx):
+        return [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('UPDATE "tasks_task"')
+        ]
+
+    def test_change_status_minimal(self, authenticated_client, task):
+        url = reverse('tasks:task-change-status', kwargs={'pk': task.id})
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.post(
+                f'{url}?response=minimal', {'status': 'completed'}, format='json'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'id', 'status', 'completed_at', 'updated_at'}
+        assert response.data['completed_at'] is not None
+        [update] = self._task_updates(ctx)
+        assert '"title"' not in update
+        assert task.project.completed_tasks_count == 1
+
+    def test_assign_minimal(self, authenticated_client, task, another_user):
+        url = reverse('tasks:task-assign', kwargs={'pk': task.id})
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.post(
+                f'{url}?response=minimal', {'assignee_id': another_user.id}, format='json'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['assignee_id'] == another_user.id
+        [update] = self._task_updates(ctx)
+        assert '"status"' not in update
+        # Исполнитель проверяется только на существование
+        assert not any('"auth_user"."username"' in q['sql'] for q in ctx.captured_queries)
+
+    def test_assign_unknown_user(self, authenticated_client, task):
+        url = reverse('tasks:task-assign', kwargs={'pk': task.id})
+        response = authenticated_client.post(url, {'assignee_id': 'abc'}, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,232 @@
+"""
+Тесты бюджетов SQL-запросов (task_manager/query_budget.py).
+
+Каждое действие ProjectViewSet и TaskViewSet выполняется на данных, где
+N+1 заметен (несколько проектов, задачи с исполнителями), с сессионной
+аутентификацией; превышение бюджета - исключение из MetricsMiddleware
+(фикстура enforce_query_budgets).
+"""
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import path, reverse
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from task_manager import metrics
+from task_manager.query_budget import UNSET, QueryBudgetExceeded, get_query_budget, query_budget
+from tasks.models import Project, Task
+from tasks.views import ProjectViewSet, TaskViewSet
+
+STANDARD_ACTIONS = ['list', 'create', 'retrieve', 'update', 'partial_update', 'destroy']
+
+
+@pytest.fixture
+def data(user, another_user):
+    """Два проекта по 12 задач, половина назначена"""
+    projects = [
+        Project.objects.create(name=f'Project {i}', owner=user) for i in range(2)
+    ]
+    tasks = [
+        Task.objects.create(
+            title=f'Task {i}', project=project, creator=user,
+            assignee=another_user if i % 2 else user
+        )
+        for project in projects for i in range(12)
+    ]
+    return {'project': projects[0], 'projects': projects, 'task': tasks[0], 'user': another_user}
+
+
+@pytest.fixture
+def session_client(api_client, user):
+    api_client.force_login(user)
+    return api_client
+
+
+def project_requests(data):
+    pk = data['project'].pk
+    detail = reverse('tasks:project-detail', args=[pk])
+    return {
+        'list': ('get', reverse('tasks:project-list'), None),
+        'create': ('post', reverse('tasks:project-list'), {'name': 'New'}),
+        'retrieve': ('get', detail, None),
+        'update': ('put', detail, {'name': 'Renamed', 'description': '', 'is_active': True}),
+        'partial_update': ('patch', detail, {'name': 'Renamed'}),
+        'destroy': ('delete', detail, None),
+        'statistics': ('get', reverse('tasks:project-statistics', args=[pk]), None),
+        'batch_statistics': (
+            'get', reverse('tasks:project-batch-statistics'),
+            {'ids': ','.join(str(project.pk) for project in data['projects'])}
+        ),
+        'tasks': ('get', reverse('tasks:project-tasks', args=[pk]), None),
+    }
+
+
+def task_requests(data):
+    pk = data['task'].pk
+    project = data['project'].pk
+    detail = reverse('tasks:task-detail', args=[pk])
+    task_ids = list(Task.objects.values_list('id', flat=True)[:5])
+    return {
+        'list': ('get', reverse('tasks:task-list'), None),
+        'create': ('post', reverse('tasks:task-list'), {'title': 'New', 'project': project}),
+        'retrieve': ('get', detail, None),
+        'update': ('put', detail, {'title': 'Renamed', 'project': project, 'status': 'review'}),
+        'partial_update': ('patch', detail, {'status': 'completed'}),
+        'destroy': ('delete', detail, None),
+        'change_status': (
+            'post', reverse('tasks:task-change-status', args=[pk]), {'status': 'in_progress'}
+        ),
+        'assign': (
+            'post', reverse('tasks:task-assign', args=[pk]), {'assignee_id': data['user'].pk}
+        ),
+        'my_tasks': ('get', reverse('tasks:task-my-tasks'), None),
+        'export': ('get', reverse('tasks:task-export'), {'format': 'csv'}),
+        'import_tasks': ('post', reverse('tasks:task-import'), lambda: {
+            'file': SimpleUploadedFile('tasks.csv', f'title,project\nA,{project}\n'.encode())
+        }),
+        'bulk': ('post', reverse('tasks:task-bulk'), [
+            {'title': f'Bulk {i}', 'project': project} for i in range(5)
+        ]),
+        'bulk_change_status': (
+            'post', reverse('tasks:task-bulk-change-status'), {'ids': task_ids, 'status': 'review'}
+        ),
+    }
+
+
+def all_actions(viewset):
+    return STANDARD_ACTIONS + [extra.__name__ for extra in viewset.get_extra_actions()]
+
+
+@pytest.mark.parametrize('viewset', [ProjectViewSet, TaskViewSet])
+def test_every_action_has_budget(viewset):
+    """Тест: у каждого действия объявлен бюджет (None - явно без ограничения)"""
+    missing = [
+        name for name in all_actions(viewset)
+        if get_query_budget(viewset, name, UNSET) is UNSET
+    ]
+    assert missing == []
+
+
+@pytest.mark.django_db
+class TestActionBudgets:
+    """Тесты: каждое действие укладывается в бюджет"""
+
+    def request(self, client, method, url, payload):
+        if callable(payload):
+            return client.post(url, payload(), format='multipart')
+        if method == 'get':
+            return client.get(url, payload)
+        return getattr(client, method)(url, payload, format='json')
+
+    @pytest.mark.parametrize('name', all_actions(ProjectViewSet))
+    def test_project_actions(self, session_client, data, name):
+        response = self.request(session_client, *project_requests(data)[name])
+        assert response.status_code < 400
+
+    @pytest.mark.parametrize('name', all_actions(TaskViewSet))
+    def test_task_actions(self, session_client, data, name):
+        response = self.request(session_client, *task_requests(data)[name])
+        assert response.status_code < 400
+
+    def test_bulk_update(self, session_client, data):
+        """Тест PATCH массового действия (бюджет общий с POST)"""
+        tasks = [{'id': pk, 'priority': 3} for pk in Task.objects.values_list('id', flat=True)[:5]]
+        response = session_client.patch(reverse('tasks:task-bulk'), tasks, format='json')
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestWorstCaseBudgets:
+    """Тесты: бюджет рассчитан на самую дорогую ветку действия"""
+
+    def etag(self, client, url):
+        return client.get(url)['ETag']
+
+    def test_project_list_expand_search(self, session_client, data):
+        """Тест списка проектов с превью задач, поиском и фильтром"""
+        response = session_client.get(reverse('tasks:project-list'), {
+            'expand': 'tasks', 'search': 'project', 'is_active': 'true'
+        })
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('method', ['put', 'patch'])
+    def test_project_update_if_match(self, session_client, data, method):
+        """Тест изменения проекта с проверкой If-Match"""
+        url = reverse('tasks:project-detail', args=[data['project'].pk])
+        payload = {'name': 'Renamed', 'description': '', 'is_active': True}
+        response = getattr(session_client, method)(
+            url, payload, format='json', HTTP_IF_MATCH=self.etag(session_client, url)
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('method', ['put', 'patch'])
+    @pytest.mark.parametrize('if_match', [False, True])
+    def test_task_update_moves_task(self, session_client, data, method, if_match):
+        """Тест изменения задачи со сменой проекта, исполнителя и статуса"""
+        url = reverse('tasks:task-detail', args=[data['task'].pk])
+        headers = {'HTTP_IF_MATCH': self.etag(session_client, url)} if if_match else {}
+        response = getattr(session_client, method)(url, {
+            'title': 'Moved', 'project': data['projects'][1].pk,
+            'assignee': data['user'].pk, 'status': 'review',
+        }, format='json', **headers)
+        assert response.status_code == 200
+        task = Task.objects.get(pk=data['task'].pk)
+        assert (task.project, task.assignee, task.status) == (
+            data['projects'][1], data['user'], 'review'
+        )
+
+
+class BudgetViewSet(ViewSet):
+    query_budgets = {'list': 0, 'create': 0}
+
+    def list(self, request):
+        Project.objects.count()
+        return Response({})
+
+    def create(self, request):
+        Project.objects.count()
+        return Response({})
+
+    @query_budget(1)
+    @action(detail=False)
+    def single(self, request):
+        Project.objects.count()
+        return Response({})
+
+
+urlpatterns = [
+    path('budget/', BudgetViewSet.as_view({'get': 'list', 'post': 'create'}), name='budget-list'),
+    path('budget/single/', BudgetViewSet.as_view({'get': 'single'}), name='budget-single'),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.urls(__name__)
+class TestQueryBudgetMiddleware:
+    """Тесты проверки бюджета в MetricsMiddleware"""
+
+    def test_exceeded(self, api_client):
+        """Тест исключения при QUERY_BUDGET_ENFORCE"""
+        with pytest.raises(QueryBudgetExceeded, match='1 SQL-запросов при бюджете 0'):
+            api_client.get('/budget/')
+
+    def test_decorator(self, api_client):
+        """Тест бюджета из декоратора"""
+        assert api_client.get('/budget/single/').status_code == 200
+
+    def test_unsafe_method_not_failed(self, api_client, user, settings, caplog):
+        """Тест: превышение у изменяющего запроса - лог, а не ошибка после записи"""
+        api_client.force_authenticate(user)
+        with caplog.at_level('WARNING', logger='task_manager.query_budget'):
+            assert api_client.post('/budget/').status_code == 200
+        assert 'Превышен бюджет SQL-запросов' in caplog.text
+        # Превышение в тестах проверяет фикстура enforce_query_budgets
+        settings.QUERY_BUDGET_ENFORCE = False
+
+    def test_reported(self, api_client, settings):
+        """Тест метрики вместо исключения в продакшене"""
+        settings.QUERY_BUDGET_ENFORCE = False
+        key = 'http_query_budget_exceeded_total{view="budget-list"}'
+        before = metrics.collect()[key]
+        assert api_client.get('/budget/').status_code == 200
+        assert metrics.collect()[key] == before + 1
@@ -0,0 +1,153 @@
+"""
+Тесты быстрого JSON-рендерера, парсера и потоковой выдачи списков.
+"""
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, RequestFactory
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from tasks import renderers
+from tasks.models import Task
+from tasks.parsers import FastJSONParser
+from tasks.renderers import FastJSONRenderer, StreamingJSONRenderer
+from tasks.streaming import streaming_response
+
+
+class TestFastJSONRenderer:
+    """Тесты совместимости с JSONRenderer"""
+
+    DATA = {
+        'title': 'Задача  ',
+        'deadline': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        'budget': Decimal('1.50'),
+        'label': gettext_lazy('Done'),
+        1: [None, True],
+    }
+
+    def test_same_output_as_json_renderer(self):
+        """Тест побайтового совпадения с рендерером DRF"""
+        assert FastJSONRenderer().render(self.DATA) == JSONRenderer().render(self.DATA)
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Тест работы без orjson"""
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(self.DATA) == JSONRenderer().render(self.DATA)
+
+    def test_indent_uses_json_renderer(self):
+        """Тест форматированного вывода (indent из Accept)"""
+        content = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        assert content == b'{\n  "a": 1\n}'
+
+    def test_parser(self):
+        """Тест разбора и ошибки разбора"""
+        parser = FastJSONParser()
+        assert parser.parse(io.BytesIO('{"title": "Тест"}'.encode())) == {'title': 'Тест'}
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"title": NaN}'))
+
+
+class TestStreamingJSONRenderer:
+    """Тесты кодирования списка по частям"""
+
+    def test_chunks_form_valid_json(self):
+        """Тест объединения порций в один JSON-объект"""
+        renderer = StreamingJSONRenderer()
+        renderer.chunk_size = 2
+        chunks = list(renderer.render_stream(
+            iter(range(5)), lambda rows: [{'id': row} for row in rows],
+            lambda: {'next': None}
+        ))
+        assert len(chunks) == 5
+        assert json.loads(b''.join(chunks)) == {
+            'results': [{'id': row} for row in range(5)], 'next': None
+        }
+
+    def test_empty(self):
+        """Тест пустого списка без полей пагинации"""
+        content = b''.join(StreamingJSONRenderer().render_stream(iter([]), list))
+        assert json.loads(content) == {'results': []}
+
+
+class TestStreamingResponse:
+    """Тесты StreamingHttpResponse для WSGI и ASGI"""
+
+    def test_wsgi(self):
+        """Тест: под WSGI итератор отдается как есть"""
+        response = streaming_response(RequestFactory().get('/'), iter([b'a', b'b']), 'text/plain')
+        assert not response.is_async
+        assert response['X-Accel-Buffering'] == 'no'
+        assert list(response.streaming_content) == [b'a', b'b']
+
+    def test_asgi(self):
+        """Тест: под ASGI итератор обходится асинхронно, порция за порцией"""
+        response = streaming_response(
+            AsyncRequestFactory().get('/'), iter([b'a', b'b']), 'text/plain'
+        )
+        assert response.is_async
+
+        async def collect():
+            return [chunk async for chunk in response.streaming_content]
+
+        assert async_to_sync(collect)() == [b'a', b'b']
+
+
+@pytest.mark.django_db
+class TestStreamingList:
+    """Тесты потоковой выдачи списка задач"""
+
+    @pytest.fixture
+    def tasks(self, project, user):
+        return Task.objects.bulk_create([
+            Task(title=f'Task {i}', project=project, creator=user, priority=i % 4 + 1)
+            for i in range(15)
+        ])
+
+    def test_stream_matches_regular_list(self, authenticated_client, tasks):
+        """Тест совпадения потокового ответа с обычным"""
+        url = reverse('tasks:task-list')
+        regular = authenticated_client.get(url, {'page': 2}).json()
+        response = authenticated_client.get(url, {'page': 2, 'stream': 'true'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['ETag']
+        data = json.loads(b''.join(response.streaming_content))
+        assert data['results'] == regular['results']
+        assert data['count'] == regular['count'] == 15
+        # Ссылки сохраняют ?stream: следующие страницы тоже отдаются потоком
+        assert 'stream=true' in data['previous']
+
+    def test_stream_keyset(self, authenticated_client, tasks):
+        """Тест потоковой keyset-пагинации: ссылка next по последней строке"""
+        url = reverse('tasks:task-list')
+        params = {'paginate': 'cursor', 'page_size': 10}
+        regular = authenticated_client.get(url, params).json()
+        response = authenticated_client.get(url, {**params, 'stream': '1'})
+
+        data = json.loads(b''.join(response.streaming_content))
+        assert data['results'] == regular['results']
+        assert len(data['results']) == 10
+        assert data['next'] == regular['next'] + '&stream=1'
+
+    def test_stream_not_modified(self, authenticated_client, tasks):
+        """Тест 304 для потокового списка"""
+        url = reverse('tasks:task-list')
+        etag = authenticated_client.get(url, {'stream': 'true'})['ETag']
+        response = authenticated_client.get(url, {'stream': 'true'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_browsable_api_not_streamed(self, authenticated_client, tasks):
+        """Тест: для Browsable API параметр stream игнорируется"""
+        response = authenticated_client.get(
+            reverse('tasks:task-list'), {'stream': 'true'}, HTTP_ACCEPT='text/html'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.streaming
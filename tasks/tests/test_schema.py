@@ -0,0 +1,74 @@
+"""
+Тесты кэшированной спецификации OpenAPI.
+"""
+import gzip
+import json
+from unittest import mock
+
+import brotli
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from task_manager import schema
+
+
+@pytest.mark.django_db
+class TestCachedSchema:
+    """Тесты кэша и сжатия спецификации"""
+
+    def test_built_once_per_process(self, api_client):
+        """Тест повторного запроса без построения схемы"""
+        with mock.patch.object(schema, 'render_schema', wraps=schema.render_schema) as render:
+            first = api_client.get('/swagger.json')
+            second = api_client.get('/swagger/?format=openapi')
+        assert render.call_count == 1
+        assert first.content == second.content
+        assert 'paths' in json.loads(first.content)
+
+    def test_compressed_variants(self, api_client):
+        """Тест выбора сжатия по Accept-Encoding"""
+        plain = api_client.get('/swagger.json').content
+
+        response = api_client.get('/swagger.json', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.content) == plain
+
+        response = api_client.get('/swagger.json', HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.content) == plain
+        assert 'Accept-Encoding' in response['Vary']
+
+    def test_not_modified(self, api_client):
+        """Тест ответа 304 по ETag"""
+        etag = api_client.get('/swagger.json')['ETag']
+        response = api_client.get('/swagger.json', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_ui_pages_not_affected(self, api_client):
+        """Тест страниц Swagger UI и ReDoc"""
+        for url in ('/swagger/', '/redoc/'):
+            response = api_client.get(url)
+            assert response.status_code == 200
+            assert 'text/html' in response['Content-Type']
+
+    def test_generate_schema_command(self, api_client, tmp_path):
+        """Тест генерации файлов и их отдачи"""
+        output = tmp_path / 'swagger.json'
+        call_command('generate_schema', output=str(output), url='https://api.example.com')
+        assert json.loads(output.read_bytes())['host'] == 'api.example.com'
+        assert gzip.decompress((tmp_path / 'swagger.json.gz').read_bytes()) == output.read_bytes()
+        assert (tmp_path / 'swagger.json.br').exists()
+
+        with override_settings(SCHEMA_FILE=output):
+            response = api_client.get('/swagger.json')
+        assert response.content == output.read_bytes()
+
+    @override_settings(ALLOWED_HOSTS=['.example.com'])
+    def test_one_schema_per_scheme(self, api_client):
+        """Тест: другие хост и порт не строят схему заново"""
+        with mock.patch.object(schema, 'render_schema', wraps=schema.render_schema) as render:
+            first = api_client.get('/swagger.json', HTTP_HOST='a.example.com:8001')
+            second = api_client.get('/swagger.json', HTTP_HOST='b.example.com:8002')
+        assert render.call_count == 1
+        assert first.content == second.content
+        assert 'host' not in json.loads(first.content)
@@ -0,0 +1,82 @@
+"""
+Тесты полнотекстового поиска.
+"""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from tasks.models import Task
+
+
+@pytest.mark.django_db
+class TestTaskSearch:
+    """Тесты поиска задач через бэкенд полнотекстового поиска"""
+    
+    def _search(self, client, query, **params):
+        url = reverse('tasks:task-list')
+        response = client.get(url, {'search': query, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [item['title'] for item in response.data['results']]
+    
+    def test_search_ranks_results(self, authenticated_client, project, user):
+        """Тест ранжирования результатов поиска"""
+        Task.objects.create(
+            title='Deploy', description='deploy deploy deploy', project=project, creator=user
+        )
+        Task.objects.create(
+            title='Docs', description='mention deploy once among many other words here',
+            project=project, creator=user, priority=4
+        )
+        Task.objects.create(title='Unrelated', project=project, creator=user)
+        
+        assert self._search(authenticated_client, 'deploy') == ['Deploy', 'Docs']
+    
+    def test_search_explicit_ordering(self, authenticated_client, project, user):
+        """Тест явной сортировки результатов поиска"""
+        Task.objects.create(title='Deploy A', project=project, creator=user, priority=1)
+        Task.objects.create(title='Deploy B', project=project, creator=user, priority=4)
+        
+        titles = self._search(authenticated_client, 'deploy', ordering='priority')
+        assert titles == ['Deploy A', 'Deploy B']
+    
+    def test_search_index_follows_updates(self, authenticated_client, task):
+        """Тест синхронизации индекса при изменении и удалении задачи"""
+        task.title = 'Миграция базы данных'
+        task.description = ''
+        task.save()
+        
+        assert self._search(authenticated_client, 'миграц') == ['Миграция базы данных']
+        assert self._search(authenticated_client, 'Test') == []
+        
+        task.delete()
+        assert self._search(authenticated_client, 'миграц') == []
+    
+    def test_search_special_characters(self, authenticated_client, task):
+        """Тест запроса со спецсимволами"""
+        assert self._search(authenticated_client, '"Test" (task*') == ['Test Task']
+    
+    def test_search_word_prefix(self, authenticated_client, project, user):
+        """Тест: совпадение с началом слова, а не с произвольной подстрокой"""
+        Task.objects.create(title='Docker image', project=project, creator=user)
+        assert self._search(authenticated_client, 'dock') == ['Docker image']
+        assert self._search(authenticated_client, 'ock') == []
+
+    def test_search_punctuated_terms(self, authenticated_client, project, user):
+        """Тест: слова со знаками препинания внутри ищутся как подстрока"""
+        Task.objects.create(title='Release v1.2.3', project=project, creator=user)
+        Task.objects.create(
+            title='Release v1.20', description='e-mail', project=project, creator=user
+        )
+        assert self._search(authenticated_client, '"v1.2"') == ['Release v1.2.3', 'Release v1.20']
+        assert self._search(authenticated_client, 'release e-mail') == ['Release v1.20']
+        assert self._search(authenticated_client, '1.2.3') == ['Release v1.2.3']
+
+    def test_search_with_filters(self, authenticated_client, project, user):
+        """Тест поиска вместе с фильтрами (несколько статусов добавляют DISTINCT)"""
+        Task.objects.create(title='Deploy A', project=project, creator=user, status='todo')
+        Task.objects.create(title='Deploy B', project=project, creator=user, status='review')
+        Task.objects.create(title='Deploy C', project=project, creator=user, status='completed')
+        
+        titles = self._search(
+            authenticated_client, 'deploy', status=['todo', 'review'], ordering='title'
+        )
+        assert titles == ['Deploy A', 'Deploy B']
@@ -0,0 +1,52 @@
+"""
+Тесты генератора данных для нагрузочных тестов.
+"""
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from tasks.models import Project, Task
+from tasks.search import get_search_backend
+from tasks.seeding import USERNAME_PREFIX, BenchmarkSeeder
+
+
+@pytest.mark.django_db
+class TestBenchmarkSeeder:
+    """Тесты BenchmarkSeeder и manage.py seed_benchmark"""
+
+    def test_run(self):
+        """Тест объема данных, счетчиков задач и поискового индекса"""
+        progress = []
+        counts = BenchmarkSeeder(batch_size=10, progress=lambda *args: progress.append(args)).run(
+            users=5, projects=3, tasks=250
+        )
+
+        assert counts == (5, 3, 250)
+        assert progress == [(100, 250), (200, 250), (250, 250)]
+        assert User.objects.filter(username__startswith=USERNAME_PREFIX).count() == 5
+        assert sum(project.tasks_count for project in Project.objects.all()) == 250
+        # Даты не перезаписаны auto_now: задачи распределены по истории
+        latest = Task.objects.latest('created_at').created_at
+        assert Task.objects.filter(created_at__lt=latest).exists()
+        word = Task.objects.first().title.split()[0]
+        assert get_search_backend().search(Task.objects.all(), word, ['title']).exists()
+
+    def test_same_seed_same_data(self):
+        """Тест воспроизводимости при одинаковом seed"""
+        BenchmarkSeeder(seed=1).run(users=2, projects=2, tasks=20)
+        first = list(Task.objects.order_by('id').values_list('title', 'status', 'priority'))
+        Task.objects.all().delete()
+
+        BenchmarkSeeder(seed=1).run(users=2, projects=2, tasks=20)
+        assert list(Task.objects.order_by('id').values_list('title', 'status', 'priority')) == first
+
+    def test_command(self):
+        """Тест manage.py seed_benchmark"""
+        stdout = io.StringIO()
+        call_command(
+            'seed_benchmark', '--users', '2', '--projects', '2', '--tasks', '30',
+            stdout=stdout, stderr=io.StringIO()
+        )
+        assert 'задач: 30' in stdout.getvalue()
+        assert Task.objects.count() == 30
@@ -0,0 +1,15 @@
+"""
+Тесты SQLite-бэкенда с PRAGMA (task_manager/db/backends/sqlite3).
+"""
+import pytest
+from django.db import connection
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='только SQLite')
+@pytest.mark.django_db
+def test_busy_timeout_from_options(settings):
+    """Тест: ожидание блокировки равно OPTIONS['timeout'], PRAGMA его не переопределяет"""
+    timeout = settings.DATABASES['default']['OPTIONS']['timeout']
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone()[0] == timeout * 1000
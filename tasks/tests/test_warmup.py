@@ -0,0 +1,18 @@
+"""
+Тесты прогрева приложения перед fork воркеров Gunicorn.
+"""
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from task_manager.warmup import warm_up
+
+
+@pytest.mark.django_db
+def test_warm_up_without_errors_and_queries(caplog):
+    """Прогрев проходит без ошибок и не обращается к БД"""
+    with caplog.at_level(logging.ERROR), CaptureQueriesContext(connection) as ctx:
+        warm_up()
+    assert not caplog.records
+    assert len(ctx.captured_queries) == 0
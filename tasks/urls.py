@@ -3,16 +3,18 @@ URL маршруты для API задач и проектов.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, TaskViewSet
+from .views import ChangeViewSet, ProjectViewSet, TaskViewSet, cache_statistics
 
 # Создаем router и регистрируем ViewSets
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'tasks', TaskViewSet, basename='task')
+router.register(r'changes', ChangeViewSet, basename='change')
 
 app_name = 'tasks'
 
 urlpatterns = [
+    path('cache/stats/', cache_statistics, name='cache-stats'),
     path('', include(router.urls)),
 ]
 
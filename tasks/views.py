@@ -1,108 +1,307 @@
 """
 Views (ViewSets) для API управления проектами и задачами.
 """
-from rest_framework import viewsets, filters, status
-from rest_framework.decorators import action
+from rest_framework import viewsets, status
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from task_manager.query_budget import query_budget
 
-from .models import Project, Task
+from .models import Project, Task, overdue_condition, request_now
 from .serializers import (
     ProjectListSerializer, ProjectDetailSerializer,
-    TaskListSerializer, TaskDetailSerializer, TaskCreateUpdateSerializer
+    TaskListSerializer, TaskDetailSerializer, TaskCreateUpdateSerializer,
+    TaskStatusSerializer, TaskAssignSerializer
 )
 from .filters import ProjectFilter, TaskFilter
+from .pagination import TaskPagination
+from .renderers import EventStreamRenderer, FastJSONRenderer
+from .search import FullTextSearchFilter, RankedOrderingFilter
+from .conditional import ConditionalRequestMixin
+from .cache import ResponseCacheMixin, stats as cache_stats
+from .async_views import AsyncViewSetMixin
+from .streaming import StreamingListMixin, streaming_response
+from .export import EXPORT_RENDERERS, export_rows
+from .importer import READERS, TaskImporter, detect_format
+from . import bulk, changes, push
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+def task_conditional_aggregates(detail=False, now=None):
+    """
+    Агрегаты для ETag задач: изменение задач, их проектов и число задач,
+    ставших просроченными к моменту now (is_overdue меняется со временем
+    без записи в БД).
+    """
+    aggregates = {
+        'count': Count('id', distinct=detail),
+        'updated': Max('updated_at'),
+        'project_updated': Max('project__updated_at'),
+        'overdue': Count('id', distinct=detail, filter=overdue_condition(now)),
+    }
+    if detail:
+        # project_detail содержит счетчики задач проекта
+        aggregates['counters_updated'] = Max('project__task_counters__updated_at')
+    return aggregates
+
+
+RESPONSE_MODE_PARAMETER = openapi.Parameter(
+    'response', openapi.IN_QUERY,
+    description="minimal - краткий ответ без вложенных объектов",
+    type=openapi.TYPE_STRING,
+    enum=['minimal']
+)
+
+EXPAND_PARAMETER = openapi.Parameter(
+    'expand', openapi.IN_QUERY,
+    description="tasks - добавить превью задач каждого проекта (как в деталях проекта)",
+    type=openapi.TYPE_STRING,
+    enum=['tasks']
+)
+
+_COUNT = openapi.Schema(type=openapi.TYPE_INTEGER)
+
+STATISTICS_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'total_tasks': _COUNT,
+        'completed_tasks': _COUNT,
+        'in_progress_tasks': _COUNT,
+        'todo_tasks': _COUNT,
+        'review_tasks': _COUNT,
+        'cancelled_tasks': _COUNT,
+        'overdue_tasks': _COUNT,
+        'unassigned_tasks': _COUNT,
+        'by_status': openapi.Schema(type=openapi.TYPE_OBJECT, additional_properties=_COUNT),
+        'by_priority': openapi.Schema(type=openapi.TYPE_OBJECT, additional_properties=_COUNT),
+    }
+)
+
+
+@method_decorator(name='list', decorator=swagger_auto_schema(manual_parameters=[EXPAND_PARAMETER]))
+class ProjectViewSet(ResponseCacheMixin, ConditionalRequestMixin, AsyncViewSetMixin,
+                     viewsets.ModelViewSet):
     """
     ViewSet для управления проектами.
     
     Предоставляет CRUD операции для проектов:
-    - list: получить список проектов
+    - list: получить список проектов (?expand=tasks - с превью задач)
     - create: создать новый проект
     - retrieve: получить детальную информацию о проекте
     - update: обновить проект
     - partial_update: частично обновить проект
     - destroy: удалить проект
     """
-    queryset = Project.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    queryset = Project.objects.select_related('owner').with_task_counts()
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_class = ProjectFilter
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at', 'updated_at']
     ordering = ['-created_at']
+    async_actions = ('statistics',)
+    # Вложенные данные пользователей: их изменение не видно в агрегатах ETag
+    conditional_scopes = ('users',)
+    MAX_STATISTICS_IDS = 500
+    # Бюджеты SQL-запросов (task_manager/query_budget.py) для самой дорогой
+    # ветки: сессионная аутентификация, ?expand=tasks с поиском, If-Match;
+    # дополнительные действия - декоратором
+    query_budgets = {
+        'list': 8, 'create': 8, 'retrieve': 7,
+        'update': 14, 'partial_update': 14, 'destroy': 9,
+    }
 
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от действия"""
-        if self.action == 'retrieve':
+        if self._with_task_previews():
             return ProjectDetailSerializer
         return ProjectListSerializer
 
+    def get_queryset(self):
+        """
+        Для ?expand=tasks превью задач загружаются одним запросом на всю
+        страницу проектов. Детали проекта обходятся без оконной функции:
+        один запрос с LIMIT по индексу дешевле нумерации всех задач проекта.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list' and self._with_task_previews():
+            queryset = queryset.with_task_previews(now=request_now(self.request))
+        return queryset
+
+    def _with_task_previews(self):
+        """Ответ содержит превью задач: детали проекта или список с ?expand=tasks"""
+        if self.action == 'retrieve':
+            return True
+        expand = self.request.query_params.get('expand', '') if self.request else ''
+        return self.action == 'list' and 'tasks' in expand.split(',')
+
     def perform_create(self, serializer):
         """Автоматически устанавливаем владельца проекта"""
         serializer.save(owner=self.request.user)
 
+    def get_cache_scopes(self):
+        """Области кэша, от которых зависит ответ действия"""
+        if self.action == 'list':
+            return ['projects', 'tasks', 'users']
+        if self.action == 'batch_statistics':
+            return ['projects', 'tasks']
+        if self.action in ('retrieve', 'tasks'):
+            return [f'project:{self.kwargs["pk"]}', 'users']
+        if self.action == 'statistics':
+            return [f'project:{self.kwargs["pk"]}']
+        return None
+
+    def get_conditional_queryset(self):
+        """Валидаторы считаются без аннотаций счетчиков"""
+        return self.filter_queryset(Project.objects.all())
+
+    def get_conditional_aggregates(self, detail=False):
+        return {
+            'count': Count('id', distinct=True),
+            'updated': Max('updated_at'),
+            'counters_updated': Max('task_counters__updated_at'),
+        }
+
+    def get_conditional_state(self, queryset, detail=False, aggregates=None):
+        state = super().get_conditional_state(queryset, detail, aggregates)
+        if (detail or self._with_task_previews()) and aggregates is None:
+            # Ответ содержит превью задач проектов. Для update / partial_update
+            # состояние то же, что у retrieve: иначе If-Match с ETag из GET не совпадет
+            tasks_state = task_conditional_aggregates(now=request_now(self.request))
+            del tasks_state['project_updated']
+            tasks = Task.objects.all()
+            if detail:
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                tasks = tasks.filter(project_id=self.kwargs[lookup_url_kwarg])
+            elif queryset.query.has_filters():
+                # Без фильтров проектов - полный просмотр задач: IN по всем
+                # проектам SQLite выполняет поиском по индексу для каждого.
+                # Id проектов читаются отдельным запросом: в подзапросе
+                # таблицы получают псевдонимы, а условие FTS-поиска
+                # (tasks/search.py) ссылается на имя таблицы
+                tasks = tasks.filter(
+                    project_id__in=list(queryset.order_by().values_list('pk', flat=True))
+                )
+            state.update({
+                f'tasks_{key}': value for key, value in tasks.aggregate(**tasks_state).items()
+            })
+        return state
+
     @swagger_auto_schema(
         method='get',
         operation_description="Получить статистику по проекту",
         responses={200: openapi.Response(
             description="Статистика проекта",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'total_tasks': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'completed_tasks': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'in_progress_tasks': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'todo_tasks': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'overdue_tasks': openapi.Schema(type=openapi.TYPE_INTEGER),
-                }
-            )
+            schema=STATISTICS_SCHEMA
         )}
     )
+    @query_budget(5)
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         """Получить статистику по проекту"""
-        project = self.get_object()
-        from django.utils import timezone
-        
-        stats = {
-            'total_tasks': project.tasks.count(),
-            'completed_tasks': project.tasks.filter(status='completed').count(),
-            'in_progress_tasks': project.tasks.filter(status='in_progress').count(),
-            'todo_tasks': project.tasks.filter(status='todo').count(),
-            'overdue_tasks': project.tasks.filter(
-                deadline__lt=timezone.now()
-            ).exclude(status__in=['completed', 'cancelled']).count(),
-        }
-        return Response(stats)
+        return self.cached_response(
+            request, lambda: Response(self.get_object().tasks.all().statistics(request_now(request)))
+        )
+
+    async def astatistics(self, request, pk=None):
+        return await self.acached_response(request, self._astatistics)
+
+    async def _astatistics(self):
+        project = await self.aget_object()
+        return Response(await project.tasks.all().astatistics(request_now(self.request)))
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Получить статистику по нескольким проектам (?ids=1,2,3)",
+        manual_parameters=[openapi.Parameter(
+            'ids', openapi.IN_QUERY,
+            description="ID проектов через запятую",
+            type=openapi.TYPE_STRING,
+            required=True
+        )],
+        responses={200: openapi.Response(
+            description="Статистика по каждому проекту",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                additional_properties=STATISTICS_SCHEMA
+            )
+        )}
+    )
+    @query_budget(4)
+    @action(detail=False, methods=['get'], url_path='statistics', url_name='batch-statistics')
+    def batch_statistics(self, request):
+        """Получить статистику сразу по нескольким проектам одним запросом"""
+        raw_ids = request.query_params.get('ids', '')
+        try:
+            ids = {int(value) for value in raw_ids.split(',') if value.strip()}
+        except ValueError:
+            return Response(
+                {'error': 'ids должен быть списком целых чисел через запятую'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not ids:
+            return Response(
+                {'error': 'Требуется параметр ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.MAX_STATISTICS_IDS:
+            return Response(
+                {'error': f'Не более {self.MAX_STATISTICS_IDS} проектов за запрос'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return self.cached_response(request, lambda: Response({
+            str(project_id): data
+            for project_id, data in
+            Project.objects.filter(id__in=ids).statistics(request_now(request)).items()
+        }))
 
     @swagger_auto_schema(
         method='get',
         operation_description="Получить задачи проекта",
         responses={200: TaskListSerializer(many=True)}
     )
+    @query_budget(7)
     @action(detail=True, methods=['get'])
     def tasks(self, request, pk=None):
         """Получить все задачи проекта"""
+        return self.cached_response(request, lambda: self._project_tasks(request))
+
+    def _project_tasks(self, request):
         project = self.get_object()
-        tasks = project.tasks.all()
+        now = request_now(request)
+        tasks = project.tasks.select_related('project', 'assignee', 'creator').with_is_overdue(now)
         
         # Применяем фильтры
-        task_filter = TaskFilter(request.GET, queryset=tasks)
-        page = self.paginate_queryset(task_filter.qs)
+        task_filter = TaskFilter(request.GET, queryset=tasks, request=request)
+        return self.conditional_list_response(
+            request, task_filter.qs,
+            lambda: self._paginated_tasks(request, task_filter.qs, tasks),
+            aggregates=task_conditional_aggregates(now=now)
+        )
+
+    def _paginated_tasks(self, request, queryset, tasks):
+        paginator = TaskPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
         
         if page is not None:
             serializer = TaskListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return paginator.get_paginated_response(serializer.data)
         
         serializer = TaskListSerializer(tasks, many=True)
         return Response(serializer.data)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(StreamingListMixin, ResponseCacheMixin, ConditionalRequestMixin,
+                  AsyncViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления задачами.
     
@@ -123,13 +322,28 @@ class TaskViewSet(viewsets.ModelViewSet):
     - по дедлайну (deadline_after, deadline_before)
     - просроченные задачи (is_overdue=true)
     - без исполнителя (no_assignee=true)
+    
+    Пагинация: по умолчанию постраничная, ?paginate=cursor включает
+    keyset-режим (без COUNT и OFFSET) для обхода больших выборок.
+    ?stream=true отдает страницу потоком, не собирая ее в памяти.
+
+    В режиме ASGI list, retrieve и my_tasks обрабатываются асинхронно.
     """
     queryset = Task.objects.select_related('project', 'assignee', 'creator').all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = TaskPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_class = TaskFilter
     search_fields = ['title', 'description']
     ordering_fields = ['priority', 'created_at', 'updated_at', 'deadline', 'status']
     ordering = ['-priority', '-created_at']
+    async_actions = ('list', 'retrieve', 'my_tasks')
+    # Вложенные данные пользователей: их изменение не видно в агрегатах ETag
+    conditional_scopes = ('users',)
+    # update / partial_update: If-Match и смена проекта, исполнителя и статуса
+    query_budgets = {
+        'list': 6, 'create': 9, 'retrieve': 6,
+        'update': 19, 'partial_update': 19, 'destroy': 7,
+    }
 
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от действия"""
@@ -139,6 +353,44 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskDetailSerializer
         return TaskListSerializer
 
+    def get_queryset(self):
+        """
+        Для детального просмотра подгружаем проект вместе со счетчиками задач.
+        Просроченность вычисляется в SQL относительно времени запроса.
+        """
+        if self.action in ('change_status', 'assign') and self._is_minimal_response():
+            # Для краткого ответа связанные объекты не нужны
+            return Task.objects.only(
+                'id', 'project_id', 'assignee_id', 'status', 'completed_at', 'updated_at'
+            )
+        if self.action == 'retrieve':
+            # select_related('project') заменяем на Prefetch: иначе проект
+            # считается загруженным и аннотированный queryset не применится
+            queryset = Task.objects.select_related('assignee', 'creator').prefetch_related(
+                Prefetch(
+                    'project',
+                    queryset=Project.objects.select_related('owner').with_task_counts()
+                )
+            )
+        else:
+            queryset = super().get_queryset()
+        return queryset.with_is_overdue(request_now(self.request))
+
+    def get_conditional_aggregates(self, detail=False):
+        return task_conditional_aggregates(detail, request_now(self.request))
+
+    def get_cache_scopes(self):
+        """Области кэша, от которых зависит ответ действия"""
+        if self.action in ('list', 'retrieve'):
+            return ['tasks', 'projects', 'users']
+        if self.action == 'my_tasks' and self.request.user.is_authenticated:
+            return [f'assignee:{self.request.user.pk}', 'projects', 'users']
+        return None
+
+    def _is_minimal_response(self):
+        """Запрошен краткий ответ (?response=minimal) без вложенных объектов"""
+        return self.request.query_params.get('response') == 'minimal'
+
     def perform_create(self, serializer):
         """Автоматически устанавливаем создателя задачи"""
         serializer.save(creator=self.request.user)
@@ -146,6 +398,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     @swagger_auto_schema(
         method='post',
         operation_description="Изменить статус задачи",
+        manual_parameters=[RESPONSE_MODE_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['status'],
@@ -158,6 +411,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         ),
         responses={200: TaskDetailSerializer()}
     )
+    @query_budget(15)
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
         """Изменить статус задачи"""
@@ -171,14 +425,17 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
         
         task.status = new_status
-        task.save()
+        task.save(update_fields=['status', 'completed_at', 'updated_at'])
         
+        if self._is_minimal_response():
+            return Response(TaskStatusSerializer(task).data)
         serializer = TaskDetailSerializer(task)
         return Response(serializer.data)
 
     @swagger_auto_schema(
         method='post',
         operation_description="Назначить задачу пользователю",
+        manual_parameters=[RESPONSE_MODE_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['assignee_id'],
@@ -188,6 +445,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         ),
         responses={200: TaskDetailSerializer()}
     )
+    @query_budget(12)
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
         """Назначить задачу пользователю"""
@@ -202,31 +460,58 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         from django.contrib.auth.models import User
         try:
-            assignee = User.objects.get(id=assignee_id)
-            task.assignee = assignee
-            task.save()
-            
-            serializer = TaskDetailSerializer(task)
-            return Response(serializer.data)
-        except User.DoesNotExist:
+            assignee_exists = User.objects.filter(id=assignee_id).exists()
+        except (TypeError, ValueError):
+            assignee_exists = False
+        if not assignee_exists:
             return Response(
                 {'error': 'Пользователь не найден'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        task.assignee_id = int(assignee_id)
+        task.save(update_fields=['assignee', 'updated_at'])
+        
+        if self._is_minimal_response():
+            return Response(TaskAssignSerializer(task).data)
+        serializer = TaskDetailSerializer(task)
+        return Response(serializer.data)
 
     @swagger_auto_schema(
         method='get',
         operation_description="Получить задачи текущего пользователя",
         responses={200: TaskListSerializer(many=True)}
     )
+    @query_budget(6)
     @action(detail=False, methods=['get'])
     def my_tasks(self, request):
         """Получить задачи, назначенные текущему пользователю"""
-        tasks = self.queryset.filter(assignee=request.user)
+        return self.cached_response(request, lambda: self._my_tasks(request))
+
+    def _my_tasks(self, request):
+        tasks = self.get_queryset().filter(assignee=request.user)
         
         # Применяем фильтры
-        task_filter = TaskFilter(request.GET, queryset=tasks)
-        page = self.paginate_queryset(task_filter.qs)
+        task_filter = TaskFilter(request.GET, queryset=tasks, request=request)
+        return self.conditional_list_response(
+            request, task_filter.qs,
+            lambda: self._paginated_tasks(task_filter.qs, tasks)
+        )
+
+    async def amy_tasks(self, request):
+        return await self.acached_response(request, lambda: self._amy_tasks(request))
+
+    async def _amy_tasks(self, request):
+        task_filter = TaskFilter(
+            request.GET, queryset=self.get_queryset().filter(assignee=request.user), request=request
+        )
+        return await self.aconditional_list_response(
+            request, task_filter.qs,
+            lambda: self.apaginated_response(task_filter.qs)
+        )
+
+    def _paginated_tasks(self, queryset, tasks):
+        page = self.paginate_queryset(queryset)
         
         if page is not None:
             serializer = TaskListSerializer(page, many=True)
@@ -235,3 +520,308 @@ class TaskViewSet(viewsets.ModelViewSet):
         serializer = TaskListSerializer(tasks, many=True)
         return Response(serializer.data)
 
+    @swagger_auto_schema(
+        method='get',
+        operation_description=(
+            "Выгрузка задач потоком в CSV (?format=csv) или NDJSON (?format=ndjson) "
+            "с теми же фильтрами, что у списка задач"
+        ),
+        responses={200: 'CSV или NDJSON'}
+    )
+    @query_budget(3)
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS,
+            pagination_class=None)
+    def export(self, request):
+        """Выгрузить все задачи, подходящие под фильтры, без пагинации"""
+        renderer = request.accepted_renderer
+        queryset = self.filter_queryset(self.get_queryset())
+        response = streaming_response(
+            request, renderer.writer(export_rows(queryset)),
+            f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description=(
+            "Загрузка задач из файла CSV или NDJSON (поле file, формат - поле format "
+            "или расширение файла). Колонки - как у выгрузки; проекты и пользователи "
+            "указываются по ID или по названию / username"
+        ),
+        manual_parameters=[
+            openapi.Parameter('file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True),
+            openapi.Parameter('format', openapi.IN_FORM, type=openapi.TYPE_STRING,
+                              enum=sorted(READERS)),
+        ]
+    )
+    # Число запросов растет с размером файла (пачки bulk_create)
+    @query_budget(None)
+    @action(detail=False, methods=['post'], url_path='import', url_name='import',
+            parser_classes=[MultiPartParser], permission_classes=[IsAuthenticated])
+    def import_tasks(self, request):
+        """Загрузить задачи из файла; создатель - текущий пользователь"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Требуется файл (поле file)'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        import_format = request.data.get('format') or detect_format(upload.name)
+        if import_format not in READERS:
+            return Response({'error': f'Поддерживаемые форматы: {", ".join(sorted(READERS))}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        stats = TaskImporter(creator=request.user).run(READERS[import_format](upload))
+        ok = stats.created or not stats.error_count
+        return Response(
+            stats.as_dict(), status=status.HTTP_200_OK if ok else status.HTTP_400_BAD_REQUEST
+        )
+
+    def _bulk_response(self, results, errors):
+        """Ответ массовой операции: 200 при частичном успехе, 400 если не удалось ничего"""
+        code = status.HTTP_200_OK if results or not errors else status.HTTP_400_BAD_REQUEST
+        return Response({'results': results, 'errors': errors}, status=code)
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description="Массовое создание задач",
+        request_body=TaskCreateUpdateSerializer(many=True),
+        responses={200: TaskListSerializer(many=True)}
+    )
+    @swagger_auto_schema(
+        method='patch',
+        operation_description="Массовое частичное обновление задач (каждый элемент содержит id)",
+        request_body=TaskCreateUpdateSerializer(many=True),
+        responses={200: TaskListSerializer(many=True)}
+    )
+    # Число запросов зависит от числа пачек и пар (проект, статус) в данных
+    @query_budget(None)
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """Массовое создание (POST) или обновление (PATCH) задач"""
+        if request.method == 'POST':
+            tasks, errors = bulk.bulk_create_tasks(request.data, request.user)
+        else:
+            tasks, errors = bulk.bulk_update_tasks(request.data)
+        return self._bulk_response(TaskListSerializer(tasks, many=True).data, errors)
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description="Изменить статус нескольких задач",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['ids', 'status'],
+            properties={
+                'ids': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER)
+                ),
+                'status': openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    enum=['todo', 'in_progress', 'review', 'completed', 'cancelled']
+                )
+            }
+        )
+    )
+    # Число запросов зависит от числа пар (проект, статус) в данных
+    @query_budget(None)
+    @action(detail=False, methods=['post'])
+    def bulk_change_status(self, request):
+        """Изменить статус нескольких задач одним запросом"""
+        if not isinstance(request.data, dict):
+            return Response(
+                {'error': 'Ожидается объект с полями ids и status'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        updated, errors = bulk.bulk_change_status(
+            request.data.get('ids'), request.data.get('status')
+        )
+        return self._bulk_response(updated, errors)
+
+
+CHANGE_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'seq': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'model': openapi.Schema(type=openapi.TYPE_STRING, enum=['task', 'project']),
+        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'action': openapi.Schema(type=openapi.TYPE_STRING, enum=['create', 'update', 'delete']),
+        'created_at': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+        'data': openapi.Schema(
+            type=openapi.TYPE_OBJECT, x_nullable=True,
+            description="Текущее состояние объекта (как в списке); null - объект удален"
+        ),
+    }
+)
+
+
+class ChangeViewSet(AsyncViewSetMixin, viewsets.GenericViewSet):
+    """
+    Лента изменений задач и проектов для инкрементальной синхронизации
+    (tasks/changes.py).
+    """
+    async_actions = ('list',)
+    # Параметры ленты разбираются в _feed_params, не фильтрами списка
+    filter_backends = []
+    pagination_class = None
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Изменения с номером больше since. Без since - только текущий номер "
+            "(last_seq) для начала синхронизации. 410 - записи после since удалены, "
+            "нужна полная синхронизация."
+        ),
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="last_seq предыдущего ответа"),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description=f"Не более {changes.MAX_LIMIT}, "
+                                          f"по умолчанию {changes.DEFAULT_LIMIT}"),
+            openapi.Parameter('wait', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description=f"Ждать изменений до N секунд (не более "
+                                          f"{changes.MAX_WAIT})"),
+            openapi.Parameter('assignee', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="me или ID: только задачи исполнителя"),
+            openapi.Parameter('project', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Только проект и его задачи"),
+        ],
+        responses={200: openapi.Response(
+            description="Страница ленты",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'last_seq': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'has_more': openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=CHANGE_SCHEMA),
+                }
+            )
+        )}
+    )
+    # Long-poll повторяет чтение ленты до появления записей
+    @query_budget(None)
+    def list(self, request):
+        """Страница ленты изменений (с ?wait= - long-poll)"""
+        params = self._feed_params(request)
+        if isinstance(params, Response):
+            return params
+        if params['since'] is None:
+            return Response({'last_seq': changes.last_seq(), 'has_more': False, 'results': []})
+        try:
+            page = changes.wait_for_changes(**params)
+        except changes.ChangesGone:
+            return self._gone()
+        return self._feed_response(page, changes.serialize_changes(page[0], request))
+
+    async def alist(self, request):
+        params = await sync_to_async(self._feed_params)(request)
+        if isinstance(params, Response):
+            return params
+        if params['since'] is None:
+            last_seq = await sync_to_async(changes.last_seq)()
+            return Response({'last_seq': last_seq, 'has_more': False, 'results': []})
+        try:
+            page = await changes.await_changes(**params)
+        except changes.ChangesGone:
+            return self._gone()
+        results = await sync_to_async(changes.serialize_changes)(page[0], request)
+        return self._feed_response(page, results)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Поток изменений Server-Sent Events (только в режиме ASGI). События change "
+            "с id = seq и данными как в ленте; после переподключения с заголовком "
+            "Last-Event-ID (или ?since=) пропущенные изменения дочитываются из журнала. "
+            "Событие reset - записи удалены очисткой, нужна полная синхронизация."
+        ),
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Начать после этого номера"),
+            openapi.Parameter('assignee', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="me или ID: только задачи исполнителя"),
+            openapi.Parameter('project', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Только проект и его задачи"),
+        ],
+        responses={200: openapi.Response(description="text/event-stream")}
+    )
+    @query_budget(3)
+    @action(detail=False, methods=['get'], renderer_classes=[EventStreamRenderer, FastJSONRenderer])
+    def stream(self, request):
+        """Поток изменений SSE (tasks/push.py)"""
+        if not isinstance(request._request, ASGIRequest):
+            # Под WSGI бесконечный ответ занял бы поток воркера
+            return Response(
+                {'error': 'Поток событий доступен только в режиме ASGI'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        params = self._feed_params(request)
+        if isinstance(params, Response):
+            return params
+        since = params['since']
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        if since is None and last_event_id.isdigit():
+            since = int(last_event_id)
+        response = StreamingHttpResponse(
+            push.event_stream(since, params['project'], params['assignee']),
+            content_type=EventStreamRenderer.media_type
+        )
+        response['Cache-Control'] = 'no-cache'
+        # nginx отдает события клиенту сразу, не накапливая ответ в буфере
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def _feed_params(self, request):
+        """Параметры ленты или ответ 400"""
+        params = {}
+        for name, default, minimum, maximum in (
+            ('since', None, 0, None),
+            ('limit', changes.DEFAULT_LIMIT, 1, changes.MAX_LIMIT),
+            ('wait', 0, 0, changes.MAX_WAIT),
+        ):
+            value = request.query_params.get(name) or default
+            try:
+                value = None if value is None else int(value)
+            except ValueError:
+                value = minimum - 1
+            if value is not None and value < minimum:
+                return Response(
+                    {'error': f'{name} должен быть целым числом не меньше {minimum}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            params[name] = value if maximum is None else min(value, maximum)
+
+        assignee = request.query_params.get('assignee') or None
+        if assignee == 'me' and request.user.is_authenticated:
+            assignee = request.user.pk
+        elif assignee is not None:
+            if not assignee.isdigit():
+                return Response(
+                    {'error': 'assignee должен быть ID пользователя или me (с аутентификацией)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            assignee = int(assignee)
+        params['assignee'] = assignee
+
+        project = request.query_params.get('project') or None
+        if project is not None and not project.isdigit():
+            return Response(
+                {'error': 'project должен быть ID проекта'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        params['project'] = project and int(project)
+        return params
+
+    def _gone(self):
+        return Response(
+            {'error': 'Изменения после since удалены, требуется полная синхронизация'},
+            status=status.HTTP_410_GONE
+        )
+
+    def _feed_response(self, page, results):
+        _, has_more, last_seq = page
+        return Response({'last_seq': last_seq, 'has_more': has_more, 'results': results})
+
+
+@swagger_auto_schema(method='get', operation_description="Метрики кэша ответов API")
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_statistics(request):
+    """Попадания, промахи и вытеснения кэша ответов (текущий процесс)"""
+    return Response(cache_stats())